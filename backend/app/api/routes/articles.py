@@ -1,31 +1,42 @@
+import json
 from typing import List, Optional
 from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, tuple_
+from sqlalchemy.orm import noload
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.http_cache import cached_response, json_bytes, not_modified
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.topic import Topic
 from app.models.roadmap import Roadmap
 from app.models.article import Article
+from app.models.article_content import ArticleContent
 from app.models.saved_article import SavedArticle
 from app.models.user_progress import UserProgress
-from app.schemas.article import ArticleResponse, ArticleSave
-from app.services.llm_service import llm_service
+from app.schemas.article import ArticleBody, ArticleOverlay, ArticleResponse, ArticleSave
+from app.services.article_service import ArticleGenerationError, article_service
+from app.services.view_counter import view_counter
 
 router = APIRouter()
 
 
-@router.get("/{article_id}", response_model=ArticleResponse)
-async def get_article(
+async def _open_article(
+    db: AsyncSession,
     article_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User,
+    with_body: bool = True
 ):
-    """Get a specific article by ID."""
-    result = await db.execute(select(Article).where(Article.id == article_id))
+    """Load an article for its reader, counting the view and recording progress."""
+    query = select(Article).where(Article.id == article_id)
+    if not with_body:
+        query = query.options(noload(Article.content))
+    result = await db.execute(query)
     article = result.scalar_one_or_none()
 
     if not article:
@@ -34,8 +45,8 @@ async def get_article(
             detail="Article not found"
         )
 
-    # Increment view count
-    article.view_count += 1
+    # Buffered; folded into view_count by the background flush
+    await view_counter.increment(article.id)
 
     # Get roadmap and topic info
     roadmap = await db.get(Roadmap, article.roadmap_id)
@@ -98,19 +109,45 @@ async def get_article(
                     progress.badges = progress.badges + ["30-day-streak"]
 
     await db.commit()
-    await db.refresh(article)
+
+    if article.content_id is None and roadmap:
+        # Migrated with only a placeholder body; give it real content now
+        try:
+            await article_service.ensure_content(db, article, roadmap)
+        except ArticleGenerationError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Article generation is temporarily unavailable, please retry shortly",
+                headers={"Retry-After": "5"},
+            )
+        await db.commit()
+
+    return article, roadmap, topic, saved
+
+
+@router.get("/{article_id}", response_model=ArticleResponse)
+async def get_article(
+    article_id: str,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a specific article by ID."""
+    article, roadmap, topic, saved = await _open_article(db, article_id, current_user)
+    response.headers["Cache-Control"] = "private, no-store"
 
     return ArticleResponse(
         id=article.id,
+        content_id=article.content_id,
         title=article.title,
         slug=article.slug,
-        eli5_content=article.eli5_content,
-        technical_content=article.technical_content,
-        code_snippets=article.code_snippets,
-        real_world_examples=article.real_world_examples,
-        practice_problems=article.practice_problems,
-        tags=article.tags,
-        view_count=article.view_count,
+        eli5_content=article.content.eli5_content,
+        technical_content=article.content.technical_content,
+        code_snippets=article.content.code_snippets,
+        real_world_examples=article.content.real_world_examples,
+        practice_problems=article.content.practice_problems,
+        tags=article.content.tags,
+        view_count=(article.view_count or 0) + view_counter.pending(article.id),
         avg_read_time=article.avg_read_time,
         created_at=article.created_at,
         is_saved=saved is not None,
@@ -121,6 +158,69 @@ async def get_article(
     )
 
 
+@router.get("/{article_id}/overlay", response_model=ArticleOverlay)
+async def get_article_overlay(
+    article_id: str,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the per-user part of an article; the body comes from /articles/content/{content_id}."""
+    article, roadmap, topic, saved = await _open_article(
+        db, article_id, current_user, with_body=False
+    )
+    response.headers["Cache-Control"] = "private, no-store"
+
+    return ArticleOverlay(
+        id=article.id,
+        content_id=article.content_id,
+        title=article.title,
+        slug=article.slug,
+        view_count=(article.view_count or 0) + view_counter.pending(article.id),
+        avg_read_time=article.avg_read_time,
+        created_at=article.created_at,
+        is_saved=saved is not None,
+        user_notes=saved.notes if saved else None,
+        status=roadmap.status if roadmap else None,
+        topic_name=topic.name if topic else None,
+        day_number=roadmap.day_number if roadmap else None,
+        difficulty=roadmap.difficulty if roadmap else None,
+    )
+
+
+@router.get("/content/{content_id}", response_model=ArticleBody)
+async def get_article_body(
+    content_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a shared article body. Bodies never change, but they need a login,
+    so only the user's own browser may cache them; shared caches must not."""
+    cache_control = f"private, max-age={settings.ARTICLE_BODY_MAX_AGE}"
+    # The content id identifies an immutable body, so it doubles as the ETag
+    etag = f'"{content_id}"'
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+
+    content = await db.get(ArticleContent, content_id)
+    if not content:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found"
+        )
+
+    body = json_bytes(ArticleBody.model_validate(content))
+    return cached_response(
+        request,
+        body,
+        cache_control,
+        etag=etag,
+        last_modified=content.created_at,
+    )
+
+
 @router.post("/{article_id}/generate")
 async def generate_article(
     article_id: str,
@@ -143,37 +243,59 @@ async def generate_article(
         select(Article).where(Article.roadmap_id == roadmap.id)
     )
     existing_article = result.scalar_one_or_none()
-    if existing_article:
+    if existing_article and existing_article.content_id is not None:
         return {"article_id": str(existing_article.id), "message": "Article already exists"}
 
-    # Get topic
-    topic = await db.get(Topic, roadmap.topic_id)
-
-    # Generate article content
-    article_content = await llm_service.generate_article(
-        topic_name=topic.name if topic else "Interview Prep",
-        concept_name=roadmap.concept_title,
-        user_skill_summary=str(current_user.skill_analysis) if current_user.skill_analysis else None
-    )
-
-    # Create article
-    article = Article(
-        roadmap_id=roadmap.id,
-        title=roadmap.concept_title,
-        slug=roadmap.concept_slug,
-        eli5_content=article_content.get("eli5", ""),
-        technical_content=article_content.get("technical", ""),
-        code_snippets=article_content.get("code_snippets", []),
-        real_world_examples=article_content.get("real_world", ""),
-        practice_problems=article_content.get("practice", []),
-    )
-    db.add(article)
+    # Point the roadmap item at shared content, generating it only on first use
+    try:
+        article = await article_service.get_or_create_article(db, roadmap, current_user)
+    except ArticleGenerationError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Article generation is temporarily unavailable, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
     await db.commit()
     await db.refresh(article)
 
     return {"article_id": str(article.id), "message": "Article generated successfully"}
 
 
+@router.post("/{article_id}/generate/stream")
+async def generate_article_stream(
+    article_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Generate article content for a roadmap item, streamed as Server-Sent Events.
+
+    Events: "delta" appends text to a section, "item" appends an element to a
+    list section, "section" carries a whole section, and "done" (with the
+    article_id) or "error" ends the stream. If generation fails, a placeholder
+    is sent as sections before the "error" event and nothing is stored.
+    """
+    result = await db.execute(select(Roadmap.id).where(Roadmap.id == article_id))
+    roadmap_id = result.scalar_one_or_none()
+
+    if not roadmap_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap item not found"
+        )
+    # Give the connection back before streaming; generation uses its own short sessions
+    await db.close()
+
+    async def event_stream():
+        async for event, data in article_service.stream_article(roadmap_id, current_user.id):
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{article_id}/save")
 async def save_article(
     article_id: str,
@@ -244,37 +366,78 @@ async def unsave_article(
 
 @router.get("/library/saved")
 async def get_saved_articles(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[datetime] = Query(None, description="Keyset cursor: saved_at of the last item seen"),
+    before_id: Optional[UUID] = Query(None, description="Keyset tiebreaker: id of the last item seen"),
+    include_body: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get user's saved articles."""
-    result = await db.execute(
-        select(SavedArticle).where(
-            SavedArticle.user_id == current_user.id
-        ).order_by(SavedArticle.saved_at.desc())
+    """Get user's saved articles, newest first, in one joined query."""
+    columns = [
+        SavedArticle.saved_at,
+        SavedArticle.notes,
+        Article.id,
+        Article.title,
+        Article.slug,
+        Article.avg_read_time,
+        ArticleContent.tags,
+        Roadmap.day_number,
+        Roadmap.difficulty,
+        Topic.name.label("topic_name"),
+    ]
+    if include_body:
+        columns += [
+            ArticleContent.eli5_content,
+            ArticleContent.technical_content,
+            ArticleContent.code_snippets,
+            ArticleContent.real_world_examples,
+            ArticleContent.practice_problems,
+        ]
+
+    query = (
+        select(*columns)
+        .join(Article, Article.id == SavedArticle.article_id)
+        .outerjoin(ArticleContent, ArticleContent.id == Article.content_id)
+        .outerjoin(Roadmap, Roadmap.id == Article.roadmap_id)
+        .outerjoin(Topic, Topic.id == Roadmap.topic_id)
+        .where(SavedArticle.user_id == current_user.id)
+        .order_by(SavedArticle.saved_at.desc(), SavedArticle.article_id.desc())
     )
-    saved_articles = result.scalars().all()
+    if before is not None:
+        if before_id is not None:
+            query = query.where(
+                tuple_(SavedArticle.saved_at, SavedArticle.article_id) < tuple_(before, before_id)
+            )
+        else:
+            query = query.where(SavedArticle.saved_at < before)
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
 
     articles_data = []
-    for saved in saved_articles:
-        article = await db.get(Article, saved.article_id)
-        if not article:
-            continue
-
-        roadmap = await db.get(Roadmap, article.roadmap_id)
-        topic = await db.get(Topic, roadmap.topic_id) if roadmap else None
-
-        articles_data.append({
-            "id": str(article.id),
-            "title": article.title,
-            "slug": article.slug,
-            "topic_name": topic.name if topic else "Unknown",
-            "day_number": roadmap.day_number if roadmap else None,
-            "difficulty": roadmap.difficulty if roadmap else None,
-            "avg_read_time": article.avg_read_time,
-            "tags": article.tags,
-            "saved_at": saved.saved_at.isoformat(),
-            "notes": saved.notes,
-        })
+    for row in result.all():
+        item = {
+            "id": str(row.id),
+            "title": row.title,
+            "slug": row.slug,
+            "topic_name": row.topic_name or "Unknown",
+            "day_number": row.day_number,
+            "difficulty": row.difficulty,
+            "avg_read_time": row.avg_read_time,
+            "tags": row.tags,
+            "saved_at": row.saved_at.isoformat(),
+            "notes": row.notes,
+        }
+        if include_body:
+            item.update({
+                "eli5_content": row.eli5_content,
+                "technical_content": row.technical_content,
+                "code_snippets": row.code_snippets,
+                "real_world_examples": row.real_world_examples,
+                "practice_problems": row.practice_problems,
+            })
+        articles_data.append(item)
 
     return articles_data
@@ -8,14 +8,17 @@ from sqlalchemy import select
 
 from app.core.database import get_db
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    password_needs_rehash,
     create_access_token,
     get_current_user,
+    invalidate_user_cache,
 )
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.core.logging_config import get_user_journey_logger, JourneyType
+from app.services.scheduler_service import compute_send_slot
 
 router = APIRouter()
 
@@ -30,46 +33,46 @@ async def signup(
     request_id = str(uuid.uuid4())[:8]
     log = get_user_journey_logger(JourneyType.SIGNUP, request_id=request_id)
 
-    log.info(f"=== SIGNUP STARTED === email={user_data.email}")
-    log.debug(f"Signup request received - name={user_data.name}, has_phone={bool(user_data.phone_whatsapp)}")
+    log.info("=== SIGNUP STARTED === email={}", user_data.email)
+    log.debug("Signup request received - name={}, has_phone={}", user_data.name, bool(user_data.phone_whatsapp))
 
     try:
         # Step 1: Check if email already exists
-        log.debug(f"Step 1: Checking if email already exists")
+        log.debug("Step 1: Checking if email already exists")
         result = await db.execute(select(User).where(User.email == user_data.email))
         existing_user = result.scalar_one_or_none()
 
         if existing_user:
-            log.warning(f"Signup failed - email already registered: {user_data.email}")
+            log.warning("Signup failed - email already registered: {}", user_data.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        log.debug(f"Email check passed - email is available")
+        log.debug("Email check passed - email is available")
 
         # Step 2: Check if phone already exists (if provided)
         if user_data.phone_whatsapp:
-            log.debug(f"Step 2: Checking if phone already exists")
+            log.debug("Step 2: Checking if phone already exists")
             result = await db.execute(
                 select(User).where(User.phone_whatsapp == user_data.phone_whatsapp)
             )
             if result.scalar_one_or_none():
-                log.warning(f"Signup failed - phone already registered")
+                log.warning("Signup failed - phone already registered")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Phone number already registered"
                 )
-            log.debug(f"Phone check passed - phone is available")
+            log.debug("Phone check passed - phone is available")
         else:
-            log.debug(f"Step 2: Skipped - no phone provided")
+            log.debug("Step 2: Skipped - no phone provided")
 
         # Step 3: Hash password
-        log.debug(f"Step 3: Hashing password")
-        password_hash = get_password_hash(user_data.password)
-        log.debug(f"Password hashed successfully")
+        log.debug("Step 3: Hashing password")
+        password_hash = await get_password_hash_async(user_data.password)
+        log.debug("Password hashed successfully")
 
         # Step 4: Create user object
-        log.debug(f"Step 4: Creating user object")
+        log.debug("Step 4: Creating user object")
         user = User(
             email=user_data.email,
             password_hash=password_hash,
@@ -77,19 +80,20 @@ async def signup(
             phone_whatsapp=user_data.phone_whatsapp,
             timezone=user_data.timezone,
             preferred_time=user_data.preferred_time,
+            send_slot_utc=compute_send_slot(user_data.timezone, user_data.preferred_time),
         )
 
         # Step 5: Save to database
-        log.debug(f"Step 5: Saving user to database")
+        log.debug("Step 5: Saving user to database")
         db.add(user)
         await db.commit()
         await db.refresh(user)
-        log.info(f"User created successfully - user_id={user.id}")
+        log.info("User created successfully - user_id={}", user.id)
 
         # Step 6: Generate token
-        log.debug(f"Step 6: Generating access token")
+        log.debug("Step 6: Generating access token")
         access_token = create_access_token(subject=str(user.id))
-        log.info(f"=== SIGNUP COMPLETED SUCCESSFULLY === user_id={user.id}")
+        log.info("=== SIGNUP COMPLETED SUCCESSFULLY === user_id={}", user.id)
 
         return Token(access_token=access_token)
 
@@ -97,7 +101,7 @@ async def signup(
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        log.error(f"=== SIGNUP FAILED === error={str(e)}", exc_info=True)
+        log.opt(exception=True).error("=== SIGNUP FAILED === error={}", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Signup failed: {str(e)}"
@@ -114,43 +118,50 @@ async def login(
     request_id = str(uuid.uuid4())[:8]
     log = get_user_journey_logger(JourneyType.LOGIN, request_id=request_id)
 
-    log.info(f"=== LOGIN STARTED === email={user_data.email}")
+    log.info("=== LOGIN STARTED === email={}", user_data.email)
 
     try:
         # Step 1: Find user by email
-        log.debug(f"Step 1: Looking up user by email")
+        log.debug("Step 1: Looking up user by email")
         result = await db.execute(select(User).where(User.email == user_data.email))
         user = result.scalar_one_or_none()
 
         if not user:
-            log.warning(f"Login failed - user not found: {user_data.email}")
+            log.warning("Login failed - user not found: {}", user_data.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
-        log.debug(f"User found - user_id={user.id}")
+        log.debug("User found - user_id={}", user.id)
 
         # Step 2: Verify password
-        log.debug(f"Step 2: Verifying password")
-        if not verify_password(user_data.password, user.password_hash):
-            log.warning(f"Login failed - incorrect password for user_id={user.id}")
+        log.debug("Step 2: Verifying password")
+        if not await verify_password_async(user_data.password, user.password_hash):
+            log.warning("Login failed - incorrect password for user_id={}", user.id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
-        log.debug(f"Password verified successfully")
+        log.debug("Password verified successfully")
+
+        # Upgrade the stored hash when the configured cost has changed
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = await get_password_hash_async(user_data.password)
+            await db.commit()
+            invalidate_user_cache(user.id)
+            log.info("Password rehashed with updated cost - user_id={}", user.id)
 
         # Step 3: Generate token
-        log.debug(f"Step 3: Generating access token")
+        log.debug("Step 3: Generating access token")
         access_token = create_access_token(subject=str(user.id))
-        log.info(f"=== LOGIN COMPLETED SUCCESSFULLY === user_id={user.id}")
+        log.info("=== LOGIN COMPLETED SUCCESSFULLY === user_id={}", user.id)
 
         return Token(access_token=access_token)
 
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"=== LOGIN FAILED === error={str(e)}", exc_info=True)
+        log.opt(exception=True).error("=== LOGIN FAILED === error={}", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Login failed: {str(e)}"
@@ -164,5 +175,5 @@ async def get_current_user_info(
 ):
     """Get current user information."""
     log = get_user_journey_logger(JourneyType.LOGIN, user_id=str(current_user.id))
-    log.info(f"User info requested - user_id={current_user.id}")
+    log.info("User info requested - user_id={}", current_user.id)
     return current_user
@@ -1,13 +1,13 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.topic import Topic
-from app.models.roadmap import Roadmap
+from app.models.roadmap import Roadmap, UNREAD_STATUSES
 from app.models.article import Article
 from app.schemas.roadmap import RoadmapResponse, RoadmapItemResponse
 
@@ -20,46 +20,36 @@ async def get_all_roadmaps(
     current_user: User = Depends(get_current_user)
 ):
     """Get all roadmaps for current user."""
-    # Get unique topic IDs for user's roadmaps
+    # One aggregate over the user's roadmap rows, grouped per topic
     result = await db.execute(
-        select(Roadmap.topic_id).where(
-            Roadmap.user_id == current_user.id
-        ).distinct()
-    )
-    topic_ids = [row[0] for row in result.all()]
-
-    roadmaps_data = []
-    for topic_id in topic_ids:
-        topic = await db.get(Topic, topic_id)
-        if not topic:
-            continue
-
-        result = await db.execute(
-            select(Roadmap).where(
-                and_(
-                    Roadmap.user_id == current_user.id,
-                    Roadmap.topic_id == topic_id
-                )
-            ).order_by(Roadmap.day_number)
-        )
-        items = result.scalars().all()
-
-        completed = len([i for i in items if i.status == "read"])
-        current_day = next(
-            (i.day_number for i in items if i.status in ["pending", "sent"]),
-            len(items)
+        select(
+            Roadmap.topic_id,
+            Topic.name,
+            Topic.slug,
+            func.count(Roadmap.id).label("total_days"),
+            func.count(Roadmap.id).filter(Roadmap.status == "read").label("completed_days"),
+            func.coalesce(
+                func.min(Roadmap.day_number).filter(Roadmap.status.in_(UNREAD_STATUSES)),
+                func.count(Roadmap.id),
+            ).label("current_day"),
         )
+        .join(Topic, Topic.id == Roadmap.topic_id)
+        .where(Roadmap.user_id == current_user.id)
+        .group_by(Roadmap.topic_id, Topic.name, Topic.slug)
+        .order_by(Topic.name)
+    )
 
-        roadmaps_data.append({
-            "topic_id": str(topic_id),
-            "topic_name": topic.name,
-            "topic_slug": topic.slug,
-            "total_days": len(items),
-            "completed_days": completed,
-            "current_day": current_day,
-        })
-
-    return roadmaps_data
+    return [
+        {
+            "topic_id": str(row.topic_id),
+            "topic_name": row.name,
+            "topic_slug": row.slug,
+            "total_days": row.total_days,
+            "completed_days": row.completed_days,
+            "current_day": row.current_day,
+        }
+        for row in result.all()
+    ]
 
 
 @router.get("/topic/{topic_id}")
@@ -76,30 +66,38 @@ async def get_roadmap_by_topic(
             detail="Topic not found"
         )
 
+    # Items, article presence and progress totals in a single query
     result = await db.execute(
-        select(Roadmap).where(
+        select(
+            Roadmap,
+            Article.id.label("article_id"),
+            func.count().over().label("total_days"),
+            func.count().filter(Roadmap.status == "read").over().label("completed_days"),
+            func.min(Roadmap.day_number)
+            .filter(Roadmap.status.in_(UNREAD_STATUSES))
+            .over()
+            .label("current_day"),
+        )
+        .outerjoin(Article, Article.roadmap_id == Roadmap.id)
+        .where(
             and_(
                 Roadmap.user_id == current_user.id,
                 Roadmap.topic_id == topic_id
             )
-        ).order_by(Roadmap.day_number)
+        )
+        .order_by(Roadmap.day_number)
     )
-    items = result.scalars().all()
+    rows = result.all()
 
-    if not items:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No roadmap found for this topic"
         )
 
-    # Check which items have articles
     items_data = []
-    for item in items:
-        result = await db.execute(
-            select(Article).where(Article.roadmap_id == item.id)
-        )
-        article = result.scalar_one_or_none()
-
+    for row in rows:
+        item = row.Roadmap
         items_data.append({
             "id": str(item.id),
             "day_number": item.day_number,
@@ -111,22 +109,17 @@ async def get_roadmap_by_topic(
             "scheduled_date": item.scheduled_date.isoformat() if item.scheduled_date else None,
             "sent_at": item.sent_at.isoformat() if item.sent_at else None,
             "responded_at": item.responded_at.isoformat() if item.responded_at else None,
-            "has_article": article is not None,
-            "article_id": str(article.id) if article else None,
+            "has_article": row.article_id is not None,
+            "article_id": str(row.article_id) if row.article_id else None,
         })
 
-    completed = len([i for i in items if i.status == "read"])
-    current_day = next(
-        (i.day_number for i in items if i.status in ["pending", "sent"]),
-        len(items)
-    )
-
+    totals = rows[0]
     return {
         "topic_id": str(topic_id),
         "topic_name": topic.name,
-        "total_days": len(items),
-        "completed_days": completed,
-        "current_day": current_day,
+        "total_days": totals.total_days,
+        "completed_days": totals.completed_days,
+        "current_day": totals.current_day if totals.current_day is not None else totals.total_days,
         "items": items_data,
     }
 
@@ -137,31 +130,30 @@ async def get_today_concept(
     current_user: User = Depends(get_current_user)
 ):
     """Get today's concept for the user."""
-    # Find the next pending or sent concept
+    # Find the next unread concept with its topic and article
     result = await db.execute(
-        select(Roadmap).where(
+        select(Roadmap, Topic.name.label("topic_name"), Article.id.label("article_id"))
+        .outerjoin(Topic, Topic.id == Roadmap.topic_id)
+        .outerjoin(Article, Article.roadmap_id == Roadmap.id)
+        .where(
             and_(
                 Roadmap.user_id == current_user.id,
-                Roadmap.status.in_(["pending", "sent"])
+                Roadmap.status.in_(UNREAD_STATUSES)
             )
-        ).order_by(Roadmap.day_number)
+        )
+        .order_by(Roadmap.day_number)
+        .limit(1)
     )
-    roadmap_item = result.scalar_one_or_none()
+    row = result.first()
 
-    if not roadmap_item:
+    if not row:
         return {"message": "No concepts scheduled for today"}
 
-    topic = await db.get(Topic, roadmap_item.topic_id)
-
-    # Check if article exists
-    result = await db.execute(
-        select(Article).where(Article.roadmap_id == roadmap_item.id)
-    )
-    article = result.scalar_one_or_none()
+    roadmap_item = row.Roadmap
 
     return {
         "id": str(roadmap_item.id),
-        "topic_name": topic.name if topic else "Unknown",
+        "topic_name": row.topic_name or "Unknown",
         "day_number": roadmap_item.day_number,
         "concept_title": roadmap_item.concept_title,
         "concept_slug": roadmap_item.concept_slug,
@@ -169,6 +161,6 @@ async def get_today_concept(
         "estimated_read_time": roadmap_item.estimated_read_time,
         "hook_message": roadmap_item.hook_message,
         "status": roadmap_item.status,
-        "has_article": article is not None,
-        "article_id": str(article.id) if article else None,
+        "has_article": row.article_id is not None,
+        "article_id": str(row.article_id) if row.article_id else None,
     }
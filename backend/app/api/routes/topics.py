@@ -1,10 +1,14 @@
 from typing import List
 from datetime import date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.http_cache import cached_response, etag_for, json_bytes
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.topic import Topic
@@ -12,31 +16,55 @@ from app.models.user_topic import UserTopic
 from app.models.roadmap import Roadmap
 from app.models.user_progress import UserProgress
 from app.schemas.topic import TopicResponse, TopicSelection
-from app.services.llm_service import llm_service
+from app.services.roadmap_template_service import roadmap_template_service
 
 router = APIRouter()
 
 
+# Serialized catalog responses; the catalog only changes when seed_data runs
+_catalog_cache = TTLCache(maxsize=256, ttl=settings.TOPICS_CACHE_SECONDS)
+
+
+def _catalog_cache_control() -> str:
+    max_age = settings.TOPICS_CACHE_SECONDS
+    return f"public, max-age={max_age}, stale-while-revalidate={max_age * 12}"
+
+
 @router.get("/", response_model=List[TopicResponse])
-async def get_all_topics(db: AsyncSession = Depends(get_db)):
+async def get_all_topics(request: Request, db: AsyncSession = Depends(get_db)):
     """Get all available topics."""
-    result = await db.execute(
-        select(Topic).where(Topic.is_active == "true").order_by(Topic.name)
-    )
-    return result.scalars().all()
+    cached = _catalog_cache.get("all")
+    if cached is None:
+        result = await db.execute(
+            select(Topic).where(Topic.is_active == "true").order_by(Topic.name)
+        )
+        topics = [TopicResponse.model_validate(topic) for topic in result.scalars().all()]
+        body = json_bytes(topics)
+        cached = (body, etag_for(body))
+        _catalog_cache.set("all", cached)
+
+    body, etag = cached
+    return cached_response(request, body, _catalog_cache_control(), etag=etag)
 
 
 @router.get("/{topic_id}", response_model=TopicResponse)
-async def get_topic(topic_id: str, db: AsyncSession = Depends(get_db)):
+async def get_topic(topic_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     """Get a specific topic by ID."""
-    result = await db.execute(select(Topic).where(Topic.id == topic_id))
-    topic = result.scalar_one_or_none()
-    if not topic:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Topic not found"
-        )
-    return topic
+    cached = _catalog_cache.get(topic_id)
+    if cached is None:
+        result = await db.execute(select(Topic).where(Topic.id == topic_id))
+        topic = result.scalar_one_or_none()
+        if not topic:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Topic not found"
+            )
+        body = json_bytes(TopicResponse.model_validate(topic))
+        cached = (body, etag_for(body))
+        _catalog_cache.set(topic_id, cached)
+
+    body, etag = cached
+    return cached_response(request, body, _catalog_cache_control(), etag=etag)
 
 
 @router.post("/select")
@@ -58,68 +86,85 @@ async def select_topics(
             detail="Duration must be 30, 60, or 90 days"
         )
 
-    created_topics = []
     start_date = date.today()
     target_date = start_date + timedelta(days=selection.duration_days)
 
-    for topic_id in selection.topic_ids:
-        # Verify topic exists
-        result = await db.execute(select(Topic).where(Topic.id == topic_id))
-        topic = result.scalar_one_or_none()
-        if not topic:
-            continue
-
-        # Check if user already has this topic
+    # Resolve all requested topics in one query, keeping the caller's order
+    result = await db.execute(select(Topic).where(Topic.id.in_(selection.topic_ids)))
+    topics_by_id = {topic.id: topic for topic in result.scalars().all()}
+    topics = [
+        topics_by_id[topic_id]
+        for topic_id in dict.fromkeys(selection.topic_ids)
+        if topic_id in topics_by_id
+    ]
+
+    # Resolve roadmap templates before the write transaction: a miss calls the
+    # LLM, and nothing may hold the user_topics/user_progress unique keys meanwhile
+    items_by_topic = {}
+    if topics:
         result = await db.execute(
-            select(UserTopic).where(
-                UserTopic.user_id == current_user.id,
-                UserTopic.topic_id == topic_id
+            select(UserTopic.topic_id).where(
+                and_(
+                    UserTopic.user_id == current_user.id,
+                    UserTopic.topic_id.in_([topic.id for topic in topics]),
+                )
             )
         )
-        existing = result.scalar_one_or_none()
-        if existing:
-            continue  # Skip if already selected
+        enrolled = set(result.scalars().all())
+        candidates = [topic for topic in topics if topic.id not in enrolled]
+        if candidates:
+            # Copied from cached templates; the LLM only runs on a miss
+            items_by_topic = await roadmap_template_service.get_items(
+                db,
+                topics=candidates,
+                duration_days=selection.duration_days,
+                experience_level=current_user.experience_level,
+            )
 
-        # Create user-topic association
-        user_topic = UserTopic(
-            user_id=current_user.id,
-            topic_id=topic_id,
-            start_date=start_date,
-            target_completion_date=target_date,
-            duration_days=str(selection.duration_days),
+    # Create user-topic associations; topics the user already has are skipped
+    new_topic_ids = set()
+    if topics:
+        result = await db.execute(
+            insert(UserTopic)
+            .values([
+                {
+                    "user_id": current_user.id,
+                    "topic_id": topic.id,
+                    "start_date": start_date,
+                    "target_completion_date": target_date,
+                    "duration_days": str(selection.duration_days),
+                }
+                for topic in topics
+            ])
+            .on_conflict_do_nothing(constraint="unique_user_topic")
+            .returning(UserTopic.topic_id)
         )
-        db.add(user_topic)
-
-        # Create user progress record
-        progress = UserProgress(
-            user_id=current_user.id,
-            topic_id=topic_id,
+        new_topic_ids = set(result.scalars().all())
+    new_topics = [topic for topic in topics if topic.id in new_topic_ids]
+
+    if new_topics:
+        # Create user progress records
+        await db.execute(
+            insert(UserProgress)
+            .values([
+                {
+                    "user_id": current_user.id,
+                    "topic_id": topic.id,
+                }
+                for topic in new_topics
+            ])
+            .on_conflict_do_nothing(constraint="unique_user_progress")
         )
-        db.add(progress)
 
-        # Generate roadmap for this topic
-        roadmap_items = await llm_service.generate_roadmap(
-            topic_name=topic.name,
-            duration_days=selection.duration_days,
-            user_level=current_user.experience_level or "intermediate"
+        await roadmap_template_service.materialize(
+            db,
+            user_id=current_user.id,
+            items_by_topic={topic.id: items_by_topic[str(topic.id)] for topic in new_topics},
+            start_date=start_date,
         )
 
-        for item in roadmap_items:
-            roadmap_entry = Roadmap(
-                user_id=current_user.id,
-                topic_id=topic_id,
-                day_number=item["day"],
-                concept_title=item["concept"],
-                concept_slug=item["concept"].lower().replace(" ", "-").replace("'", ""),
-                difficulty=item.get("difficulty", "medium"),
-                estimated_read_time=item.get("read_time", 10),
-                scheduled_date=start_date + timedelta(days=item["day"] - 1),
-            )
-            db.add(roadmap_entry)
-
-        created_topics.append(topic.name)
-
     await db.commit()
+    created_topics = [topic.name for topic in new_topics]
 
     return {
         "message": f"Successfully enrolled in {len(created_topics)} topic(s)",
@@ -135,52 +180,60 @@ async def get_my_topics(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get user's selected topics with progress."""
-    result = await db.execute(
-        select(UserTopic).where(UserTopic.user_id == current_user.id)
+    """Get user's selected topics with progress, in one query."""
+    # Per-topic roadmap counts, served from the (user_id, topic_id, status) index
+    counts = (
+        select(
+            Roadmap.topic_id,
+            func.count().label("total"),
+            func.count().filter(Roadmap.status == "read").label("completed"),
+        )
+        .where(Roadmap.user_id == current_user.id)
+        .group_by(Roadmap.topic_id)
+        .subquery()
     )
-    user_topics = result.scalars().all()
-
-    topics_data = []
-    for ut in user_topics:
-        # Get topic details
-        topic = await db.get(Topic, ut.topic_id)
-        if not topic:
-            continue
-
-        # Get progress
-        result = await db.execute(
-            select(UserProgress).where(
-                UserProgress.user_id == current_user.id,
-                UserProgress.topic_id == ut.topic_id
-            )
+    result = await db.execute(
+        select(
+            UserTopic.topic_id,
+            UserTopic.start_date,
+            UserTopic.target_completion_date,
+            UserTopic.status,
+            Topic.name,
+            Topic.slug,
+            Topic.icon,
+            UserProgress.streak_count,
+            counts.c.total,
+            counts.c.completed,
         )
-        progress = result.scalar_one_or_none()
-
-        # Get roadmap stats
-        result = await db.execute(
-            select(Roadmap).where(
-                Roadmap.user_id == current_user.id,
-                Roadmap.topic_id == ut.topic_id
+        .join(Topic, Topic.id == UserTopic.topic_id)
+        .outerjoin(
+            UserProgress,
+            and_(
+                UserProgress.user_id == UserTopic.user_id,
+                UserProgress.topic_id == UserTopic.topic_id,
             )
         )
-        roadmap_items = result.scalars().all()
-        completed = len([r for r in roadmap_items if r.status == "read"])
-        total = len(roadmap_items)
+        .outerjoin(counts, counts.c.topic_id == UserTopic.topic_id)
+        .where(UserTopic.user_id == current_user.id)
+    )
 
+    topics_data = []
+    for row in result.all():
+        completed = row.completed or 0
+        total = row.total or 0
         topics_data.append({
-            "topic_id": str(ut.topic_id),
-            "topic_name": topic.name,
-            "topic_slug": topic.slug,
-            "topic_icon": topic.icon,
-            "start_date": ut.start_date.isoformat() if ut.start_date else None,
-            "target_date": ut.target_completion_date.isoformat() if ut.target_completion_date else None,
-            "status": ut.status,
+            "topic_id": str(row.topic_id),
+            "topic_name": row.name,
+            "topic_slug": row.slug,
+            "topic_icon": row.icon,
+            "start_date": row.start_date.isoformat() if row.start_date else None,
+            "target_date": row.target_completion_date.isoformat() if row.target_completion_date else None,
+            "status": row.status,
             "progress": {
                 "completed": completed,
                 "total": total,
                 "percentage": round((completed / total * 100) if total > 0 else 0, 1),
-                "streak": progress.streak_count if progress else 0,
+                "streak": row.streak_count or 0,
             }
         })
 
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_user_cache
 from app.models.user import User
 from app.models.user_progress import UserProgress
 from app.schemas.user import UserResponse, UserUpdate, SkillAnalysis
 from app.services.resume_parser import resume_parser
-from app.services.llm_service import llm_service
+from app.services.resume_analysis_cache import resume_analysis_cache, sha256_hex
+from app.services.scheduler_service import compute_send_slot
 
 router = APIRouter()
 
@@ -30,7 +33,13 @@ async def update_profile(
     for field, value in update_dict.items():
         setattr(current_user, field, value)
 
+    if "timezone" in update_dict or "preferred_time" in update_dict:
+        current_user.send_slot_utc = compute_send_slot(
+            current_user.timezone, current_user.preferred_time
+        )
+
     await db.commit()
+    invalidate_user_cache(current_user.id)
     await db.refresh(current_user)
     return current_user
 
@@ -49,24 +58,33 @@ async def upload_resume(
             detail="Only PDF and DOCX files are supported"
         )
 
-    # Validate file size (max 5MB)
+    # Validate file size (max 5MB). BodySizeLimitMiddleware already cut off
+    # anything much larger before it was received; this checks the file itself
     content = await file.read()
-    if len(content) > 5 * 1024 * 1024:
+    if len(content) > settings.RESUME_MAX_UPLOAD_BYTES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File size must be less than 5MB"
         )
 
-    # Parse resume
-    resume_text = await resume_parser.parse(content, file.filename)
-    if not resume_text:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Could not parse resume. Please try a different file."
-        )
+    # Byte-identical re-uploads skip parsing and the LLM entirely
+    file_hash = sha256_hex(content)
+    skill_analysis = await resume_analysis_cache.get_by_file(db, file_hash)
 
-    # Analyze with LLM
-    skill_analysis = await llm_service.analyze_resume(resume_text)
+    if skill_analysis is None:
+        # Don't sit idle in a transaction through parsing and the LLM call
+        await db.commit()
+
+        # Parse resume
+        resume_text = await resume_parser.parse(content, file.filename)
+        if not resume_text:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Could not parse resume. Please try a different file."
+            )
+
+        # Analyze with LLM, reusing the result for matching normalized text
+        skill_analysis = await resume_analysis_cache.analyze(resume_text, file_hash)
 
     # Update user
     current_user.skill_analysis = skill_analysis
@@ -75,6 +93,7 @@ async def upload_resume(
     # current_user.resume_url = uploaded_url
 
     await db.commit()
+    invalidate_user_cache(current_user.id)
     await db.refresh(current_user)
 
     return SkillAnalysis(**skill_analysis)
@@ -85,27 +104,34 @@ async def get_user_stats(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get user's learning statistics."""
+    """Get user's learning statistics, aggregated in a single query."""
+    badge_progress = aliased(UserProgress)
+    badge = func.jsonb_array_elements_text(badge_progress.badges).column_valued("badge")
+    badges = (
+        select(func.array_agg(badge.distinct()))
+        .select_from(badge_progress)
+        .where(badge_progress.user_id == current_user.id)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(UserProgress).where(UserProgress.user_id == current_user.id)
+        select(
+            func.coalesce(func.max(UserProgress.streak_count), 0).label("current_streak"),
+            func.coalesce(func.max(UserProgress.longest_streak), 0).label("longest_streak"),
+            func.coalesce(func.sum(UserProgress.total_concepts_learned), 0).label("total_concepts"),
+            func.coalesce(func.sum(UserProgress.total_articles_read), 0).label("total_articles"),
+            func.count().filter(UserProgress.total_concepts_learned > 0).label("topics_in_progress"),
+            badges.label("badges"),
+        ).where(UserProgress.user_id == current_user.id)
     )
-    progress_records = result.scalars().all()
-
-    total_streak = max([p.streak_count for p in progress_records], default=0)
-    total_concepts = sum([p.total_concepts_learned for p in progress_records])
-    total_articles = sum([p.total_articles_read for p in progress_records])
-    all_badges = []
-    for p in progress_records:
-        if p.badges:
-            all_badges.extend(p.badges)
+    stats = result.one()
 
     return {
-        "current_streak": total_streak,
-        "longest_streak": max([p.longest_streak for p in progress_records], default=0),
-        "total_concepts_learned": total_concepts,
-        "total_articles_read": total_articles,
-        "badges": list(set(all_badges)),
-        "topics_in_progress": len([p for p in progress_records if p.total_concepts_learned > 0]),
+        "current_streak": stats.current_streak,
+        "longest_streak": stats.longest_streak,
+        "total_concepts_learned": stats.total_concepts,
+        "total_articles_read": stats.total_articles,
+        "badges": stats.badges or [],
+        "topics_in_progress": stats.topics_in_progress,
     }
 
 
@@ -140,6 +166,7 @@ async def connect_whatsapp(
     current_user.whatsapp_connected = "connected"
 
     await db.commit()
+    invalidate_user_cache(current_user.id)
 
     return {
         "message": "WhatsApp connected successfully",
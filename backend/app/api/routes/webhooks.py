@@ -1,9 +1,10 @@
+import uuid
 from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from app.core.database import get_db
-from app.services.scheduler_service import scheduler_service
+from app.services.inbound_queue import inbound_queue
 
 router = APIRouter()
 
@@ -21,16 +22,20 @@ async def whatsapp_webhook(
         message_body = form_data.get("Body", "").strip()
         from_number = form_data.get("From", "").replace("whatsapp:", "")
         to_number = form_data.get("To", "").replace("whatsapp:", "")
-        message_sid = form_data.get("MessageSid", "")
+        message_sid = form_data.get("MessageSid", "") or f"local-{uuid.uuid4()}"
 
         logger.info(f"Received WhatsApp message from {from_number}: {message_body}")
 
-        # Process the response
-        await scheduler_service.process_user_response(
+        # Persist and acknowledge; the inbound queue workers send the reply
+        queued = await inbound_queue.enqueue(
             db=db,
-            phone_number=from_number,
-            response=message_body
+            message_sid=message_sid,
+            from_number=from_number,
+            to_number=to_number,
+            body=message_body
         )
+        if not queued:
+            logger.info("Duplicate WhatsApp message ignored: {}", message_sid)
 
         # Return empty TwiML response (Twilio expects this)
         return Response(
@@ -39,10 +44,12 @@ async def whatsapp_webhook(
         )
 
     except Exception as e:
+        # Nothing was persisted, so let Twilio retry the delivery
         logger.error(f"Webhook error: {e}")
         return Response(
             content='<?xml version="1.0" encoding="UTF-8"?><Response></Response>',
-            media_type="application/xml"
+            media_type="application/xml",
+            status_code=503
         )
 
 
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional
+from typing import Optional, Dict
 
 
 class Settings(BaseSettings):
@@ -11,22 +11,91 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_PROFILE: str = "default"  # default (pre-ping), recycle, pgbouncer (transaction mode)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Checkout wait before a request fails
+    DB_POOL_RECYCLE_SECONDS: int = 300  # Keep below the server/pooler idle timeout
+
+    # Logging
+    LOG_LEVEL: str = "INFO"  # Application log file level; DEBUG formats every debug call
+    LOG_FORMAT: str = "text"  # text, json (JSON lines)
+    LOG_WRITER: str = "thread"  # thread (in-process queue), process (background writer)
+    JOURNEY_LOG_LEVEL: str = "INFO"
+    JOURNEY_LOG_SAMPLE_RATES: Dict[str, float] = {}  # e.g. {"login": 0.1}
 
     # Redis
     REDIS_URL: Optional[str] = None
 
+    # Article view counters
+    VIEW_COUNTER_BACKEND: str = "memory"  # memory, redis
+    VIEW_COUNTER_FLUSH_SECONDS: float = 10.0
+
+    # HTTP caching
+    TOPICS_CACHE_SECONDS: int = 300  # Catalog only changes when seed_data runs
+    ARTICLE_BODY_MAX_AGE: int = 365 * 24 * 3600  # Bodies are immutable once generated
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    AUTH_CACHE_TTL_SECONDS: float = 60.0  # Verified tokens and user snapshots
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on next login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Beyond this, signup/login get 503
+    METRICS_TOKEN: Optional[str] = None  # Bearer token for GET /metrics; unset disables it
 
     # Groq API
     GROQ_API_KEY: str
+    LLM_MAX_CONCURRENCY: int = 16  # In-flight completions per process
+    LLM_MAX_CONNECTIONS: int = 32  # Pooled HTTP connections to Groq
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    GENERATION_CLAIM_SECONDS: int = 180  # Lease on a shared generation; taken over if its holder dies
+    GENERATION_WAIT_SECONDS: float = 60.0  # Longest a request waits on another replica's generation
 
     # Twilio WhatsApp
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_WHATSAPP_NUMBER: str = "+14155238886"
+    TWILIO_MESSAGES_PER_SECOND: float = 10.0  # Per-account throughput limit
+    TWILIO_MAX_RETRIES: int = 3  # On 429/503 and failed connects (never after a send)
+    TWILIO_MAX_CONNECTIONS: int = 20
+    TWILIO_TIMEOUT_SECONDS: float = 15.0
+
+    # Daily message dispatch
+    DISPATCH_HOOK_WORKERS: int = 8  # Concurrent hook generations
+    DISPATCH_SEND_WORKERS: int = 16  # Concurrent WhatsApp sends
+    DISPATCH_QUEUE_SIZE: int = 256
+    DISPATCH_SENDING_TIMEOUT_SECONDS: int = 600  # Items left "sending" after this count as sent
+
+    # Look-ahead pre-generation of hooks and articles
+    PREGENERATE_DAYS: int = 2  # Upcoming roadmap items per user to prepare
+    PREGENERATE_CONCURRENCY: int = 4
+    PREGENERATE_BATCH_SIZE: int = 500  # Items per run
+    PREGENERATE_LLM_RESERVE: int = 8  # LLM slots always left for live traffic (capped below LLM_MAX_CONCURRENCY)
+    PREGENERATE_WAIT_SECONDS: int = 120  # Skip an item until the next run if the LLM stays busy this long
+
+    # Inbound WhatsApp queue
+    INBOUND_WORKERS: int = 4
+    INBOUND_POLL_SECONDS: float = 5.0  # Fallback poll when no local wake-up arrives
+    INBOUND_MAX_ATTEMPTS: int = 5
+    INBOUND_RETRY_BASE_SECONDS: float = 15.0  # Doubles after each failed attempt
+    INBOUND_RETRY_MAX_SECONDS: float = 900.0
+    INBOUND_VISIBILITY_TIMEOUT_SECONDS: int = 300  # Reclaim messages from crashed workers
+    INBOUND_RETENTION_DAYS: int = 30  # Delete done/failed messages received before this
+    INBOUND_PURGE_BATCH_SIZE: int = 5000  # Rows per delete transaction
+
+    # Roadmap templates
+    ROADMAP_TEMPLATE_TTL_DAYS: int = 30  # Serve, then refresh in the background
+
+    # Resume parsing
+    RESUME_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    RESUME_PARSER_WORKERS: int = 2  # Worker processes for PDF/DOCX extraction
+    RESUME_PARSE_TIMEOUT_SECONDS: float = 15.0  # Per extraction job
+    RESUME_MAX_PAGES: int = 20
+    RESUME_PAGES_PER_JOB: int = 5  # Longer PDFs are extracted in parallel chunks
+    RESUME_LLM_MAX_CHARS: int = 6000  # Longer resumes are condensed before analysis
 
     # File Storage (S3/R2)
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -1,15 +1,92 @@
+from time import perf_counter
+from typing import Any, Dict
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
+POOL_PROFILES = ("default", "recycle", "pgbouncer")
+
+_pool_metrics: Dict[str, float] = {
+    "checkouts": 0,
+    "timeouts": 0,
+    "waiting": 0,
+    "total_wait_seconds": 0.0,
+    "max_wait_seconds": 0.0,
+}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout waiters and latency."""
+
+    def _do_get(self):
+        _pool_metrics["waiting"] += 1
+        start = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _pool_metrics["timeouts"] += 1
+            raise
+        finally:
+            _pool_metrics["waiting"] -= 1
+        elapsed = perf_counter() - start
+        _pool_metrics["checkouts"] += 1
+        _pool_metrics["total_wait_seconds"] += elapsed
+        _pool_metrics["max_wait_seconds"] = max(_pool_metrics["max_wait_seconds"], elapsed)
+        return connection
+
+
+def connect_args() -> Dict[str, Any]:
+    """asyncpg connect arguments for the configured pool profile.
+
+    PgBouncer in transaction mode hands each transaction to any server
+    connection, so named prepared statements can't be cached per client:
+    both caches are disabled and names are made unique.
+    """
+    if settings.DB_POOL_PROFILE != "pgbouncer":
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def engine_options() -> Dict[str, Any]:
+    """Pool settings for the configured profile.
+
+    - default: pre-ping on every checkout (one extra round trip each time).
+    - recycle: no pre-ping; connections are replaced after
+      DB_POOL_RECYCLE_SECONDS and reused LIFO so idle extras age out.
+    - pgbouncer: recycle, plus a statement cache setup that is safe behind
+      a transaction-mode pooler such as Neon's.
+    """
+    if settings.DB_POOL_PROFILE not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE: {settings.DB_POOL_PROFILE}")
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "connect_args": connect_args(),
+    }
+    if settings.DB_POOL_PROFILE == "default":
+        options["pool_pre_ping"] = True
+    else:
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+        options["pool_use_lifo"] = True
+    return options
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    **engine_options(),
 )
 
 # Session factory
@@ -38,12 +115,21 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
-async def init_db():
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-
 async def close_db():
     """Close database connection."""
     await engine.dispose()
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Snapshot of connection pool gauges and checkout latency."""
+    pool = engine.pool
+    checkouts = _pool_metrics["checkouts"]
+    return {
+        "profile": settings.DB_POOL_PROFILE,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **_pool_metrics,
+        "avg_wait_seconds": _pool_metrics["total_wait_seconds"] / checkouts if checkouts else 0.0,
+    }
@@ -0,0 +1,92 @@
+"""
+Conditional GET helpers: ETag / Last-Modified validators, 304 handling and
+Cache-Control headers for responses that browsers and CDNs may cache.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def json_bytes(content: Any) -> bytes:
+    """Serialize a response payload once, so it can be hashed and cached."""
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+
+
+def etag_for(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _not_modified_since(request: Request, last_modified: datetime) -> bool:
+    # If-None-Match takes precedence when both are sent
+    if "if-none-match" in request.headers:
+        return False
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _validator_headers(
+    etag: str,
+    cache_control: str,
+    last_modified: Optional[datetime]
+) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(
+    request: Request,
+    etag: str,
+    cache_control: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """A 304 response if the client's copy is still current, else None."""
+    if _etag_matches(request, etag) or (
+        last_modified is not None and _not_modified_since(request, last_modified)
+    ):
+        return Response(
+            status_code=304,
+            headers=_validator_headers(etag, cache_control, last_modified),
+        )
+    return None
+
+
+def cached_response(
+    request: Request,
+    body: bytes,
+    cache_control: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None
+) -> Response:
+    """JSON response with validators, or 304 when the client already has it."""
+    etag = etag or etag_for(body)
+    return not_modified(request, etag, cache_control, last_modified) or Response(
+        content=body,
+        media_type="application/json",
+        headers=_validator_headers(etag, cache_control, last_modified),
+    )
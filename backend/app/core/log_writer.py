@@ -0,0 +1,48 @@
+"""
+Background log writer process.
+
+Receives already formatted log lines over a multiprocessing queue and owns
+the rotating file sinks, so file I/O, rotation and compression never run in
+the API process. Kept free of app imports so the spawned child starts fast.
+"""
+from pathlib import Path
+from loguru import logger
+
+ERROR_LEVEL_NO = 40
+
+
+def run_writer(queue, logs_dir: str, retention: str, compression: str, suffix: str):
+    """Entry point of the writer process; exits when it receives None."""
+    logs_dir = Path(logs_dir)
+    logger.remove()
+
+    raw = lambda record: "{message}"  # Lines arrive fully formatted
+    common = dict(format=raw, rotation="00:00", retention=retention, compression=compression)
+
+    logger.add(
+        logs_dir / f"app_{{time:YYYY-MM-DD}}.{suffix}",
+        level=0,
+        filter=lambda record: record["extra"].get("app", False),
+        **common,
+    )
+    logger.add(
+        logs_dir / f"errors_{{time:YYYY-MM-DD}}.{suffix}",
+        level=ERROR_LEVEL_NO,
+        filter=lambda record: record["extra"].get("app", False),
+        **common,
+    )
+    logger.add(
+        logs_dir / f"user_journey_{{time:YYYY-MM-DD}}.{suffix}",
+        level=0,
+        filter=lambda record: record["extra"].get("journey", False),
+        **common,
+    )
+
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        level_no, to_app, to_journey, line = item
+        logger.bind(app=to_app, journey=to_journey).log(level_no, line)
+
+    logger.complete()
@@ -1,17 +1,40 @@
 """
 Comprehensive logging configuration for DailyDev.
 Logs are stored in /logs directory with rotation.
+
+Behaviour is controlled by settings:
+- LOG_LEVEL gates the application log; anything below it is dropped before
+  the message is formatted (use brace-style arguments, not f-strings).
+- JOURNEY_LOG_LEVEL gates the user journey log the same way, and
+  JOURNEY_LOG_SAMPLE_RATES samples it per journey type. Warnings and errors
+  are never sampled out. The console logs INFO and up, so DEBUG calls are
+  only formatted when one of these levels is DEBUG.
+- LOG_FORMAT="json" writes JSON lines instead of text.
+- LOG_WRITER="process" hands formatted lines to a separate writer process
+  that owns the files, rotation and compression.
 """
+import multiprocessing
 import os
+import queue
 import sys
-from datetime import datetime
+import zlib
 from pathlib import Path
 from loguru import logger
 
+from app.core.config import settings
+
 # Create logs directory
 LOGS_DIR = Path(__file__).parent.parent.parent / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
+RETENTION = "30 days"
+COMPRESSION = "zip"
+WARNING_LEVEL_NO = 30
+APP_LEVEL_NO = logger.level(settings.LOG_LEVEL).no
+JOURNEY_LEVEL_NO = logger.level(settings.JOURNEY_LOG_LEVEL).no
+# Set while spawning the writer, so its re-import of this module is a no-op
+WRITER_CHILD_ENV = "DAILYDEV_LOG_WRITER_CHILD"
+
 # Remove default logger
 logger.remove()
 
@@ -39,55 +62,146 @@ def format_record(record):
     return format_string
 
 
-# Console logging format (simplified for development)
-console_format = (
-    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-    "<level>{level: <8}</level> | "
-    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-    "<level>{message}</level>"
-)
-
-# Add console handler
-logger.add(
-    sys.stdout,
-    format=console_format,
-    level="INFO",
-    colorize=True,
-)
-
-# General application log
-logger.add(
-    LOGS_DIR / "app_{time:YYYY-MM-DD}.log",
-    format=format_record,
-    level="DEBUG",
-    rotation="00:00",
-    retention="30 days",
-    compression="zip",
-    enqueue=True,
-)
-
-# Error-specific log
-logger.add(
-    LOGS_DIR / "errors_{time:YYYY-MM-DD}.log",
-    format=format_record,
-    level="ERROR",
-    rotation="00:00",
-    retention="30 days",
-    compression="zip",
-    enqueue=True,
-)
-
-# User journey log (signup, login, article views, etc.)
-logger.add(
-    LOGS_DIR / "user_journey_{time:YYYY-MM-DD}.log",
-    format=format_record,
-    level="INFO",
-    rotation="00:00",
-    retention="30 days",
-    compression="zip",
-    enqueue=True,
-    filter=lambda record: record["extra"].get("user_journey") is not None,
-)
+def _journey_sampled(record) -> bool:
+    """Sample journey records, keeping a request's records together.
+
+    Level gating is left to the sink's level, so loguru can drop records
+    below it before formatting.
+    """
+    journey = record["extra"].get("user_journey")
+    if journey is None:
+        return False
+    if record["level"].no >= WARNING_LEVEL_NO:
+        return True
+    rate = settings.JOURNEY_LOG_SAMPLE_RATES.get(journey, 1.0)
+    if rate >= 1.0:
+        return True
+    key = str(record["extra"].get("request_id") or record["extra"].get("user_id") or "")
+    return (zlib.crc32(key.encode()) % 10000) < rate * 10000
+
+
+class ProcessLogSink:
+    """Loguru sink that ships formatted lines to the background writer process."""
+
+    def __init__(self, maxsize: int = 10000):
+        from app.core.log_writer import run_writer
+
+        ctx = multiprocessing.get_context("spawn")
+        self.queue = ctx.Queue(maxsize=maxsize)
+        self.dropped = 0
+        suffix = "jsonl" if settings.LOG_FORMAT == "json" else "log"
+        self.process = ctx.Process(
+            target=run_writer,
+            args=(self.queue, str(LOGS_DIR), RETENTION, COMPRESSION, suffix),
+            name="log-writer",
+            daemon=True,
+        )
+        os.environ[WRITER_CHILD_ENV] = "1"
+        try:
+            self.process.start()
+        finally:
+            os.environ.pop(WRITER_CHILD_ENV, None)
+
+    def write(self, message):
+        record = message.record
+        level_no = record["level"].no
+        to_app = level_no >= APP_LEVEL_NO
+        to_journey = level_no >= JOURNEY_LEVEL_NO and _journey_sampled(record)
+        if not (to_app or to_journey):
+            return
+        item = (level_no, to_app, to_journey, str(message))
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1  # Never block a request on logging
+
+    def stop(self):
+        try:
+            self.queue.put(None, timeout=1)
+        except queue.Full:
+            pass
+        self.process.join(timeout=5)
+
+
+_process_sink = None
+
+
+def _configure_logging():
+    global _process_sink
+
+    serialize = settings.LOG_FORMAT == "json"
+    suffix = "jsonl" if serialize else "log"
+
+    # Console logging format (simplified for development)
+    console_format = (
+        "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+        "<level>{level: <8}</level> | "
+        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+        "<level>{message}</level>"
+    )
+
+    # Add console handler
+    logger.add(
+        sys.stdout,
+        format=console_format,
+        level="INFO",
+        colorize=True,
+    )
+
+    if settings.LOG_WRITER == "process":
+        _process_sink = ProcessLogSink()
+        logger.add(
+            _process_sink.write,
+            format=format_record,
+            level=min(APP_LEVEL_NO, JOURNEY_LEVEL_NO),
+            serialize=serialize,
+        )
+        return
+
+    # General application log
+    logger.add(
+        LOGS_DIR / f"app_{{time:YYYY-MM-DD}}.{suffix}",
+        format=format_record,
+        level=settings.LOG_LEVEL,
+        rotation="00:00",
+        retention=RETENTION,
+        compression=COMPRESSION,
+        serialize=serialize,
+        enqueue=True,
+    )
+
+    # Error-specific log
+    logger.add(
+        LOGS_DIR / f"errors_{{time:YYYY-MM-DD}}.{suffix}",
+        format=format_record,
+        level="ERROR",
+        rotation="00:00",
+        retention=RETENTION,
+        compression=COMPRESSION,
+        serialize=serialize,
+        enqueue=True,
+    )
+
+    # User journey log (signup, login, article views, etc.)
+    logger.add(
+        LOGS_DIR / f"user_journey_{{time:YYYY-MM-DD}}.{suffix}",
+        format=format_record,
+        level=settings.JOURNEY_LOG_LEVEL,
+        rotation="00:00",
+        retention=RETENTION,
+        compression=COMPRESSION,
+        serialize=serialize,
+        enqueue=True,
+        filter=_journey_sampled,
+    )
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer, if any."""
+    logger.complete()
+    if _process_sink is not None:
+        logger.remove()
+        _process_sink.stop()
 
 
 def get_logger(name: str = "dailydev"):
@@ -138,4 +252,6 @@ class JourneyType:
 
 
 # Initialize logger
+if WRITER_CHILD_ENV not in os.environ:
+    _configure_logging()
 app_logger = get_logger()
@@ -2,35 +2,68 @@
 Security utilities for authentication and authorization.
 Uses bcrypt for password hashing and JWT for tokens.
 """
-from datetime import datetime, timedelta
-from typing import Optional, Any
+import asyncio
+import copy
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Optional, Any, Dict
 import uuid
 import bcrypt
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, inspect
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.logging_config import get_user_journey_logger, JourneyType
 
 # JWT Bearer
 security = HTTPBearer()
+# Internal bearer token for operational endpoints; checked by hand so a
+# disabled endpoint can answer 404 instead of asking for credentials
+metrics_security = HTTPBearer(auto_error=False)
+
+# Verified token -> subject, and user id -> column snapshot
+_token_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+# Never kept in memory: the password hash isn't needed to authorize a request, and
+# send_slot_utc is rewritten in bulk by the scheduler without invalidating the cache.
+# Both stay unloaded on cached users; assigning them still works.
+_USER_CACHE_EXCLUDED = {"password_hash", "send_slot_utc"}
+
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+_hash_inflight = 0
+_hash_metrics: Dict[str, float] = {
+    "completed": 0,
+    "rejected": 0,
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash using bcrypt."""
     log = get_user_journey_logger(JourneyType.LOGIN)
     try:
-        password_bytes = plain_password.encode('utf-8')
+        # Same 72-byte truncation as get_password_hash
+        password_bytes = plain_password.encode('utf-8')[:72]
         hashed_bytes = hashed_password.encode('utf-8')
         result = bcrypt.checkpw(password_bytes, hashed_bytes)
-        log.debug(f"Password verification completed")
+        log.debug("Password verification completed")
         return result
     except Exception as e:
-        log.error(f"Password verification failed: {str(e)}")
+        log.error("Password verification failed: {}", str(e))
         return False
 
 
@@ -40,15 +73,85 @@ def get_password_hash(password: str) -> str:
     try:
         # Truncate password to 72 bytes (bcrypt limit)
         password_bytes = password.encode('utf-8')[:72]
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         log.debug("Password hashed successfully")
         return hashed.decode('utf-8')
     except Exception as e:
-        log.error(f"Password hashing failed: {str(e)}")
+        log.error("Password hashing failed: {}", str(e))
         raise
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was made with a different cost than configured."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+async def _run_hash_job(func, *args):
+    """Run a bcrypt call on the hashing pool, shedding load when it is saturated."""
+    global _hash_inflight
+    if _hash_inflight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        _hash_metrics["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_inflight += 1
+    started = perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_inflight -= 1
+        elapsed = perf_counter() - started
+        _hash_metrics["completed"] += 1
+        _hash_metrics["total_seconds"] += elapsed
+        _hash_metrics["max_seconds"] = max(_hash_metrics["max_seconds"], elapsed)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded hashing pool."""
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded hashing pool."""
+    return await _run_hash_job(get_password_hash, password)
+
+
+def password_hash_metrics() -> Dict[str, float]:
+    """Snapshot of hashing pool latency and backpressure counters."""
+    completed = _hash_metrics["completed"]
+    return {
+        **_hash_metrics,
+        "inflight": _hash_inflight,
+        "avg_seconds": _hash_metrics["total_seconds"] / completed if completed else 0.0,
+    }
+
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_security)
+) -> None:
+    """Allow a request only with the configured METRICS_TOKEN.
+
+    Without a configured token the endpoint doesn't exist.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode("utf-8"), settings.METRICS_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 def create_access_token(
     subject: str | Any,
     expires_delta: Optional[timedelta] = None
@@ -69,10 +172,10 @@ def create_access_token(
             settings.SECRET_KEY,
             algorithm=settings.ALGORITHM
         )
-        log.info(f"Access token created, expires at {expire}")
+        log.info("Access token created, expires at {}", expire)
         return encoded_jwt
     except Exception as e:
-        log.error(f"Token creation failed: {str(e)}")
+        log.error("Token creation failed: {}", str(e))
         raise
 
 
@@ -86,13 +189,55 @@ def decode_access_token(token: str) -> Optional[str]:
             algorithms=[settings.ALGORITHM]
         )
         user_id = payload.get("sub")
-        log.debug(f"Token decoded successfully")
+        log.debug("Token decoded successfully")
+        if user_id is not None and payload.get("exp"):
+            # Never trust a cached token past its own expiry
+            remaining = payload["exp"] - datetime.now(timezone.utc).timestamp()
+            _token_cache.set(token, user_id, ttl=min(settings.AUTH_CACHE_TTL_SECONDS, remaining))
         return user_id
     except JWTError as e:
-        log.warning(f"Token decode failed: {str(e)}")
+        log.warning("Token decode failed: {}", str(e))
         return None
 
 
+def _copy_value(value: Any) -> Any:
+    """A private copy of a mutable JSON value (e.g. skill_analysis).
+
+    The snapshot outlives the request, so neither the stored user nor a
+    rebuilt one may share dicts or lists with it.
+    """
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+def _cache_user(user) -> None:
+    """Store a snapshot of the user's column values, minus _USER_CACHE_EXCLUDED."""
+    mapper = inspect(user).mapper
+    _user_cache.set(
+        str(user.id),
+        {
+            attr.key: _copy_value(getattr(user, attr.key))
+            for attr in mapper.column_attrs
+            if attr.key not in _USER_CACHE_EXCLUDED
+        },
+    )
+
+
+def _user_from_snapshot(snapshot: dict):
+    """Rebuild a clean, detached User from a cached snapshot."""
+    from app.models.user import User
+
+    user = User()
+    for key, value in snapshot.items():
+        setattr(user, key, _copy_value(value))
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user_cache(user_id: Any) -> None:
+    """Drop the cached snapshot after the user row changes."""
+    _user_cache.pop(str(user_id))
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -112,21 +257,29 @@ async def get_current_user(
     token = credentials.credentials
     log.debug("Validating user token")
 
-    user_id = decode_access_token(token)
+    user_id = _token_cache.get(token) or decode_access_token(token)
 
     if user_id is None:
         log.warning("Token validation failed - invalid token")
         raise credentials_exception
 
     log = get_user_journey_logger(JourneyType.LOGIN, user_id=user_id, request_id=request_id)
-    log.debug(f"Looking up user in database")
+
+    snapshot = _user_cache.get(user_id)
+    if snapshot is not None:
+        # Attach without a SELECT; routes can still mutate and commit it
+        log.debug("User served from auth cache")
+        return await db.merge(_user_from_snapshot(snapshot), load=False)
+
+    log.debug("Looking up user in database")
 
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
 
     if user is None:
-        log.warning(f"User not found in database")
+        log.warning("User not found in database")
         raise credentials_exception
 
-    log.info(f"User authenticated successfully")
+    _cache_user(user)
+    log.info("User authenticated successfully")
     return user
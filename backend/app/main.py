@@ -1,21 +1,31 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.body_limit import BodySizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
+from app.core.database import close_db, pool_metrics
+from app.core.security import password_hash_metrics, require_metrics_token
+from app.core.logging_config import shutdown_logging
 from app.api.routes import api_router
 from app.services.scheduler_service import scheduler_service
+from app.services.llm_service import llm_service
+from app.services.whatsapp_service import whatsapp_service
+from app.services.resume_parser import resume_parser
+from app.services.view_counter import view_counter
+from app.services.inbound_queue import inbound_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    # Schema is managed by migrations (alembic upgrade head), not at boot
     logger.info("Starting DailyDev API...")
-    await init_db()
-    logger.info("Database initialized")
+
+    view_counter.start()
+    inbound_queue.start()
 
     # Start scheduler for daily messages
     if settings.ENVIRONMENT == "production":
@@ -27,8 +37,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down DailyDev API...")
     scheduler_service.stop()
+    await inbound_queue.stop()
+    await view_counter.stop()
+    await llm_service.close()
+    await whatsapp_service.close()
+    resume_parser.close()
     await close_db()
     logger.info("Cleanup complete")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -53,6 +69,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized uploads before Starlette spools them
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/api/v1/users/me/resume": settings.RESUME_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    },
+)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -72,3 +96,12 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """Internal runtime metrics, for holders of METRICS_TOKEN only."""
+    return {
+        "password_hashing": password_hash_metrics(),
+        "db_pool": pool_metrics(),
+    }
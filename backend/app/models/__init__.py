@@ -2,16 +2,26 @@ from app.models.user import User
 from app.models.topic import Topic
 from app.models.user_topic import UserTopic
 from app.models.roadmap import Roadmap
+from app.models.roadmap_template import RoadmapTemplate
 from app.models.article import Article
+from app.models.article_content import ArticleContent
 from app.models.saved_article import SavedArticle
 from app.models.user_progress import UserProgress
+from app.models.inbound_message import InboundMessage
+from app.models.resume_analysis import ResumeAnalysis
+from app.models.generation_claim import GenerationClaim
 
 __all__ = [
     "User",
     "Topic",
     "UserTopic",
     "Roadmap",
+    "RoadmapTemplate",
     "Article",
+    "ArticleContent",
     "SavedArticle",
     "UserProgress",
+    "InboundMessage",
+    "ResumeAnalysis",
+    "GenerationClaim",
 ]
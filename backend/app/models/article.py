@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -13,12 +13,8 @@ class Article(Base):
     roadmap_id = Column(UUID(as_uuid=True), ForeignKey("roadmap.id"), nullable=False, unique=True)
     title = Column(String(255), nullable=False)
     slug = Column(String(255), nullable=False, index=True)
-    eli5_content = Column(Text, nullable=True)  # ELI5 explanation
-    technical_content = Column(Text, nullable=True)  # Technical deep dive
-    code_snippets = Column(JSONB, nullable=True)  # [{language, code, explanation}]
-    real_world_examples = Column(Text, nullable=True)
-    practice_problems = Column(JSONB, nullable=True)  # [{question, difficulty, link}]
-    tags = Column(JSONB, nullable=True)  # ["arrays", "hashing", "optimization"]
+    # Null only for articles migrated with a placeholder body; filled on their next read
+    content_id = Column(UUID(as_uuid=True), ForeignKey("article_contents.id"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     view_count = Column(Integer, default=0)
@@ -26,6 +22,7 @@ class Article(Base):
 
     # Relationships
     roadmap = relationship("Roadmap", back_populates="article")
+    content = relationship("ArticleContent", back_populates="articles", lazy="joined")
     saved_by = relationship("SavedArticle", back_populates="article")
 
     def __repr__(self):
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class ArticleContent(Base):
+    """Canonical generated content for a concept, shared across users."""
+    __tablename__ = "article_contents"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    topic_id = Column(UUID(as_uuid=True), ForeignKey("topics.id"), nullable=False)
+    concept_slug = Column(String(255), nullable=False)
+    experience_level = Column(String(50), nullable=False, default="intermediate")
+    language = Column(String(50), nullable=False, default="Python")
+    eli5_content = Column(Text, nullable=True)  # ELI5 explanation
+    technical_content = Column(Text, nullable=True)  # Technical deep dive
+    code_snippets = Column(JSONB, nullable=True)  # [{language, code, explanation}]
+    real_world_examples = Column(Text, nullable=True)
+    practice_problems = Column(JSONB, nullable=True)  # [{question, difficulty, link}]
+    tags = Column(JSONB, nullable=True)  # ["arrays", "hashing", "optimization"]
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # One generation per (topic, concept, level, language)
+    __table_args__ = (
+        UniqueConstraint(
+            "topic_id", "concept_slug", "experience_level", "language",
+            name="unique_article_content",
+        ),
+    )
+
+    # Relationships
+    topic = relationship("Topic")
+    articles = relationship("Article", back_populates="content")
+    roadmaps = relationship("Roadmap", back_populates="content")
+
+    def __repr__(self):
+        return f"<ArticleContent {self.concept_slug} level={self.experience_level}>"
@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+from app.core.database import Base
+
+
+class GenerationClaim(Base):
+    """Lease on generating one piece of shared content, so replicas don't duplicate LLM calls."""
+    __tablename__ = "generation_claims"
+
+    key = Column(String(512), primary_key=True)
+    claimed_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Reclaimable once stale
+
+    def __repr__(self):
+        return f"<GenerationClaim key={self.key}>"
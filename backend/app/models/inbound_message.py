@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class InboundMessage(Base):
+    """Durable queue entry for a WhatsApp message received from Twilio."""
+    __tablename__ = "inbound_messages"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    message_sid = Column(String(64), nullable=False, unique=True)  # Twilio MessageSid, dedup key
+    from_number = Column(String(20), nullable=False)
+    to_number = Column(String(20), nullable=True)
+    body = Column(Text, nullable=True)
+    status = Column(String(20), default="pending")  # pending, processing, sending, done, failed
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+    received_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)  # Backoff after a failed attempt
+    reply_body = Column(Text, nullable=True)  # Set in the same transaction as the reply's side effects
+    reply_sid = Column(String(64), nullable=True)  # Twilio MessageSid of the reply
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_inbound_messages_status_received", "status", "received_at"),
+        # Claiming scans only unfinished messages, however many finished ones pile up
+        Index(
+            "ix_inbound_messages_live_received",
+            "received_at",
+            postgresql_where=text("status IN ('pending', 'processing', 'sending')"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<InboundMessage sid={self.message_sid} status={self.status}>"
@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.core.database import Base
+
+
+class ResumeAnalysis(Base):
+    """Cached LLM skill analysis, keyed by a hash of the normalized resume text."""
+    __tablename__ = "resume_analyses"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    text_hash = Column(String(64), nullable=False)  # sha256 of normalized text
+    file_hash = Column(String(64), nullable=True)  # sha256 of the uploaded bytes
+    analysis_version = Column(String(100), nullable=False)  # model + prompt version
+    analysis = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("text_hash", "analysis_version", name="unique_resume_analysis"),
+        Index("ix_resume_analyses_file_hash", "file_hash", "analysis_version"),
+    )
+
+    def __repr__(self):
+        return f"<ResumeAnalysis {self.text_hash[:12]} {self.analysis_version}>"
@@ -1,10 +1,13 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
+# Statuses of an item that is scheduled or delivered but not yet read
+UNREAD_STATUSES = ("pending", "sending", "sent")
+
 
 class Roadmap(Base):
     __tablename__ = "roadmap"
@@ -21,13 +24,31 @@ class Roadmap(Base):
     scheduled_date = Column(DateTime, nullable=True)
     sent_at = Column(DateTime, nullable=True)
     responded_at = Column(DateTime, nullable=True)
-    status = Column(String(50), default="pending")  # pending, sent, read, skipped
+    status = Column(String(50), default="pending")  # pending, sending, sent, read, skipped
+    content_id = Column(UUID(as_uuid=True), ForeignKey("article_contents.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Next pending item per user, in day order (dispatch, today, look-ahead)
+        Index("ix_roadmap_user_status_day", "user_id", "status", "day_number"),
+        # One topic's roadmap in day order
+        Index("ix_roadmap_user_topic_day", "user_id", "topic_id", "day_number"),
+        # Per-topic progress counts are answered from this index alone
+        Index("ix_roadmap_user_topic_status", "user_id", "topic_id", "status"),
+        # Latest sent item, looked up when a YES reply arrives
+        Index(
+            "ix_roadmap_user_sent_at",
+            "user_id",
+            "sent_at",
+            postgresql_where=text("status = 'sent'"),
+        ),
+    )
+
     # Relationships
     user = relationship("User", back_populates="roadmaps")
     topic = relationship("Topic", back_populates="roadmaps")
     article = relationship("Article", back_populates="roadmap", uselist=False)
+    content = relationship("ArticleContent", back_populates="roadmaps")
 
     def __repr__(self):
         return f"<Roadmap day={self.day_number} concept={self.concept_title}>"
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class RoadmapTemplate(Base):
+    """Cached LLM roadmap for a (topic, duration, level), copied on enrollment."""
+    __tablename__ = "roadmap_templates"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    topic_id = Column(UUID(as_uuid=True), ForeignKey("topics.id"), nullable=False)
+    duration_days = Column(Integer, nullable=False)
+    experience_level = Column(String(50), nullable=False, default="intermediate")
+    version = Column(Integer, nullable=False)  # Bumped when the roadmap prompt changes
+    items = Column(JSONB, nullable=False)  # [{day, concept, difficulty, read_time}]
+    is_fallback = Column(Boolean, default=False)  # Built from defaults after an LLM failure
+    created_at = Column(DateTime, default=datetime.utcnow)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "topic_id", "duration_days", "experience_level", "version",
+            name="unique_roadmap_template",
+        ),
+    )
+
+    # Relationships
+    topic = relationship("Topic")
+
+    def __repr__(self):
+        return f"<RoadmapTemplate topic_id={self.topic_id} days={self.duration_days} v{self.version}>"
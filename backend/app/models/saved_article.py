@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Text, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -18,6 +18,8 @@ class SavedArticle(Base):
     # Unique constraint
     __table_args__ = (
         UniqueConstraint("user_id", "article_id", name="unique_saved_article"),
+        # Library listing: newest first with a (saved_at, article_id) keyset
+        Index("ix_saved_articles_user_saved_at", "user_id", "saved_at", "article_id"),
     )
 
     # Relationships
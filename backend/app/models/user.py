@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, time
-from sqlalchemy import Column, String, Text, DateTime, Time
+from sqlalchemy import Column, String, Text, DateTime, Time, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -22,6 +22,18 @@ class User(Base):
     timezone = Column(String(50), default="UTC")
     preferred_time = Column(Time, default=time(9, 0))  # 9:00 AM default
     whatsapp_connected = Column(String(50), default="pending")  # pending, connected, disconnected
+    send_slot_utc = Column(Integer, nullable=True)  # preferred_time in UTC, as minute of day
+
+    # Scheduler tick only scans users that can actually receive messages
+    __table_args__ = (
+        Index(
+            "ix_users_send_slot_connected",
+            "send_slot_utc",
+            postgresql_where=text(
+                "whatsapp_connected = 'connected' AND phone_whatsapp IS NOT NULL"
+            ),
+        ),
+    )
 
     # Relationships
     user_topics = relationship("UserTopic", back_populates="user", cascade="all, delete-orphan")
@@ -21,6 +21,7 @@ class PracticeProblem(BaseModel):
 class ArticleResponse(BaseModel):
     """Schema for article response."""
     id: UUID
+    content_id: Optional[UUID] = None
     title: str
     slug: str
     eli5_content: Optional[str] = None
@@ -44,6 +45,40 @@ class ArticleResponse(BaseModel):
         from_attributes = True
 
 
+class ArticleBody(BaseModel):
+    """Schema for the shared, immutable article body (cacheable by the browser)."""
+    id: UUID
+    eli5_content: Optional[str] = None
+    technical_content: Optional[str] = None
+    code_snippets: Optional[List[Dict[str, Any]]] = None
+    real_world_examples: Optional[str] = None
+    practice_problems: Optional[List[Dict[str, Any]]] = None
+    tags: Optional[List[str]] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ArticleOverlay(BaseModel):
+    """Schema for the small per-user part of an article."""
+    id: UUID
+    content_id: UUID
+    title: str
+    slug: str
+    view_count: int
+    avg_read_time: int
+    created_at: datetime
+    is_saved: bool = False
+    user_notes: Optional[str] = None
+    status: Optional[str] = None
+
+    # Related roadmap info
+    topic_name: Optional[str] = None
+    day_number: Optional[int] = None
+    difficulty: Optional[str] = None
+
+
 class ArticleSave(BaseModel):
     """Schema for saving an article."""
     notes: Optional[str] = None
@@ -1,9 +1,21 @@
 from datetime import datetime, time
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, EmailStr, Field
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from uuid import UUID
 
 
+def _validate_timezone(value: Optional[str]) -> Optional[str]:
+    """Reject timezone names the scheduler can't resolve."""
+    if value is None:
+        return value
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {value}")
+    return value
+
+
 class SkillAnalysis(BaseModel):
     """Schema for skill analysis results."""
     skills: List[str] = []
@@ -24,6 +36,8 @@ class UserCreate(BaseModel):
     timezone: str = "UTC"
     preferred_time: time = time(9, 0)
 
+    _check_timezone = field_validator("timezone")(_validate_timezone)
+
 
 class UserLogin(BaseModel):
     """Schema for user login."""
@@ -62,6 +76,8 @@ class UserUpdate(BaseModel):
     timezone: Optional[str] = None
     preferred_time: Optional[time] = None
 
+    _check_timezone = field_validator("timezone")(_validate_timezone)
+
 
 class WhatsAppConnect(BaseModel):
     """Schema for WhatsApp connection."""
@@ -1,7 +1,7 @@
 """Seed database with initial topics."""
 import asyncio
 from sqlalchemy import select
-from app.core.database import async_session_maker, init_db
+from app.core.database import async_session_maker
 from app.models.topic import Topic
 
 
@@ -80,9 +80,7 @@ INITIAL_TOPICS = [
 
 
 async def seed_topics():
-    """Seed topics into the database."""
-    await init_db()
-
+    """Seed topics into the database. Run `alembic upgrade head` first."""
     async with async_session_maker() as session:
         for topic_data in INITIAL_TOPICS:
             # Check if topic already exists
@@ -0,0 +1,410 @@
+import asyncio
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.single_flight import SingleFlight
+from app.models.user import User
+from app.models.topic import Topic
+from app.models.roadmap import Roadmap
+from app.models.article import Article
+from app.models.article_content import ArticleContent
+from app.models.generation_claim import GenerationClaim
+from app.services.article_stream import ARTICLE_SECTIONS, ArticleStreamParser
+from app.services.llm_service import llm_service
+
+CLAIM_POLL_SECONDS = 1.0  # How often a waiting replica checks for the content
+
+
+class ArticleGenerationError(Exception):
+    """Article content could not be generated; nothing was stored, so a later call retries."""
+
+
+class ArticleService:
+    """Service for resolving roadmap items to shared, generate-once article content."""
+
+    default_language = "Python"
+
+    def __init__(self):
+        # Streaming generations outlive their request if the client goes away
+        self._stream_tasks: Set[asyncio.Task] = set()
+        self._flight = SingleFlight()
+
+    def _content_key(self, topic_id, concept_slug: str, experience_level: str, language: str):
+        return and_(
+            ArticleContent.topic_id == topic_id,
+            ArticleContent.concept_slug == concept_slug,
+            ArticleContent.experience_level == experience_level,
+            ArticleContent.language == language,
+        )
+
+    async def _store_content(
+        self,
+        db: AsyncSession,
+        topic_id,
+        concept_slug: str,
+        experience_level: str,
+        language: str,
+        generated: Dict[str, Any]
+    ) -> ArticleContent:
+        """Insert generated content, keeping the existing row if another request won the race."""
+        await db.execute(
+            insert(ArticleContent)
+            .values(
+                topic_id=topic_id,
+                concept_slug=concept_slug,
+                experience_level=experience_level,
+                language=language,
+                eli5_content=generated.get("eli5", ""),
+                technical_content=generated.get("technical", ""),
+                code_snippets=generated.get("code_snippets", []),
+                real_world_examples=generated.get("real_world", ""),
+                practice_problems=generated.get("practice", []),
+            )
+            .on_conflict_do_nothing(constraint="unique_article_content")
+        )
+        result = await db.execute(
+            select(ArticleContent).where(
+                self._content_key(topic_id, concept_slug, experience_level, language)
+            )
+        )
+        return result.scalar_one()
+
+    async def _claim(self, claim_key: str, key: tuple) -> Tuple[bool, Optional[datetime]]:
+        """In one short transaction, check for the content and try to lease its generation.
+
+        Returns (exists, claimed_at); claimed_at is set only if this caller now
+        holds the lease. A lease older than GENERATION_CLAIM_SECONDS is taken over.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.GENERATION_CLAIM_SECONDS)
+        async with async_session_maker() as db:
+            result = await db.execute(select(ArticleContent.id).where(self._content_key(*key)))
+            if result.scalar_one_or_none() is not None:
+                return True, None
+            stmt = insert(GenerationClaim).values(key=claim_key, claimed_at=now)
+            result = await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[GenerationClaim.key],
+                    set_={"claimed_at": now},
+                    where=GenerationClaim.claimed_at < stale_before,
+                )
+                .returning(GenerationClaim.key)
+            )
+            claimed = result.scalar_one_or_none() is not None
+            await db.commit()
+        return False, now if claimed else None
+
+    async def _release(self, claim_key: str, claimed_at: datetime):
+        """Drop our lease, unless it went stale and another replica took it over."""
+        async with async_session_maker() as db:
+            await db.execute(
+                delete(GenerationClaim).where(
+                    and_(GenerationClaim.key == claim_key, GenerationClaim.claimed_at == claimed_at)
+                )
+            )
+            await db.commit()
+
+    async def _generate_once(
+        self,
+        topic_id,
+        concept_slug: str,
+        experience_level: str,
+        language: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]]
+    ):
+        """Run `generate` and store its result unless the content already exists.
+
+        Concurrent callers in this process share one run. Across replicas, a
+        leased row in generation_claims makes others poll for the content
+        instead of generating the same concept again. Only the claim and the
+        insert touch the database; no connection is held while the LLM runs.
+
+        A caller waits on another replica's lease for at most
+        GENERATION_WAIT_SECONDS, then raises ArticleGenerationError rather
+        than hold its request until the lease goes stale.
+        """
+        key = (topic_id, concept_slug, experience_level, language)
+        claim_key = "article_content:" + ":".join(str(part) for part in key)
+
+        async def run():
+            deadline = monotonic() + settings.GENERATION_WAIT_SECONDS
+            while True:
+                exists, claimed_at = await self._claim(claim_key, key)
+                if exists:
+                    return
+                if claimed_at is not None:
+                    break
+                if monotonic() >= deadline:
+                    raise ArticleGenerationError(f"{concept_slug} is still being generated elsewhere")
+                await asyncio.sleep(CLAIM_POLL_SECONDS)
+
+            try:
+                generated = await generate()
+                async with async_session_maker() as db:
+                    await self._store_content(db, *key, generated)
+                    await db.commit()
+            finally:
+                await self._release(claim_key, claimed_at)
+
+        await self._flight.do(key, run)
+
+    async def get_or_generate_content(
+        self,
+        db: AsyncSession,
+        topic_id,
+        concept_title: str,
+        concept_slug: str,
+        experience_level: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> ArticleContent:
+        """Return the canonical content for a concept, generating it on first use.
+
+        On a miss the session's transaction is committed first, so the caller
+        doesn't keep a pooled connection for the length of the LLM call.
+        Raises ArticleGenerationError if the LLM fails; the placeholder article
+        is never stored as shared content.
+        """
+        experience_level = experience_level or "intermediate"
+        language = language or self.default_language
+        key = self._content_key(topic_id, concept_slug, experience_level, language)
+
+        result = await db.execute(select(ArticleContent).where(key))
+        content = result.scalar_one_or_none()
+        if content:
+            logger.info("Article content cache hit: {} ({}, {})", concept_slug, experience_level, language)
+            return content
+
+        logger.info("Article content cache miss: {} ({}, {})", concept_slug, experience_level, language)
+        topic = await db.get(Topic, topic_id)
+        await db.commit()
+
+        async def generate() -> Dict[str, Any]:
+            # Content is shared, so the prompt only carries the level, never the user's profile
+            return await llm_service.generate_article(
+                topic_name=topic.name if topic else "Interview Prep",
+                concept_name=concept_title,
+                user_skill_summary=f"{experience_level.capitalize()} developer preparing for interviews",
+                language=language,
+                use_fallback=False,
+            )
+
+        try:
+            await self._generate_once(topic_id, concept_slug, experience_level, language, generate)
+        except Exception as e:
+            raise ArticleGenerationError(f"Could not generate {concept_slug}: {e}") from e
+        result = await db.execute(select(ArticleContent).where(key))
+        return result.scalar_one()
+
+    async def get_or_create_article(
+        self,
+        db: AsyncSession,
+        roadmap_item: Roadmap,
+        user: User
+    ) -> Article:
+        """Return the article for a roadmap item, pointing it at shared content."""
+        result = await db.execute(
+            select(Article).where(Article.roadmap_id == roadmap_item.id)
+        )
+        article = result.scalar_one_or_none()
+        if article:
+            return await self.ensure_content(db, article, roadmap_item, user)
+
+        content = await self.get_or_generate_content(
+            db,
+            topic_id=roadmap_item.topic_id,
+            concept_title=roadmap_item.concept_title,
+            concept_slug=roadmap_item.concept_slug,
+            experience_level=user.experience_level,
+        )
+        roadmap_item.content_id = content.id
+
+        # A concurrent request may have created it meanwhile; keep whichever landed first
+        await db.execute(
+            insert(Article)
+            .values(
+                roadmap_id=roadmap_item.id,
+                title=roadmap_item.concept_title,
+                slug=roadmap_item.concept_slug,
+                content_id=content.id,
+                avg_read_time=roadmap_item.estimated_read_time or 10,
+            )
+            .on_conflict_do_nothing(index_elements=[Article.roadmap_id])
+        )
+        result = await db.execute(
+            select(Article).where(Article.roadmap_id == roadmap_item.id)
+        )
+        return result.scalar_one()
+
+    async def ensure_content(
+        self,
+        db: AsyncSession,
+        article: Article,
+        roadmap_item: Roadmap,
+        user: Optional[User] = None
+    ) -> Article:
+        """Point an article without shared content at real content, generating it if needed.
+
+        Only articles migrated with a placeholder body lack content.
+        """
+        if article.content_id is not None:
+            return article
+        user = user or await db.get(User, roadmap_item.user_id)
+        content = await self.get_or_generate_content(
+            db,
+            topic_id=roadmap_item.topic_id,
+            concept_title=roadmap_item.concept_title,
+            concept_slug=roadmap_item.concept_slug,
+            experience_level=user.experience_level if user else None,
+        )
+        article.content = content
+        roadmap_item.content_id = content.id
+        return article
+
+    async def stream_article(self, roadmap_id, user_id) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Generate a roadmap item's article, yielding (event, data) as sections arrive.
+
+        Generation runs in a background task that persists the article even if
+        the client disconnects mid-stream; this generator only relays its events.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self._generate_streaming(roadmap_id, user_id, events))
+        self._stream_tasks.add(task)
+        task.add_done_callback(self._stream_tasks.discard)
+
+        while True:
+            event, data = await events.get()
+            yield event, data
+            if event in ("done", "error"):
+                return
+
+    async def _generate_streaming(self, roadmap_id, user_id, events: asyncio.Queue):
+        try:
+            async with async_session_maker() as db:
+                roadmap_item = await db.get(Roadmap, roadmap_id)
+                user = await db.get(User, user_id)
+                result = await db.execute(
+                    select(Article.id, Article.content_id).where(Article.roadmap_id == roadmap_id)
+                )
+                article_id, content_id = result.one_or_none() or (None, None)
+
+            if content_id is None:
+                # No pooled connection is held while the LLM streams
+                await self._stream_content(roadmap_item, user, events)
+                async with async_session_maker() as db:
+                    roadmap_item = await db.get(Roadmap, roadmap_id)
+                    user = await db.get(User, user_id)
+                    article = await self.get_or_create_article(db, roadmap_item, user)
+                    await db.commit()
+                    article_id = article.id
+            events.put_nowait(("done", {"article_id": str(article_id)}))
+        except ArticleGenerationError as e:
+            logger.warning("Streaming article generation failed: {}", e)
+            events.put_nowait(("error", {"detail": "Article generation failed, please retry shortly"}))
+        except Exception as e:
+            logger.opt(exception=True).error("Streaming article generation failed: {}", e)
+            events.put_nowait(("error", {"detail": "Article generation failed"}))
+
+    async def _stream_content(
+        self,
+        roadmap_item: Roadmap,
+        user: User,
+        events: asyncio.Queue
+    ):
+        """Make sure shared content exists, streaming it section by section."""
+        experience_level = user.experience_level or "intermediate"
+        language = self.default_language
+        key = self._content_key(
+            roadmap_item.topic_id, roadmap_item.concept_slug, experience_level, language
+        )
+        async with async_session_maker() as db:
+            result = await db.execute(select(ArticleContent).where(key))
+            content = result.scalar_one_or_none()
+            topic = await db.get(Topic, roadmap_item.topic_id) if content is None else None
+
+        if content is None:
+            streamed = False
+
+            async def generate() -> Dict[str, Any]:
+                nonlocal streamed
+                streamed = True
+                return await self._stream_generated(
+                    topic_name=topic.name if topic else "Interview Prep",
+                    concept_title=roadmap_item.concept_title,
+                    experience_level=experience_level,
+                    language=language,
+                    events=events,
+                )
+
+            try:
+                await self._generate_once(
+                    roadmap_item.topic_id, roadmap_item.concept_slug, experience_level, language, generate
+                )
+            except ArticleGenerationError:
+                raise
+            except Exception as e:
+                raise ArticleGenerationError(f"Could not generate {roadmap_item.concept_slug}: {e}") from e
+            if streamed:
+                return
+            # Another request generated it while we waited
+            async with async_session_maker() as db:
+                result = await db.execute(select(ArticleContent).where(key))
+                content = result.scalar_one()
+
+        # Already generated for this level: replay it in one go
+        for section, value in (
+            ("eli5", content.eli5_content),
+            ("technical", content.technical_content),
+            ("code_snippets", content.code_snippets),
+            ("real_world", content.real_world_examples),
+            ("practice", content.practice_problems),
+        ):
+            events.put_nowait(("section", {"section": section, "content": value}))
+
+    async def _stream_generated(
+        self,
+        topic_name: str,
+        concept_title: str,
+        experience_level: str,
+        language: str,
+        events: asyncio.Queue
+    ) -> Dict[str, Any]:
+        """Stream a new article from the LLM into events and return the parsed result.
+
+        Only a complete article is returned for storing. On failure, or when
+        the JSON is truncated or missing a section, the placeholder is streamed
+        to this client and ArticleGenerationError raised, so nothing is stored.
+        """
+        parser = ArticleStreamParser()
+        generated = None
+        try:
+            async for chunk in llm_service.stream_article(
+                topic_name=topic_name,
+                concept_name=concept_title,
+                user_skill_summary=f"{experience_level.capitalize()} developer preparing for interviews",
+                language=language,
+            ):
+                for kind, section, value in parser.feed(chunk):
+                    events.put_nowait((kind, {"section": section, "content": value}))
+            generated = parser.result()
+            if generated is None:
+                logger.error("Streamed article JSON was incomplete or malformed")
+        except Exception as e:
+            logger.error("Article stream failed: {}", e)
+
+        if generated is None:
+            fallback = llm_service.fallback_article(concept_title)
+            for section in ARTICLE_SECTIONS:
+                events.put_nowait(("section", {"section": section, "content": fallback[section]}))
+            raise ArticleGenerationError(f"Streamed article for {concept_title} was not usable")
+        return generated
+
+
+# Singleton instance
+article_service = ArticleService()
@@ -0,0 +1,165 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Top-level keys of the article JSON, in the order the prompt asks for them
+ARTICLE_SECTIONS = ("eli5", "technical", "code_snippets", "real_world", "practice")
+_LIST_SECTIONS = ("code_snippets", "practice")
+
+
+def is_complete_article(article: Any) -> bool:
+    """Whether every section is present with the expected type (text or list)."""
+    if not isinstance(article, dict):
+        return False
+    for section in ARTICLE_SECTIONS:
+        value = article.get(section)
+        expected = list if section in _LIST_SECTIONS else str
+        if not isinstance(value, expected):
+            return False
+    return bool(article["eli5"] and article["technical"])
+
+
+def _safe_cut(raw: str) -> int:
+    """Length of the prefix of a raw JSON string body that ends on a complete escape."""
+    index = raw.rfind("\\")
+    if index == -1:
+        return len(raw)
+    start = index
+    while start > 0 and raw[start - 1] == "\\":
+        start -= 1
+    if (index - start) % 2 == 0:  # raw[index] opens an escape sequence
+        tail = raw[index + 1:]
+        if not tail or (tail[0] == "u" and len(tail) < 5):
+            return index
+    return len(raw)
+
+
+def _decode(raw: str) -> str:
+    return json.loads(f'"{raw}"', strict=False)
+
+
+class ArticleStreamParser:
+    """Incremental parser for the article JSON as the LLM streams it.
+
+    feed() returns the events a chunk completes: ("delta", section, text) as
+    a string section grows, and ("item", section, value) each time an element
+    of a list section (code_snippets, practice) is complete.
+    """
+
+    def __init__(self):
+        self.text: List[str] = []
+        self.sections: Dict[str, Any] = {}
+        self._depth = 0
+        self._expect_key = True
+        self._key: Optional[str] = None
+        self._in_string = False
+        self._escape = False
+        self._role: Optional[str] = None  # "key", "value" or "item" while in a string
+        self._key_chars: List[str] = []
+        self._pending = ""  # undecoded tail of the current string section
+        self._item: Optional[List[str]] = None  # raw chars of the current list element
+        self._events: List[Tuple[str, str, Any]] = []
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        self.text.append(chunk)
+        for char in chunk:
+            self._consume(char)
+        if self._pending:
+            cut = _safe_cut(self._pending)
+            self._emit_text(self._pending[:cut])
+            self._pending = self._pending[cut:]
+        events, self._events = self._events, []
+        return events
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The complete article, or None if the JSON is truncated, malformed or missing a section."""
+        raw = "".join(self.text).strip()
+        if raw.startswith("```json"):
+            raw = raw[7:]
+        if raw.startswith("```"):
+            raw = raw[3:]
+        if raw.endswith("```"):
+            raw = raw[:-3]
+        try:
+            article = json.loads(raw.strip(), strict=False)
+        except json.JSONDecodeError:
+            return None
+        return article if is_complete_article(article) else None
+
+    def _emit_text(self, raw: str):
+        if not raw or self._key is None:
+            return
+        text = _decode(raw)
+        self.sections[self._key] = self.sections.get(self._key, "") + text
+        self._events.append(("delta", self._key, text))
+
+    def _emit_item(self):
+        raw, self._item = "".join(self._item), None
+        try:
+            value = json.loads(raw, strict=False)
+        except json.JSONDecodeError:
+            return
+        if self._key is not None:
+            self.sections.setdefault(self._key, []).append(value)
+            self._events.append(("item", self._key, value))
+
+    def _consume(self, char: str):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._close_string()
+                return
+            if self._role == "key":
+                self._key_chars.append(char)
+            elif self._role == "value":
+                self._pending += char
+            elif self._item is not None:
+                self._item.append(char)
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1:
+                self._role = "key" if self._expect_key else "value"
+                self._key_chars = []
+            elif self._depth == 2 and self._item is None:
+                self._role = "item"
+                self._item = [char]
+            else:
+                self._role = None
+                if self._item is not None:
+                    self._item.append(char)
+        elif char in "{[":
+            self._depth += 1
+            if self._depth == 3 and self._item is None:
+                self._item = [char]
+            elif self._item is not None:
+                self._item.append(char)
+        elif char in "}]":
+            if self._item is not None:
+                self._item.append(char)
+            self._depth -= 1
+            if self._depth == 2 and self._item is not None:
+                self._emit_item()
+        elif self._depth == 1:
+            if char == ":":
+                self._expect_key = False
+            elif char == ",":
+                self._expect_key = True
+        elif self._item is not None:
+            self._item.append(char)
+
+    def _close_string(self):
+        self._in_string = False
+        if self._role == "key":
+            self._key = _decode("".join(self._key_chars))
+        elif self._role == "value":
+            self._emit_text(self._pending)
+            self._pending = ""
+        elif self._item is not None:
+            self._item.append('"')
+            if self._role == "item":
+                self._emit_item()
+        self._role = None
@@ -0,0 +1,241 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import select, update, and_, or_, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.inbound_message import InboundMessage
+from app.services.scheduler_service import scheduler_service
+from app.services.whatsapp_service import whatsapp_service
+
+
+class InboundQueueService:
+    """Postgres-backed queue for inbound WhatsApp messages.
+
+    The webhook only persists the message (deduplicated by MessageSid) and
+    acknowledges Twilio; a pool of workers claims rows with
+    FOR UPDATE SKIP LOCKED and runs the reply logic off the request path.
+
+    A message's side effects commit together with its reply body, and the
+    row moves to "sending" before the reply goes out, so a retry or an
+    expired lease never sends the same reply twice.
+    """
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        message_sid: str,
+        from_number: str,
+        to_number: Optional[str],
+        body: str
+    ) -> bool:
+        """Persist an inbound message. Returns False for a duplicate MessageSid."""
+        result = await db.execute(
+            insert(InboundMessage)
+            .values(
+                message_sid=message_sid,
+                from_number=from_number,
+                to_number=to_number,
+                body=body,
+                status="pending",
+                attempts=0,
+                received_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=[InboundMessage.message_sid])
+            .returning(InboundMessage.id)
+        )
+        inserted = result.scalar_one_or_none() is not None
+        await db.commit()
+        if inserted:
+            self._wakeup.set()
+        return inserted
+
+    @staticmethod
+    def _retry_delay(attempts: int) -> timedelta:
+        """Exponential backoff after the given number of failed attempts."""
+        delay = settings.INBOUND_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+        return timedelta(seconds=min(delay, settings.INBOUND_RETRY_MAX_SECONDS))
+
+    async def _claim(self) -> Optional[InboundMessage]:
+        """Atomically claim the oldest due pending (or abandoned) message."""
+        now = datetime.utcnow()
+        reclaim_before = now - timedelta(seconds=settings.INBOUND_VISIBILITY_TIMEOUT_SECONDS)
+        claimable = (
+            select(InboundMessage.id)
+            .where(
+                or_(
+                    and_(
+                        InboundMessage.status == "pending",
+                        or_(
+                            InboundMessage.next_attempt_at.is_(None),
+                            InboundMessage.next_attempt_at <= now,
+                        ),
+                    ),
+                    and_(
+                        InboundMessage.status == "processing",
+                        InboundMessage.claimed_at < reclaim_before,
+                        InboundMessage.attempts < settings.INBOUND_MAX_ATTEMPTS,
+                    ),
+                )
+            )
+            .order_by(InboundMessage.received_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        async with async_session_maker() as db:
+            # Give up on abandoned messages that used every attempt, and on replies
+            # whose send outcome was lost with the worker (resending could duplicate)
+            await db.execute(
+                update(InboundMessage)
+                .where(
+                    and_(
+                        InboundMessage.claimed_at < reclaim_before,
+                        or_(
+                            and_(
+                                InboundMessage.status == "processing",
+                                InboundMessage.attempts >= settings.INBOUND_MAX_ATTEMPTS,
+                            ),
+                            InboundMessage.status == "sending",
+                        ),
+                    )
+                )
+                .values(
+                    status="failed",
+                    last_error=case(
+                        (InboundMessage.status == "sending", "Reply send outcome unknown"),
+                        else_="Abandoned after the last attempt",
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(
+                update(InboundMessage)
+                .where(InboundMessage.id == claimable.scalar_subquery())
+                .values(
+                    status="processing",
+                    claimed_at=now,
+                    attempts=InboundMessage.attempts + 1,
+                )
+                .returning(InboundMessage)
+                .execution_options(synchronize_session=False)
+            )
+            message = result.scalar_one_or_none()
+            await db.commit()
+            return message
+
+    async def _update_leased(self, db: AsyncSession, message: InboundMessage, **values) -> bool:
+        """Update a message only while we still hold its lease."""
+        result = await db.execute(
+            update(InboundMessage)
+            .where(
+                and_(
+                    InboundMessage.id == message.id,
+                    InboundMessage.claimed_at == message.claimed_at,
+                )
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def _process(self, message: InboundMessage):
+        """Run the reply logic for one claimed message and send its reply once."""
+        try:
+            reply_body = message.reply_body
+            if reply_body is None:
+                async with async_session_maker() as db:
+                    reply_body = await scheduler_service.process_user_response(
+                        db=db,
+                        phone_number=message.from_number,
+                        response=message.body or ""
+                    )
+                    # The side effects and the reply commit together, or not at all
+                    values = {"reply_body": reply_body, "last_error": None}
+                    if reply_body is None:
+                        values.update(status="done", processed_at=datetime.utcnow())
+                    if not await self._update_leased(db, message, **values):
+                        await db.rollback()
+                        logger.warning("Lost the lease on inbound message {}", message.message_sid)
+                        return
+                    await db.commit()
+                if reply_body is None:
+                    return
+
+            # Mark the send before making it; a lost outcome is never retried
+            sending_at = datetime.utcnow()
+            async with async_session_maker() as db:
+                if not await self._update_leased(db, message, status="sending", claimed_at=sending_at):
+                    logger.warning("Lost the lease on inbound message {}", message.message_sid)
+                    return
+                await db.commit()
+            message.claimed_at = sending_at
+        except Exception as e:
+            retry = message.attempts < settings.INBOUND_MAX_ATTEMPTS
+            logger.error(
+                "Inbound message {} failed (attempt {}, {}): {}",
+                message.message_sid, message.attempts, "retrying" if retry else "giving up", e
+            )
+            values = {"status": "pending" if retry else "failed", "last_error": str(e)}
+            if retry:
+                values["next_attempt_at"] = datetime.utcnow() + self._retry_delay(message.attempts)
+            async with async_session_maker() as db:
+                await self._update_leased(db, message, **values)
+                await db.commit()
+            return
+
+        reply_sid = await whatsapp_service.send_message(message.from_number, reply_body)
+        values = {"status": "done", "reply_sid": reply_sid, "processed_at": datetime.utcnow()}
+        if reply_sid is None:
+            values.update(status="failed", last_error="Reply could not be sent")
+        async with async_session_maker() as db:
+            await self._update_leased(db, message, **values)
+            await db.commit()
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                self._wakeup.clear()
+                message = await self._claim()
+                if message is None:
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(),
+                            timeout=settings.INBOUND_POLL_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._process(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Inbound worker {} error: {}", index, e)
+                await asyncio.sleep(settings.INBOUND_POLL_SECONDS)
+
+    def start(self):
+        """Start the worker pool."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(i))
+                for i in range(settings.INBOUND_WORKERS)
+            ]
+            logger.info("Inbound queue started with {} worker(s)", len(self._workers))
+
+    async def stop(self):
+        """Stop the worker pool; in-flight messages are reclaimed after the visibility timeout."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+# Singleton instance
+inbound_queue = InboundQueueService()
@@ -1,19 +1,120 @@
+import asyncio
 import json
-from typing import Dict, Any, Optional
-from groq import Groq
+from typing import AsyncIterator, Dict, Any, Optional
+import httpx
+from groq import AsyncGroq
 from loguru import logger
 from app.core.config import settings
+from app.core.single_flight import SingleFlight
+from app.services.article_stream import is_complete_article
+
+# Bump when the resume analysis prompt changes so cached analyses are ignored
+RESUME_PROMPT_VERSION = 2
 
 
 class LLMService:
     """Service for LLM-powered content generation using Groq."""
 
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # One pooled HTTP client shared by every completion call
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            http_client=self.http_client,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
         self.model = "llama-3.1-70b-versatile"  # Free, fast, capable
+        # Bound in-flight generations so a burst can't exhaust the pool
+        self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self.in_flight = 0
+        # Replaced on every release; low-priority callers wait on it for a free slot
+        self._slot_freed = asyncio.Event()
+        self._flight = SingleFlight()
+
+    async def _complete(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Run a chat completion; identical concurrent prompts share a single call."""
+        return await self._flight.do(
+            (prompt, temperature, max_tokens),
+            lambda: self._create_completion(prompt, temperature, max_tokens, timeout),
+        )
 
-    async def analyze_resume(self, resume_text: str) -> Dict[str, Any]:
-        """Analyze resume and extract skills, experience level, etc."""
+    async def _create_completion(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float]
+    ) -> str:
+        """Run a single chat completion and return the message content."""
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=timeout or settings.LLM_TIMEOUT_SECONDS,
+                )
+            finally:
+                self._release_slot()
+        return response.choices[0].message.content
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        freed, self._slot_freed = self._slot_freed, asyncio.Event()
+        freed.set()
+
+    def idle_slots(self) -> int:
+        """Completion slots not currently in use."""
+        return settings.LLM_MAX_CONCURRENCY - self.in_flight
+
+    async def wait_for_idle(self, reserve: int, timeout: float) -> bool:
+        """Wait until more than `reserve` completion slots are free.
+
+        Lets background work yield to live traffic without polling: it wakes
+        whenever a completion finishes. Returns False if the LLM stays that
+        busy for `timeout` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.idle_slots() <= reserve:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._slot_freed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def close(self):
+        """Close the pooled HTTP client."""
+        await self.http_client.aclose()
+
+    @property
+    def resume_analysis_version(self) -> str:
+        """Tag identifying the model and prompt behind a skill analysis."""
+        return f"{self.model}:resume-v{RESUME_PROMPT_VERSION}"
+
+    async def analyze_resume(self, resume_text: str, use_fallback: bool = True) -> Dict[str, Any]:
+        """Analyze resume and extract skills, experience level, etc.
+
+        With use_fallback=False, failures are raised instead of being
+        replaced by the default analysis.
+        """
         prompt = f"""Analyze this resume and extract structured information.
 
 Resume:
@@ -31,24 +132,27 @@ Return a JSON object with these fields:
 Return ONLY valid JSON, no explanations."""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+            result = await self._complete(
+                prompt,
                 temperature=0.3,
                 max_tokens=1000,
+                timeout=30.0,
             )
-            result = response.choices[0].message.content
             # Parse JSON from response
             return json.loads(result)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM response as JSON: {e}")
-            return self._default_skill_analysis()
+            if not use_fallback:
+                raise
+            return self.fallback_skill_analysis()
         except Exception as e:
             logger.error(f"LLM analysis failed: {e}")
-            return self._default_skill_analysis()
+            if not use_fallback:
+                raise
+            return self.fallback_skill_analysis()
 
-    def _default_skill_analysis(self) -> Dict[str, Any]:
-        """Return default skill analysis when LLM fails."""
+    def fallback_skill_analysis(self) -> Dict[str, Any]:
+        """Default skill analysis used when the LLM fails or returns unusable output."""
         return {
             "skills": [],
             "experience_level": "beginner",
@@ -90,26 +194,26 @@ Want to learn how top companies solve this? Reply 'YES' 🎯"
 Generate the hook message (just the message, no explanations):"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+            result = await self._complete(
+                prompt,
                 temperature=0.7,
                 max_tokens=300,
+                timeout=20.0,
             )
-            return response.choices[0].message.content.strip()
+            return result.strip()
         except Exception as e:
             logger.error(f"Hook message generation failed: {e}")
             return f"🎯 Today's concept: {concept_name}\n\nWant to learn about this? Reply 'YES'"
 
-    async def generate_article(
+    def _article_prompt(
         self,
         topic_name: str,
         concept_name: str,
-        user_skill_summary: Optional[str] = None,
-        language: str = "Python"
-    ) -> Dict[str, Any]:
-        """Generate a comprehensive article for a concept."""
-        prompt = f"""You are an expert software engineer writing educational content.
+        user_skill_summary: Optional[str],
+        language: str
+    ) -> str:
+        """Build the article generation prompt shared by the blocking and streaming calls."""
+        return f"""You are an expert software engineer writing educational content.
 
 Topic: {topic_name}
 Concept: {concept_name}
@@ -154,14 +258,28 @@ Return as JSON:
 
 Return ONLY valid JSON:"""
 
+    async def generate_article(
+        self,
+        topic_name: str,
+        concept_name: str,
+        user_skill_summary: Optional[str] = None,
+        language: str = "Python",
+        use_fallback: bool = True
+    ) -> Dict[str, Any]:
+        """Generate a comprehensive article for a concept.
+
+        With use_fallback=False, failures (including a response missing any
+        section) are raised instead of being replaced by the default article.
+        """
+        prompt = self._article_prompt(topic_name, concept_name, user_skill_summary, language)
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+            result = await self._complete(
+                prompt,
                 temperature=0.5,
                 max_tokens=4000,
+                timeout=90.0,
             )
-            result = response.choices[0].message.content
             # Clean up potential markdown formatting
             if result.startswith("```json"):
                 result = result[7:]
@@ -169,16 +287,49 @@ Return ONLY valid JSON:"""
                 result = result[3:]
             if result.endswith("```"):
                 result = result[:-3]
-            return json.loads(result.strip())
+            article = json.loads(result.strip())
+            if not is_complete_article(article):
+                raise ValueError("Article JSON is missing sections")
+            return article
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse article JSON: {e}")
-            return self._default_article(concept_name)
+            if not use_fallback:
+                raise
+            return self.fallback_article(concept_name)
         except Exception as e:
             logger.error(f"Article generation failed: {e}")
-            return self._default_article(concept_name)
+            if not use_fallback:
+                raise
+            return self.fallback_article(concept_name)
 
-    def _default_article(self, concept_name: str) -> Dict[str, Any]:
-        """Return default article when generation fails."""
+    async def stream_article(
+        self,
+        topic_name: str,
+        concept_name: str,
+        user_skill_summary: Optional[str] = None,
+        language: str = "Python"
+    ) -> AsyncIterator[str]:
+        """Stream the article JSON as text deltas while the model generates it."""
+        prompt = self._article_prompt(topic_name, concept_name, user_skill_summary, language)
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.5,
+                    max_tokens=4000,
+                    timeout=90.0,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                self._release_slot()
+
+    def fallback_article(self, concept_name: str) -> Dict[str, Any]:
+        """Placeholder article used when generation fails."""
         return {
             "eli5": f"We're working on the explanation for {concept_name}. Check back soon!",
             "technical": "Content is being generated...",
@@ -191,9 +342,14 @@ Return ONLY valid JSON:"""
         self,
         topic_name: str,
         duration_days: int,
-        user_level: str = "intermediate"
+        user_level: str = "intermediate",
+        use_fallback: bool = True
     ) -> list:
-        """Generate a personalized learning roadmap for a topic."""
+        """Generate a personalized learning roadmap for a topic.
+
+        With use_fallback=False, failures are raised instead of being
+        replaced by the default roadmap.
+        """
         prompt = f"""Create a {duration_days}-day learning roadmap for {topic_name}.
 User Level: {user_level}
 
@@ -213,13 +369,12 @@ For {topic_name}, include foundational concepts first, then build to complex one
 Return ONLY the JSON array:"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+            result = await self._complete(
+                prompt,
                 temperature=0.4,
                 max_tokens=2000,
+                timeout=60.0,
             )
-            result = response.choices[0].message.content
             if result.startswith("```json"):
                 result = result[7:]
             if result.startswith("```"):
@@ -229,10 +384,12 @@ Return ONLY the JSON array:"""
             return json.loads(result.strip())
         except Exception as e:
             logger.error(f"Roadmap generation failed: {e}")
-            return self._default_roadmap(topic_name, duration_days)
+            if not use_fallback:
+                raise
+            return self.fallback_roadmap(topic_name, duration_days)
 
-    def _default_roadmap(self, topic_name: str, duration_days: int) -> list:
-        """Return a default roadmap when generation fails."""
+    def fallback_roadmap(self, topic_name: str, duration_days: int) -> list:
+        """Default roadmap used when generation fails."""
         # Fallback roadmaps for common topics
         default_concepts = {
             "DSA": [
@@ -0,0 +1,153 @@
+import hashlib
+import re
+from typing import Any, Dict, Optional
+from pydantic import ValidationError
+from sqlalchemy import select, update, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.core.database import async_session_maker
+from app.models.resume_analysis import ResumeAnalysis
+from app.schemas.user import SkillAnalysis
+from app.services.llm_service import llm_service
+from app.services.resume_parser import resume_parser
+
+_NON_WORD = re.compile(r"[^\w+#.]+")
+
+
+def normalize_resume_text(text: str) -> str:
+    """Collapse case, punctuation and whitespace so trivial re-exports hash the same."""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def validate_analysis(analysis: Any) -> Optional[Dict[str, Any]]:
+    """The analysis coerced to the SkillAnalysis shape, or None if it doesn't fit."""
+    try:
+        return SkillAnalysis.model_validate(analysis).model_dump()
+    except ValidationError as e:
+        logger.warning("Discarding skill analysis that fails validation: {}", e)
+        return None
+
+
+class ResumeAnalysisCache:
+    """Persistent cache of skill analyses so re-uploads skip the LLM."""
+
+    @property
+    def version(self) -> str:
+        return llm_service.resume_analysis_version
+
+    async def get_by_file(self, db: AsyncSession, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Look up a byte-identical upload, before any parsing.
+
+        An entry that no longer validates counts as a miss.
+        """
+        result = await db.execute(
+            select(ResumeAnalysis.analysis).where(
+                and_(
+                    ResumeAnalysis.file_hash == file_hash,
+                    ResumeAnalysis.analysis_version == self.version,
+                )
+            ).limit(1)
+        )
+        cached = result.scalar_one_or_none()
+        return validate_analysis(cached) if cached is not None else None
+
+    async def get_by_text(self, db: AsyncSession, text_hash: str) -> Optional[Dict[str, Any]]:
+        """Look up a resume whose normalized text matches.
+
+        An entry that no longer validates counts as a miss.
+        """
+        result = await db.execute(
+            select(ResumeAnalysis.analysis).where(
+                and_(
+                    ResumeAnalysis.text_hash == text_hash,
+                    ResumeAnalysis.analysis_version == self.version,
+                )
+            )
+        )
+        cached = result.scalar_one_or_none()
+        return validate_analysis(cached) if cached is not None else None
+
+    async def record_file(self, db: AsyncSession, text_hash: str, file_hash: str):
+        """Point a cached text entry at the latest upload's bytes."""
+        await db.execute(
+            update(ResumeAnalysis)
+            .where(
+                and_(
+                    ResumeAnalysis.text_hash == text_hash,
+                    ResumeAnalysis.analysis_version == self.version,
+                    ResumeAnalysis.file_hash.is_distinct_from(file_hash),
+                )
+            )
+            .values(file_hash=file_hash)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def put(
+        self,
+        db: AsyncSession,
+        text_hash: str,
+        file_hash: Optional[str],
+        analysis: Dict[str, Any]
+    ):
+        # Replaces an entry that stopped validating
+        await db.execute(
+            insert(ResumeAnalysis)
+            .values(
+                text_hash=text_hash,
+                file_hash=file_hash,
+                analysis_version=self.version,
+                analysis=analysis,
+            )
+            .on_conflict_do_update(
+                constraint="unique_resume_analysis",
+                set_={"file_hash": file_hash, "analysis": analysis},
+            )
+        )
+
+    async def analyze(self, resume_text: str, file_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Return the cached analysis for this text, running the LLM only on a miss.
+
+        Only analyses that validate as SkillAnalysis are cached; anything else
+        is answered with the default analysis, like an LLM failure. The lookup
+        and the write each use their own short transaction, so no connection
+        is held while the LLM runs; callers should commit their own session
+        before calling.
+        """
+        text_hash = sha256_hex(normalize_resume_text(resume_text).encode("utf-8"))
+        async with async_session_maker() as db:
+            cached = await self.get_by_text(db, text_hash)
+            if cached is not None and file_hash:
+                # The same bytes uploaded again then skip parsing too
+                await self.record_file(db, text_hash, file_hash)
+                await db.commit()
+        if cached is not None:
+            logger.info("Resume analysis cache hit (text {})", text_hash[:12])
+            return cached
+
+        try:
+            analysis = await llm_service.analyze_resume(
+                resume_parser.skill_excerpt(resume_text),
+                use_fallback=False
+            )
+        except Exception:
+            # Don't cache the fallback; the next upload should retry the LLM
+            return llm_service.fallback_skill_analysis()
+
+        analysis = validate_analysis(analysis)
+        if analysis is None:
+            return llm_service.fallback_skill_analysis()
+
+        async with async_session_maker() as db:
+            await self.put(db, text_hash, file_hash, analysis)
+            await db.commit()
+        return analysis
+
+
+# Singleton instance
+resume_analysis_cache = ResumeAnalysisCache()
@@ -1,83 +1,184 @@
+import asyncio
 import io
-from typing import Optional
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Set, Tuple
 import fitz  # PyMuPDF
 from docx import Document
 from loguru import logger
+from app.core.config import settings
+from app.services.skill_matcher import skill_matcher
+
+HEADER_LINES = 8  # Name, title and summary usually come first
+_EXPERIENCE_HINT = re.compile(r"\b(?:19|20)\d{2}\b|\byears?\b|\bpresent\b", re.IGNORECASE)
+
+
+def _extract_pdf_pages(content: bytes, start: int, stop: int) -> Tuple[int, str]:
+    """Extract text from pages [start, stop) and report the document's page count."""
+    doc = fitz.open(stream=content, filetype="pdf")
+    try:
+        page_count = doc.page_count
+        text_parts = []
+        for page_number in range(start, min(stop, page_count)):
+            text_parts.append(doc.load_page(page_number).get_text())
+        return page_count, "\n".join(text_parts)
+    finally:
+        doc.close()
+
+
+def _extract_docx(content: bytes) -> str:
+    """Extract paragraph text from a DOCX file."""
+    doc = Document(io.BytesIO(content))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
 
 
 class ResumeParser:
-    """Service for parsing resume files (PDF and DOCX)."""
+    """Service for parsing resume files (PDF and DOCX).
+
+    Extraction runs in a process pool so PyMuPDF/python-docx never block the
+    event loop. Each job has a timeout; a job that overruns retires its pool:
+    new jobs go to a fresh pool, the other jobs already on the old one run to
+    completion, and only then is the old pool (and its stuck worker) killed,
+    so one pathological file never aborts other users' parses.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[ProcessPoolExecutor, Set[asyncio.Future]] = {}
+        self._retired: Set[ProcessPoolExecutor] = set()
+        self._tasks: set = set()  # Keep references so reaper tasks aren't collected
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.RESUME_PARSER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    @staticmethod
+    def _terminate(pool: ProcessPoolExecutor):
+        """Kill a pool's workers, including one stuck on a runaway job."""
+        processes = list(getattr(pool, "_processes", {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _retire_pool(self, pool: ProcessPoolExecutor):
+        """Route new jobs to a fresh pool and reap this one in the background."""
+        if pool in self._retired:
+            return
+        if self._pool is pool:
+            self._pool = None
+        self._retired.add(pool)
+        task = asyncio.create_task(self._reap(pool))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reap(self, pool: ProcessPoolExecutor):
+        # Every other job on the pool completes or hits its own timeout within one more timeout
+        jobs = self._jobs.pop(pool, set())
+        if jobs:
+            await asyncio.wait(jobs, timeout=settings.RESUME_PARSE_TIMEOUT_SECONDS)
+        self._retired.discard(pool)
+        self._terminate(pool)
+        logger.info("Retired resume parser pool shut down")
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        future = loop.run_in_executor(pool, func, *args)
+        jobs = self._jobs.setdefault(pool, set())
+        jobs.add(future)
+        future.add_done_callback(jobs.discard)
+        try:
+            return await asyncio.wait_for(future, timeout=settings.RESUME_PARSE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.error("Resume parsing timed out after {}s", settings.RESUME_PARSE_TIMEOUT_SECONDS)
+            self._retire_pool(pool)
+            raise
 
     async def parse(self, file_content: bytes, filename: str) -> Optional[str]:
         """Parse resume file and extract text content."""
         if filename.lower().endswith('.pdf'):
-            return self._parse_pdf(file_content)
+            return await self._parse_pdf(file_content)
         elif filename.lower().endswith('.docx'):
-            return self._parse_docx(file_content)
+            return await self._parse_docx(file_content)
         else:
             logger.warning(f"Unsupported file format: {filename}")
             return None
 
-    def _parse_pdf(self, content: bytes) -> Optional[str]:
-        """Extract text from PDF file."""
+    async def _parse_pdf(self, content: bytes) -> Optional[str]:
+        """Extract text from PDF file, splitting long documents across workers."""
+        batch = min(settings.RESUME_PAGES_PER_JOB, settings.RESUME_MAX_PAGES)
         try:
-            doc = fitz.open(stream=content, filetype="pdf")
-            text_parts = []
-            for page in doc:
-                text_parts.append(page.get_text())
-            doc.close()
-            return "\n".join(text_parts)
+            page_count, first_text = await self._run(_extract_pdf_pages, content, 0, batch)
+            pages = min(page_count, settings.RESUME_MAX_PAGES)
+            if page_count > pages:
+                logger.warning("PDF has {} pages, only the first {} are parsed", page_count, pages)
+
+            rest = await asyncio.gather(*[
+                self._run(_extract_pdf_pages, content, start, min(start + batch, pages))
+                for start in range(batch, pages, batch)
+            ])
+            return "\n".join([first_text] + [text for _, text in rest])
         except Exception as e:
-            logger.error(f"PDF parsing failed: {e}")
+            logger.error("PDF parsing failed: {!r}", e)
             return None
 
-    def _parse_docx(self, content: bytes) -> Optional[str]:
+    async def _parse_docx(self, content: bytes) -> Optional[str]:
         """Extract text from DOCX file."""
         try:
-            doc = Document(io.BytesIO(content))
-            text_parts = []
-            for paragraph in doc.paragraphs:
-                text_parts.append(paragraph.text)
-            return "\n".join(text_parts)
+            return await self._run(_extract_docx, content)
         except Exception as e:
-            logger.error(f"DOCX parsing failed: {e}")
+            logger.error("DOCX parsing failed: {!r}", e)
             return None
 
+    def close(self):
+        """Shut down the worker pool and kill any retired ones."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        for pool in self._retired:
+            self._terminate(pool)
+        self._retired.clear()
+
     def extract_skills_basic(self, text: str) -> list:
         """Basic skill extraction using keyword matching (fallback)."""
-        # Common tech skills to look for
-        skills_keywords = [
-            # Programming Languages
-            "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust",
-            "ruby", "php", "swift", "kotlin", "scala",
-            # Frontend
-            "react", "angular", "vue", "next.js", "html", "css", "tailwind",
-            "redux", "webpack", "vite",
-            # Backend
-            "node.js", "express", "fastapi", "django", "flask", "spring",
-            ".net", "rails", "laravel",
-            # Databases
-            "sql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch",
-            "dynamodb", "cassandra", "neo4j",
-            # Cloud & DevOps
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
-            "jenkins", "github actions", "ci/cd",
-            # AI/ML
-            "machine learning", "deep learning", "tensorflow", "pytorch",
-            "langchain", "llm", "nlp", "computer vision", "rag",
-            # Tools & Concepts
-            "git", "linux", "rest api", "graphql", "microservices",
-            "distributed systems", "system design", "data structures",
-            "algorithms", "agile", "scrum",
-        ]
-
-        text_lower = text.lower()
-        found_skills = []
-        for skill in skills_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-
-        return list(set(found_skills))
+        return skill_matcher.find(text)
+
+    def skill_excerpt(self, text: str, max_chars: int = None) -> str:
+        """Condense a long resume to the lines worth sending to the LLM.
+
+        Keeps the header, lines that mention a known skill and lines with
+        dates or durations (for experience level), in document order.
+        """
+        max_chars = max_chars or settings.RESUME_LLM_MAX_CHARS
+        if len(text) <= max_chars:
+            return text
+
+        lines = [line.strip() for line in text.splitlines()]
+        skill_lines = set()
+        offset = 0
+        spans = iter(skill_matcher.spans(text))
+        span = next(spans, None)
+        for index, line in enumerate(text.splitlines(keepends=True)):
+            offset += len(line)
+            while span is not None and span[0] < offset:
+                skill_lines.add(index)
+                span = next(spans, None)
+
+        kept, size = [], 0
+        for index, line in enumerate(lines):
+            if not line:
+                continue
+            if index < HEADER_LINES or index in skill_lines or _EXPERIENCE_HINT.search(line):
+                if size + len(line) + 1 > max_chars:
+                    break
+                kept.append(line)
+                size += len(line) + 1
+        return "\n".join(kept)
 
 
 # Singleton instance
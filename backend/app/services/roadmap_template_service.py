@@ -0,0 +1,260 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import select, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.single_flight import SingleFlight
+from app.models.topic import Topic
+from app.models.roadmap import Roadmap
+from app.models.roadmap_template import RoadmapTemplate
+from app.services.llm_service import llm_service
+
+# Bump when the roadmap prompt or item format changes; old rows are ignored
+ROADMAP_TEMPLATE_VERSION = 1
+
+
+def is_valid_roadmap(items) -> bool:
+    """Whether LLM roadmap output has the fields materialize() relies on."""
+    if not isinstance(items, list) or not items:
+        return False
+    for item in items:
+        if not isinstance(item, dict):
+            return False
+        day = item.get("day")
+        if not isinstance(day, int) or isinstance(day, bool) or day < 1:
+            return False
+        concept = item.get("concept")
+        if not isinstance(concept, str) or not concept.strip():
+            return False
+    return True
+
+
+class RoadmapTemplateService:
+    """Service for caching LLM roadmaps per (topic, duration, level)."""
+
+    def __init__(self):
+        self._refreshing: set = set()
+        self._tasks: set = set()  # Keep references so refresh tasks aren't collected
+        self._flight = SingleFlight()
+
+    async def get_items(
+        self,
+        db: AsyncSession,
+        topics: List[Topic],
+        duration_days: int,
+        experience_level: Optional[str] = None
+    ) -> Dict[str, list]:
+        """Return roadmap items per topic id, generating misses concurrently.
+
+        Stale or fallback templates are served as-is and refreshed in the
+        background. Defaults used after an LLM failure are cached as a
+        fallback template, so later enrollments don't wait on a failing LLM
+        and the refresh retries it off the request path. On a miss the
+        session's transaction is committed first, so no connection sits idle
+        in a transaction while the LLM runs.
+        """
+        experience_level = experience_level or "intermediate"
+        topic_ids = [topic.id for topic in topics]
+
+        result = await db.execute(
+            select(RoadmapTemplate).where(
+                and_(
+                    RoadmapTemplate.topic_id.in_(topic_ids),
+                    RoadmapTemplate.duration_days == duration_days,
+                    RoadmapTemplate.experience_level == experience_level,
+                    RoadmapTemplate.version == ROADMAP_TEMPLATE_VERSION,
+                )
+            )
+        )
+        templates = {template.topic_id: template for template in result.scalars().all()}
+
+        stale_before = datetime.utcnow() - timedelta(days=settings.ROADMAP_TEMPLATE_TTL_DAYS)
+        items_by_topic = {}
+        misses = []
+        malformed = set()  # Cached before items were validated; always replaced
+        for topic in topics:
+            template = templates.get(topic.id)
+            if template is None or not is_valid_roadmap(template.items):
+                if template is not None:
+                    malformed.add(topic.id)
+                misses.append(topic)
+                continue
+            items_by_topic[str(topic.id)] = template.items
+            if template.is_fallback or template.refreshed_at < stale_before:
+                self.schedule_refresh(topic, duration_days, experience_level)
+
+        if misses:
+            logger.info("Roadmap template miss for {} topic(s), generating", len(misses))
+            await db.commit()
+            generated = await asyncio.gather(*[
+                self._generate_once(topic, duration_days, experience_level, replace=topic.id in malformed)
+                for topic in misses
+            ])
+            for topic, items in zip(misses, generated):
+                items_by_topic[str(topic.id)] = items
+
+        return items_by_topic
+
+    async def materialize(
+        self,
+        db: AsyncSession,
+        user_id,
+        items_by_topic: Dict[str, list],
+        start_date: date
+    ) -> Dict[str, int]:
+        """Copy template items into a user's roadmap and return days created per topic.
+
+        Rows go out as batched multi-row INSERTs rather than one ORM object
+        per day, so a 90-day, multi-topic enrollment is a handful of round
+        trips and nothing lands in the session's identity map.
+        """
+        now = datetime.utcnow()
+        rows = []
+        counts = {}
+        for topic_id, items in items_by_topic.items():
+            for item in items:
+                rows.append({
+                    "user_id": user_id,
+                    "topic_id": topic_id,
+                    "day_number": item["day"],
+                    "concept_title": item["concept"],
+                    "concept_slug": item["concept"].lower().replace(" ", "-").replace("'", ""),
+                    "difficulty": item.get("difficulty", "medium"),
+                    "estimated_read_time": item.get("read_time", 10),
+                    "scheduled_date": start_date + timedelta(days=item["day"] - 1),
+                    "status": "pending",
+                    "created_at": now,
+                })
+            counts[topic_id] = len(items)
+
+        if rows:
+            await db.execute(insert(Roadmap), rows)
+        return counts
+
+    def schedule_refresh(self, topic: Topic, duration_days: int, experience_level: str):
+        """Regenerate a template off the request path, at most once at a time per key."""
+        key = (topic.id, duration_days, experience_level)
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, topic.name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: tuple, topic_name: str):
+        topic_id, duration_days, experience_level = key
+        try:
+            items, is_fallback = await self._generate(topic_name, duration_days, experience_level)
+            if is_fallback:
+                return  # Keep the existing template rather than overwrite it with defaults
+            async with async_session_maker() as db:
+                await self._store(db, topic_id, duration_days, experience_level, items)
+                await db.commit()
+            logger.info(
+                "Refreshed roadmap template for {} ({}d, {})", topic_name, duration_days, experience_level
+            )
+        except Exception as e:
+            logger.error("Roadmap template refresh failed for {}: {}", topic_name, e)
+        finally:
+            self._refreshing.discard(key)
+
+    async def _generate_once(
+        self,
+        topic: Topic,
+        duration_days: int,
+        experience_level: str,
+        replace: bool = False
+    ) -> list:
+        """Generate and cache a missing template, sharing one run among concurrent misses.
+
+        The template is written in its own short transaction. Defaults used
+        after an LLM failure are stored marked as a fallback, so the next read
+        schedules a refresh.
+        """
+        key = (topic.id, duration_days, experience_level)
+
+        async def run() -> list:
+            items, is_fallback = await self._generate(topic.name, duration_days, experience_level)
+            async with async_session_maker() as db:
+                await self._store(
+                    db, topic.id, duration_days, experience_level, items,
+                    is_fallback=is_fallback, replace=replace,
+                )
+                await db.commit()
+            return items
+
+        return await self._flight.do(key, run)
+
+    async def _generate(self, topic_name: str, duration_days: int, experience_level: str) -> tuple:
+        """Generate roadmap items, reporting whether defaults had to be used."""
+        try:
+            items = await llm_service.generate_roadmap(
+                topic_name=topic_name,
+                duration_days=duration_days,
+                user_level=experience_level,
+                use_fallback=False,
+            )
+            if not is_valid_roadmap(items):
+                raise ValueError("Roadmap items are missing a day or concept")
+            return items, False
+        except Exception as e:
+            logger.warning("Using default roadmap for {}: {}", topic_name, e)
+            return llm_service.fallback_roadmap(topic_name, duration_days), True
+
+    async def _store(
+        self,
+        db: AsyncSession,
+        topic_id,
+        duration_days: int,
+        experience_level: str,
+        items: list,
+        is_fallback: bool = False,
+        replace: bool = False
+    ):
+        """Insert the template for the current version.
+
+        An existing row is only replaced when it is stale, was built from
+        defaults, or `replace` is set, so concurrent misses don't keep
+        overwriting each other. Defaults never replace an LLM-built plan.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(days=settings.ROADMAP_TEMPLATE_TTL_DAYS)
+        if replace:
+            replaceable = None
+        elif is_fallback:
+            replaceable = RoadmapTemplate.is_fallback.is_(True)
+        else:
+            replaceable = or_(
+                RoadmapTemplate.is_fallback.is_(True),
+                RoadmapTemplate.refreshed_at < stale_before,
+            )
+        stmt = insert(RoadmapTemplate).values(
+            topic_id=topic_id,
+            duration_days=duration_days,
+            experience_level=experience_level,
+            version=ROADMAP_TEMPLATE_VERSION,
+            items=items,
+            is_fallback=is_fallback,
+            created_at=now,
+            refreshed_at=now,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="unique_roadmap_template",
+                set_={
+                    "items": stmt.excluded["items"],
+                    "is_fallback": stmt.excluded.is_fallback,
+                    "refreshed_at": stmt.excluded.refreshed_at,
+                },
+                where=replaceable,
+            )
+        )
+
+
+# Singleton instance
+roadmap_template_service = RoadmapTemplateService()
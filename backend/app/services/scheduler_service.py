@@ -1,6 +1,12 @@
-from datetime import datetime, date, timedelta
-from typing import List
-from sqlalchemy import select, and_
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from time import perf_counter
+from typing import List, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import select, update, delete, and_, or_, func, exists, values, column, Integer, String, Time
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -8,11 +14,93 @@ from loguru import logger
 
 from app.models.user import User
 from app.models.roadmap import Roadmap
-from app.models.article import Article
+from app.models.inbound_message import InboundMessage
 from app.services.whatsapp_service import whatsapp_service
 from app.services.llm_service import llm_service
+from app.services.article_service import article_service
+from app.core.config import settings
 from app.core.database import async_session_maker
 
+# Width of a dispatch bucket; the scheduler ticks once per bucket
+SEND_SLOT_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+
+
+def _zone(tz_name: Optional[str]) -> ZoneInfo:
+    """ZoneInfo for a user's timezone (UTC on unknown zones)."""
+    try:
+        return ZoneInfo(tz_name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown timezone {!r}, falling back to UTC", tz_name)
+        return ZoneInfo("UTC")
+
+
+def _utc_offset_minutes(tz_name: Optional[str], at: Optional[datetime] = None) -> int:
+    """UTC offset of a timezone in minutes at `at` (default now)."""
+    at = at or datetime.now(timezone.utc)
+    return int(at.astimezone(_zone(tz_name)).utcoffset().total_seconds() // 60)
+
+
+def compute_send_slot(
+    tz_name: Optional[str],
+    preferred_time: Optional[time],
+    at: Optional[datetime] = None
+) -> int:
+    """Convert a user's local preferred time into a UTC minute-of-day slot.
+
+    Uses the offset in effect at the user's next local send time after `at`
+    (default now), so a DST change before that send is already accounted for.
+    The slot is rounded down to the start of its dispatch bucket, so every
+    slot has a tick on the same UTC day (23:50 goes out with the 23:45 tick).
+    """
+    preferred_time = preferred_time or time(9, 0)
+    local_minutes = preferred_time.hour * 60 + preferred_time.minute
+    tz = _zone(tz_name)
+    now = (at or datetime.now(timezone.utc)).astimezone(tz)
+    send_at = datetime.combine(now.date(), preferred_time, tzinfo=tz)
+    if send_at <= now:
+        send_at = datetime.combine(now.date() + timedelta(days=1), preferred_time, tzinfo=tz)
+    slot = (local_minutes - _utc_offset_minutes(tz_name, send_at)) % MINUTES_PER_DAY
+    return slot - slot % SEND_SLOT_MINUTES
+
+
+@dataclass
+class DispatchJob:
+    """A single user's daily message moving through the dispatch pipeline."""
+    user_id: UUID
+    phone_whatsapp: str
+    experience_level: Optional[str]
+    roadmap_id: UUID
+    concept_title: str
+    difficulty: str
+    hook_message: Optional[str]
+    topic_name: Optional[str]
+
+
+@dataclass
+class DispatchStats:
+    """Counters reported at the end of each dispatch run."""
+    due: int = 0
+    hooks_generated: int = 0
+    sent: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class PregenerationStats:
+    """Counters reported at the end of each look-ahead pre-generation run."""
+    candidates: int = 0
+    hooks_generated: int = 0
+    articles_created: int = 0
+    deferred: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
 
 class SchedulerService:
     """Service for scheduling and sending daily messages."""
@@ -24,12 +112,44 @@ class SchedulerService:
     def start(self):
         """Start the scheduler."""
         if not self._is_running:
-            # Run every hour to check for users whose preferred time has arrived
+            # Run once per send slot to pick up users whose preferred time has arrived.
+            # Each run also catches up on earlier slots, so a late or skipped tick
+            # only delays those users until the next one.
             self.scheduler.add_job(
                 self.send_daily_messages,
-                CronTrigger(minute=0),  # Run at the start of every hour
+                CronTrigger(minute=f"*/{SEND_SLOT_MINUTES}"),
                 id="daily_messages",
-                replace_existing=True
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+                misfire_grace_time=SEND_SLOT_MINUTES * 60,
+            )
+            # Recompute slots hourly, between dispatch ticks, so a DST change is
+            # picked up before the first send it affects (and once at boot to
+            # backfill users created before slots existed)
+            self.scheduler.add_job(
+                self.refresh_send_slots,
+                CronTrigger(minute=5),
+                id="refresh_send_slots",
+                replace_existing=True,
+                next_run_time=datetime.now(timezone.utc),
+            )
+            # Prepare upcoming hooks and articles between dispatch ticks
+            self.scheduler.add_job(
+                self.pregenerate_upcoming,
+                CronTrigger(minute=40),
+                id="pregenerate_upcoming",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+            self.scheduler.add_job(
+                self.purge_inbound_messages,
+                CronTrigger(hour=3, minute=50),
+                id="purge_inbound_messages",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
             )
             self.scheduler.start()
             self._is_running = True
@@ -42,92 +162,443 @@ class SchedulerService:
             self._is_running = False
             logger.info("Scheduler stopped")
 
-    async def send_daily_messages(self):
-        """Send daily hook messages to users at their preferred time."""
-        current_hour = datetime.utcnow().hour
-        logger.info(f"Checking for users to send messages at hour {current_hour}")
+    async def send_daily_messages(self) -> "DispatchStats":
+        """Send daily hook messages to users at their preferred time.
+
+        Runs as a three-stage pipeline: pick the users due by now, generate
+        any missing hooks, then send. Each stage has its own worker limit and
+        every user is written back in its own session.
+
+        A user is due once their slot has passed today (UTC) and stays due
+        until something is sent, so users whose slot fell in a dropped or
+        overrunning tick are picked up by the next one.
+        """
+        now = datetime.utcnow()
+        minute_of_day = now.hour * 60 + now.minute
+        logger.info("Checking for users to send messages due by minute {}", minute_of_day)
+
+        stats = DispatchStats()
+        started = perf_counter()
+
+        await self._settle_stale_sends()
+
+        # Stage 1: pick due users with their next pending concept
+        jobs = await self._pick_due_jobs(minute_of_day)
+        stats.due = len(jobs)
+
+        hook_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.DISPATCH_QUEUE_SIZE)
+        send_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.DISPATCH_QUEUE_SIZE)
+
+        hook_workers = [
+            asyncio.create_task(self._hook_worker(hook_queue, send_queue, stats))
+            for _ in range(settings.DISPATCH_HOOK_WORKERS)
+        ]
+        send_workers = [
+            asyncio.create_task(self._send_worker(send_queue, stats))
+            for _ in range(settings.DISPATCH_SEND_WORKERS)
+        ]
+
+        for job in jobs:
+            await hook_queue.put(job)
+        for _ in hook_workers:
+            await hook_queue.put(None)
+        await asyncio.gather(*hook_workers)
 
+        for _ in send_workers:
+            await send_queue.put(None)
+        await asyncio.gather(*send_workers)
+
+        stats.elapsed = perf_counter() - started
+        logger.info(
+            "Dispatch at minute {}: {} due, {} hooks generated, {} sent, {} failed in {:.1f}s ({:.1f} msg/s)",
+            minute_of_day, stats.due, stats.hooks_generated, stats.sent, stats.failed,
+            stats.elapsed, stats.throughput,
+        )
+        return stats
+
+    async def _pick_due_jobs(self, minute_of_day: int) -> List["DispatchJob"]:
+        """Fetch due users joined to their next pending roadmap item in one query.
+
+        Every user whose slot is at or before `minute_of_day` is due. Users
+        who were already sent an item today (UTC, like sent_at) are skipped,
+        so a repeated or overlapping tick never sends twice.
+        """
+        from app.models.topic import Topic
+
+        today_start = datetime.combine(datetime.utcnow().date(), time.min)
+        sent_today = aliased(Roadmap)
         async with async_session_maker() as db:
-            # Find users whose preferred time matches current hour
-            # and who have pending roadmap items for today
             result = await db.execute(
-                select(User).where(
+                select(
+                    User.id,
+                    User.phone_whatsapp,
+                    User.experience_level,
+                    Roadmap.id,
+                    Roadmap.concept_title,
+                    Roadmap.difficulty,
+                    Roadmap.hook_message,
+                    Topic.name,
+                )
+                .join(Roadmap, Roadmap.user_id == User.id)
+                .outerjoin(Topic, Topic.id == Roadmap.topic_id)
+                .where(
                     and_(
                         User.whatsapp_connected == "connected",
-                        User.phone_whatsapp.isnot(None)
+                        User.phone_whatsapp.isnot(None),
+                        User.send_slot_utc <= minute_of_day,
+                        Roadmap.status == "pending",
+                        ~exists().where(
+                            and_(
+                                sent_today.user_id == User.id,
+                                sent_today.sent_at >= today_start,
+                            )
+                        ),
                     )
                 )
+                .distinct(User.id)
+                .order_by(User.id, Roadmap.day_number)
             )
-            users = result.scalars().all()
+            return [DispatchJob(*row) for row in result.all()]
+
+    async def _hook_worker(
+        self,
+        hook_queue: asyncio.Queue,
+        send_queue: asyncio.Queue,
+        stats: "DispatchStats"
+    ):
+        """Stage 2: generate and persist hook messages that don't exist yet."""
+        while True:
+            job = await hook_queue.get()
+            if job is None:
+                return
+            if not job.hook_message:
+                try:
+                    job.hook_message = await llm_service.generate_hook_message(
+                        topic_name=job.topic_name or "Interview Prep",
+                        concept_name=job.concept_title,
+                        difficulty=job.difficulty,
+                        user_experience_level=job.experience_level or "intermediate"
+                    )
+                    async with async_session_maker() as db:
+                        await db.execute(
+                            update(Roadmap)
+                            .where(Roadmap.id == job.roadmap_id)
+                            .values(hook_message=job.hook_message)
+                        )
+                        await db.commit()
+                    stats.hooks_generated += 1
+                except Exception as e:
+                    logger.error("Hook generation failed for user {}: {}", job.user_id, e)
+                    stats.failed += 1
+                    continue
+            await send_queue.put(job)
 
-            for user in users:
-                # Check if user's preferred time matches current hour (UTC)
-                # In production, you'd convert using user's timezone
-                if user.preferred_time.hour == current_hour:
-                    await self._send_user_daily_message(db, user)
+    async def _send_worker(self, send_queue: asyncio.Queue, stats: "DispatchStats"):
+        """Stage 3: claim the roadmap item, send the hook, then mark it sent.
 
-    async def _send_user_daily_message(self, db: AsyncSession, user: User):
-        """Send daily message to a specific user."""
-        today = date.today()
+        The item moves to "sending" (with sent_at, so the sent-today guard
+        already covers it) before the message goes out. A failed write after
+        a successful send therefore never puts it back in the pending queue.
+        """
+        while True:
+            job = await send_queue.get()
+            if job is None:
+                return
+            try:
+                if not await self._set_send_status(
+                    job.roadmap_id, "pending", status="sending", sent_at=datetime.utcnow()
+                ):
+                    logger.info("Roadmap item {} was already claimed, skipping", job.roadmap_id)
+                    continue
 
-        # Find next pending roadmap item for this user
-        result = await db.execute(
-            select(Roadmap).where(
+                message_sid = await whatsapp_service.send_hook_message(
+                    to_number=job.phone_whatsapp,
+                    hook_message=job.hook_message,
+                    concept_title=job.concept_title
+                )
+                if not message_sid:
+                    logger.error("Failed to send message to user {}", job.user_id)
+                    stats.failed += 1
+                    # Twilio didn't take it, so the item can go out on a later tick
+                    await self._set_send_status(job.roadmap_id, "sending", status="pending", sent_at=None)
+                    continue
+            except Exception as e:
+                logger.error("Daily message failed for user {}: {}", job.user_id, e)
+                stats.failed += 1
+                continue
+
+            stats.sent += 1
+            try:
+                await self._set_send_status(job.roadmap_id, "sending", status="sent")
+                logger.info("Sent daily message to user {} for concept {}", job.user_id, job.concept_title)
+            except Exception as e:
+                # Left as "sending"; _settle_stale_sends marks it sent later
+                logger.error("Sent message to user {} but could not mark it sent: {}", job.user_id, e)
+
+    async def _set_send_status(self, roadmap_id: UUID, current: str, **changes) -> bool:
+        """Apply changes to a roadmap item only if its status is still `current`."""
+        async with async_session_maker() as db:
+            result = await db.execute(
+                update(Roadmap)
+                .where(and_(Roadmap.id == roadmap_id, Roadmap.status == current))
+                .values(**changes)
+                .returning(Roadmap.id)
+            )
+            updated = result.scalar_one_or_none() is not None
+            await db.commit()
+        return updated
+
+    async def _settle_stale_sends(self):
+        """Mark items stuck in "sending" as sent.
+
+        Their message most likely went out before the final write failed or
+        the worker died; resending could deliver the same hook twice.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.DISPATCH_SENDING_TIMEOUT_SECONDS)
+        async with async_session_maker() as db:
+            result = await db.execute(
+                update(Roadmap)
+                .where(and_(Roadmap.status == "sending", Roadmap.sent_at < stale_before))
+                .values(status="sent")
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning("Marked {} roadmap item(s) stuck in sending as sent", result.rowcount)
+
+    async def pregenerate_upcoming(self, days: Optional[int] = None) -> "PregenerationStats":
+        """Fill hooks and create articles for each user's next few pending items.
+
+        Keeps generation off the send and reply paths: a YES reply finds its
+        article already there. Runs with its own small concurrency budget and
+        backs off whenever live traffic needs the LLM.
+        """
+        days = days or settings.PREGENERATE_DAYS
+        stats = PregenerationStats()
+        started = perf_counter()
+
+        candidates = await self._pick_upcoming(days, settings.PREGENERATE_BATCH_SIZE)
+        stats.candidates = len(candidates)
+
+        semaphore = asyncio.Semaphore(settings.PREGENERATE_CONCURRENCY)
+        # A reserve at or above the limit would never leave a slot for us
+        reserve = max(0, min(settings.PREGENERATE_LLM_RESERVE, settings.LLM_MAX_CONCURRENCY - 1))
+
+        async def prepare(roadmap_id: UUID, user_id: UUID):
+            async with semaphore:
+                # Yield to live traffic: only start while the LLM has spare capacity,
+                # and leave the item for the next run if it stays busy
+                if not await llm_service.wait_for_idle(reserve, settings.PREGENERATE_WAIT_SECONDS):
+                    stats.deferred += 1
+                    return
+                try:
+                    await self._prepare_item(roadmap_id, user_id, stats)
+                except Exception as e:
+                    logger.error("Pre-generation failed for roadmap item {}: {}", roadmap_id, e)
+                    stats.failed += 1
+
+        await asyncio.gather(*[prepare(*candidate) for candidate in candidates])
+
+        stats.elapsed = perf_counter() - started
+        logger.info(
+            "Pre-generation: {} items, {} hooks, {} articles, {} deferred, {} failed in {:.1f}s",
+            stats.candidates, stats.hooks_generated, stats.articles_created,
+            stats.deferred, stats.failed, stats.elapsed,
+        )
+        return stats
+
+    async def _pick_upcoming(self, days: int, limit: int) -> List[tuple]:
+        """Find each connected user's next `days` pending items missing a hook or article.
+
+        Returns (roadmap_id, user_id) pairs, soonest first. Only items scheduled
+        within the window are ranked, so the scan doesn't cover whole roadmaps.
+        """
+        from app.models.article import Article
+
+        # UTC, like scheduled_date and every other date the scheduler compares
+        horizon = datetime.utcnow().date() + timedelta(days=days)
+
+        upcoming = (
+            select(
+                Roadmap.id.label("roadmap_id"),
+                func.row_number().over(
+                    partition_by=Roadmap.user_id,
+                    order_by=Roadmap.day_number,
+                ).label("position"),
+            )
+            .join(User, User.id == Roadmap.user_id)
+            .where(
                 and_(
-                    Roadmap.user_id == user.id,
-                    Roadmap.status == "pending"
+                    User.whatsapp_connected == "connected",
+                    User.phone_whatsapp.isnot(None),
+                    Roadmap.status == "pending",
+                    Roadmap.scheduled_date <= horizon,
                 )
-            ).order_by(Roadmap.day_number)
+            )
+            .subquery()
         )
-        roadmap_item = result.scalar_one_or_none()
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Roadmap.id, Roadmap.user_id)
+                .join(upcoming, upcoming.c.roadmap_id == Roadmap.id)
+                .outerjoin(Article, Article.roadmap_id == Roadmap.id)
+                .where(
+                    and_(
+                        upcoming.c.position <= days,
+                        or_(
+                            Roadmap.hook_message.is_(None),
+                            Article.id.is_(None),
+                            Article.content_id.is_(None),
+                        ),
+                    )
+                )
+                .order_by(upcoming.c.position)
+                .limit(limit)
+            )
+            return [tuple(row) for row in result.all()]
 
-        if not roadmap_item:
-            logger.info(f"No pending concepts for user {user.id}")
-            return
+    async def _prepare_item(self, roadmap_id: UUID, user_id: UUID, stats: "PregenerationStats"):
+        """Generate the hook and article for one roadmap item, whichever are missing.
 
-        # Check if already sent today
-        if roadmap_item.sent_at and roadmap_item.sent_at.date() == today:
-            logger.info(f"Already sent message to user {user.id} today")
-            return
+        No session is held during LLM calls: state is read up front and each
+        result is written in its own short transaction.
+        """
+        from app.models.article import Article
+        from app.models.topic import Topic
+
+        async with async_session_maker() as db:
+            roadmap_item = await db.get(Roadmap, roadmap_id)
+            user = await db.get(User, user_id)
+            if roadmap_item is None or user is None or roadmap_item.status != "pending":
+                return
+            topic = await db.get(Topic, roadmap_item.topic_id)
+            result = await db.execute(
+                select(Article.id).where(
+                    and_(Article.roadmap_id == roadmap_item.id, Article.content_id.isnot(None))
+                )
+            )
+            has_article = result.scalar_one_or_none() is not None
 
-        # Generate hook message if not already generated
         if not roadmap_item.hook_message:
-            topic = await db.get(roadmap_item.topic.__class__, roadmap_item.topic_id)
             hook_message = await llm_service.generate_hook_message(
                 topic_name=topic.name if topic else "Interview Prep",
                 concept_name=roadmap_item.concept_title,
                 difficulty=roadmap_item.difficulty,
                 user_experience_level=user.experience_level or "intermediate"
             )
-            roadmap_item.hook_message = hook_message
+            async with async_session_maker() as db:
+                # Keep a hook written meanwhile by the dispatcher
+                await db.execute(
+                    update(Roadmap)
+                    .where(and_(Roadmap.id == roadmap_id, Roadmap.hook_message.is_(None)))
+                    .values(hook_message=hook_message)
+                )
+                await db.commit()
+            stats.hooks_generated += 1
 
-        # Send WhatsApp message
-        message_sid = await whatsapp_service.send_hook_message(
-            to_number=user.phone_whatsapp,
-            hook_message=roadmap_item.hook_message,
-            concept_title=roadmap_item.concept_title
-        )
+        if not has_article:
+            async with async_session_maker() as db:
+                roadmap_item = await db.get(Roadmap, roadmap_id)
+                if roadmap_item is None:
+                    return
+                # Commits before generating, so no connection is held during the call
+                await article_service.get_or_create_article(db, roadmap_item, user)
+                await db.commit()
+            stats.articles_created += 1
+
+    async def refresh_send_slots(self):
+        """Recompute every user's UTC send slot for their next local send time.
 
-        if message_sid:
-            roadmap_item.sent_at = datetime.utcnow()
-            roadmap_item.status = "sent"
+        One UPDATE ... FROM (VALUES ...) over the distinct (timezone,
+        preferred_time) pairs; only rows whose slot moved are written.
+        """
+        now = datetime.now(timezone.utc)
+        async with async_session_maker() as db:
+            result = await db.execute(select(User.timezone, User.preferred_time).distinct())
+            slots = [
+                (tz_name, preferred_time, compute_send_slot(tz_name, preferred_time, now))
+                for tz_name, preferred_time in result.all()
+            ]
+            if not slots:
+                return
+
+            rows = values(
+                column("timezone", String),
+                column("preferred_time", Time),
+                column("slot", Integer),
+                name="slots",
+            ).data(slots)
+            result = await db.execute(
+                update(User)
+                .where(
+                    and_(
+                        User.timezone.is_not_distinct_from(rows.c.timezone),
+                        User.preferred_time.is_not_distinct_from(rows.c.preferred_time),
+                        User.send_slot_utc.is_distinct_from(rows.c.slot),
+                    )
+                )
+                .values(
+                    send_slot_utc=rows.c.slot,
+                    # Slot maintenance isn't a profile change
+                    updated_at=User.updated_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
             await db.commit()
-            logger.info(f"Sent daily message to user {user.id} for concept {roadmap_item.concept_title}")
-        else:
-            logger.error(f"Failed to send message to user {user.id}")
+            logger.info(
+                "Refreshed send slots for {} (timezone, time) pair(s), {} user(s) moved",
+                len(slots), result.rowcount,
+            )
+
+    async def purge_inbound_messages(self) -> int:
+        """Delete finished inbound messages older than INBOUND_RETENTION_DAYS.
+
+        Deletes in batches so each transaction stays short while the webhook
+        and queue workers keep writing. Returns the number of rows removed.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.INBOUND_RETENTION_DAYS)
+        batch_size = settings.INBOUND_PURGE_BATCH_SIZE
+        purged = 0
+        while True:
+            expired = (
+                select(InboundMessage.id)
+                .where(
+                    and_(
+                        InboundMessage.status.in_(("done", "failed")),
+                        InboundMessage.received_at < cutoff,
+                    )
+                )
+                .limit(batch_size)
+            )
+            async with async_session_maker() as db:
+                result = await db.execute(
+                    delete(InboundMessage)
+                    .where(InboundMessage.id.in_(expired))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                break
+        logger.info("Purged {} inbound message(s) older than {} days", purged, settings.INBOUND_RETENTION_DAYS)
+        return purged
 
     async def process_user_response(
         self,
         db: AsyncSession,
         phone_number: str,
         response: str
-    ) -> bool:
-        """Process user's WhatsApp response."""
+    ) -> Optional[str]:
+        """Apply a user's WhatsApp response and return the reply to send, if any.
+
+        Nothing is committed or sent here: the caller commits the changes
+        together with its own bookkeeping, then sends the reply once.
+        """
         response_lower = response.strip().lower()
 
         # Check if response is affirmative
         if response_lower not in ["yes", "y", "yeah", "yep", "sure", "ok", "okay"]:
-            return False
+            return None
 
         # Find user by phone number
         result = await db.execute(
@@ -137,7 +608,7 @@ class SchedulerService:
 
         if not user:
             logger.warning(f"No user found for phone {phone_number}")
-            return False
+            return None
 
         # Find the latest sent roadmap item
         result = await db.execute(
@@ -146,60 +617,24 @@ class SchedulerService:
                     Roadmap.user_id == user.id,
                     Roadmap.status == "sent"
                 )
-            ).order_by(Roadmap.sent_at.desc())
+            ).order_by(Roadmap.sent_at.desc()).limit(1)
         )
         roadmap_item = result.scalar_one_or_none()
 
         if not roadmap_item:
             logger.warning(f"No sent roadmap item for user {user.id}")
-            return False
-
-        # Check if article exists, if not generate it
-        result = await db.execute(
-            select(Article).where(Article.roadmap_id == roadmap_item.id)
-        )
-        article = result.scalar_one_or_none()
-
-        if not article:
-            # Generate article
-            from app.models.topic import Topic
-            topic = await db.get(Topic, roadmap_item.topic_id)
-            article_content = await llm_service.generate_article(
-                topic_name=topic.name if topic else "Interview Prep",
-                concept_name=roadmap_item.concept_title,
-                user_skill_summary=str(user.skill_analysis) if user.skill_analysis else None
-            )
+            return None
 
-            article = Article(
-                roadmap_id=roadmap_item.id,
-                title=roadmap_item.concept_title,
-                slug=roadmap_item.concept_slug,
-                eli5_content=article_content.get("eli5", ""),
-                technical_content=article_content.get("technical", ""),
-                code_snippets=article_content.get("code_snippets", []),
-                real_world_examples=article_content.get("real_world", ""),
-                practice_problems=article_content.get("practice", []),
-            )
-            db.add(article)
+        # Reuse shared concept content; only the first reader pays for generation
+        article = await article_service.get_or_create_article(db, roadmap_item, user)
 
         # Update roadmap status
         roadmap_item.responded_at = datetime.utcnow()
         roadmap_item.status = "read"
 
-        await db.commit()
-        await db.refresh(article)
-
-        # Send article link
-        from app.core.config import settings
         article_url = f"{settings.FRONTEND_URL}/article/{article.id}"
-        await whatsapp_service.send_article_link(
-            to_number=user.phone_whatsapp,
-            article_url=article_url,
-            concept_title=roadmap_item.concept_title
-        )
-
-        logger.info(f"Processed response and sent article to user {user.id}")
-        return True
+        logger.info("Processed response for user {}, replying with article {}", user.id, article.id)
+        return whatsapp_service.article_link_message(article_url, roadmap_item.concept_title)
 
 
 # Singleton instance
@@ -0,0 +1,80 @@
+import json
+import string
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+SKILLS_FILE = Path(__file__).parent.parent / "data" / "skills.json"
+
+# Tokens keep the symbols that belong to skill names (C++, C#, Node.js, .NET)
+# and split on all other punctuation, so "go" never matches inside "google".
+_SEPARATORS = str.maketrans({
+    char: " " for char in string.punctuation + string.whitespace if char not in "+#."
+})
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercased tokens; a full stop ending a sentence is not part of the token."""
+    tokens = text.lower().translate(_SEPARATORS).replace(". ", " ").split()
+    if tokens and tokens[-1].endswith("."):
+        tokens[-1] = tokens[-1].rstrip(".")
+    return tokens
+
+
+class SkillMatcher:
+    """Finds known skills (and their aliases) in text in a single pass.
+
+    The text is tokenized once; at each token every alias starting there
+    is looked up in a dict, so cost is linear in the text and independent
+    of how many skills are known. Mentions may overlap, so a compound name
+    also reports the skills inside it ("Ruby on Rails" finds Rails and Ruby).
+    """
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        self._canonical: Dict[Tuple[str, ...], str] = {}
+        for name, aliases in skills.items():
+            for alias in [name, *aliases]:
+                key = tuple(_tokenize(alias))
+                if key:
+                    self._canonical[key] = name
+        self._starts = {key[0] for key in self._canonical}
+        self._max_len = max((len(key) for key in self._canonical), default=0)
+
+    @classmethod
+    def from_file(cls, path: Path = SKILLS_FILE) -> "SkillMatcher":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _scan(self, tokens: List[str]) -> Iterator[Tuple[int, int, str]]:
+        """Yield (first token, token count, canonical skill) for each mention, longest first per token."""
+        count = len(tokens)
+        for index in range(count):
+            if tokens[index] not in self._starts:
+                continue
+            for size in range(min(self._max_len, count - index), 0, -1):
+                skill = self._canonical.get(tuple(tokens[index:index + size]))
+                if skill is not None:
+                    yield index, size, skill
+
+    def find(self, text: str) -> List[str]:
+        """Return the distinct skills mentioned in text, in order of first mention."""
+        return list(dict.fromkeys(skill for _, _, skill in self._scan(_tokenize(text))))
+
+    def spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return (start, end, canonical skill) character spans for every mention."""
+        lowered = text.lower().translate(_SEPARATORS)
+        tokens, offsets = [], []
+        position = 0
+        for token in lowered.split():
+            start = lowered.index(token, position)
+            position = start + len(token)
+            token = token.rstrip(".") or token
+            tokens.append(token)
+            offsets.append((start, start + len(token)))
+        return [
+            (offsets[index][0], offsets[index + size - 1][1], skill)
+            for index, size, skill in self._scan(tokens)
+        ]
+
+
+# Loaded once at import
+skill_matcher = SkillMatcher.from_file()
@@ -0,0 +1,148 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Optional
+from uuid import UUID
+from sqlalchemy import update, values, column, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.article import Article
+
+REDIS_KEY = "dailydev:article_views"
+# Read and clear the shared hash in one atomic step, so concurrent flushes
+# from several replicas never see (or lose) the same deltas
+TAKE_ALL_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return entries
+"""
+
+
+class ViewCounterService:
+    """Write-behind buffer for article view counts.
+
+    Reads only bump an in-memory (or Redis) counter; a background loop
+    folds the buffered deltas into articles.view_count with one bulk UPDATE.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, int] = defaultdict(int)
+        self._redis = None
+        self._task: Optional[asyncio.Task] = None
+        self.flush_interval = settings.VIEW_COUNTER_FLUSH_SECONDS
+
+    def _get_redis(self):
+        if self._redis is None and settings.VIEW_COUNTER_BACKEND == "redis" and settings.REDIS_URL:
+            import redis.asyncio as redis  # Optional dependency
+            self._redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    async def increment(self, article_id) -> None:
+        """Record one view without touching the database."""
+        article_id = str(article_id)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.hincrby(REDIS_KEY, article_id, 1)
+                return
+            except Exception as e:
+                logger.warning("Redis view counter unavailable, buffering locally: {}", e)
+        self._pending[article_id] += 1
+
+    def pending(self, article_id) -> int:
+        """Views buffered in this process that haven't been flushed yet."""
+        return self._pending.get(str(article_id), 0)
+
+    async def _drain(self) -> Dict[str, int]:
+        """Take every buffered delta, local and shared."""
+        deltas: Dict[str, int] = defaultdict(int)
+        local, self._pending = self._pending, defaultdict(int)
+        for article_id, count in local.items():
+            deltas[article_id] += count
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                entries = await client.eval(TAKE_ALL_SCRIPT, 1, REDIS_KEY)
+                for article_id, count in zip(entries[::2], entries[1::2]):
+                    deltas[article_id] += int(count)
+            except Exception as e:
+                logger.warning("Failed to drain Redis view counters: {}", e)
+        return deltas
+
+    async def _restore(self, deltas: Dict[str, int]):
+        """Put drained deltas back so the next flush (on any replica) retries them."""
+        client = self._get_redis()
+        if client is not None:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    for article_id, count in deltas.items():
+                        pipe.hincrby(REDIS_KEY, article_id, count)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                logger.warning("Failed to restore Redis view counters, buffering locally: {}", e)
+        for article_id, count in deltas.items():
+            self._pending[article_id] += count
+
+    async def flush(self) -> int:
+        """Apply buffered deltas in one UPDATE ... FROM (VALUES ...)."""
+        deltas = await self._drain()
+        if not deltas:
+            return 0
+
+        rows = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("delta", Integer),
+            name="deltas",
+        ).data([(UUID(article_id), count) for article_id, count in deltas.items()])
+
+        try:
+            async with async_session_maker() as db:
+                await db.execute(
+                    update(Article)
+                    .where(Article.id == rows.c.id)
+                    .values(
+                        view_count=Article.view_count + rows.c.delta,
+                        updated_at=Article.updated_at,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error("View count flush failed: {}", e)
+            await self._restore(deltas)
+            return 0
+
+        logger.debug("Flushed view counts for {} article(s)", len(deltas))
+        return len(deltas)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic flush loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write out whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+# Singleton instance
+view_counter = ViewCounterService()
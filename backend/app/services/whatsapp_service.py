@@ -1,25 +1,154 @@
-from typing import Optional
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic
+from typing import List, Optional, Tuple
+import httpx
 from loguru import logger
 from app.core.config import settings
 
+TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
+# Creating a message isn't idempotent: only retry when Twilio certainly didn't send it
+RETRYABLE_STATUS = {429, 503}
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, in either delay or HTTP-date form."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class TransportResponse:
+    """Outcome of a single send attempt."""
+    status_code: int
+    sid: Optional[str] = None
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+
+
+class TwilioHTTPTransport:
+    """Sends messages through Twilio's REST API on a pooled async HTTP client."""
+
+    def __init__(self, account_sid: str, auth_token: str):
+        self.url = f"{TWILIO_API_BASE}/Accounts/{account_sid}/Messages.json"
+        self.client = httpx.AsyncClient(
+            auth=(account_sid, auth_token),
+            limits=httpx.Limits(
+                max_connections=settings.TWILIO_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.TWILIO_MAX_CONNECTIONS,
+            ),
+            timeout=settings.TWILIO_TIMEOUT_SECONDS,
+        )
+
+    async def send(self, from_: str, to: str, body: str) -> TransportResponse:
+        response = await self.client.post(
+            self.url,
+            data={"From": from_, "To": to, "Body": body},
+        )
+        if response.status_code >= 400:
+            try:
+                error = response.json().get("message", response.text)
+            except ValueError:
+                error = response.text
+            return TransportResponse(
+                status_code=response.status_code,
+                error=error,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        return TransportResponse(status_code=response.status_code, sid=response.json().get("sid"))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+@dataclass
+class FakeWhatsAppTransport:
+    """In-process stand-in for Twilio with configurable latency and failures."""
+    latency: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    sent: List[Tuple[str, str, str]] = field(default_factory=list)
+
+    async def send(self, from_: str, to: str, body: str) -> TransportResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            return TransportResponse(status_code=self.error_status, error="Simulated failure")
+        self.sent.append((from_, to, body))
+        return TransportResponse(status_code=201, sid=f"SMfake{len(self.sent):024d}")
+
+    async def close(self):
+        pass
+
+
+class TokenBucket:
+    """Async token bucket enforcing a per-account send rate."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 
 class WhatsAppService:
     """Service for sending WhatsApp messages via Twilio."""
 
-    def __init__(self):
-        self.client = None
+    def __init__(self, transport=None):
+        self.transport = transport
         self.from_number = settings.TWILIO_WHATSAPP_NUMBER
-        if settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN:
-            self.client = Client(
+        if self.transport is None and settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN:
+            self.transport = TwilioHTTPTransport(
                 settings.TWILIO_ACCOUNT_SID,
                 settings.TWILIO_AUTH_TOKEN
             )
+        self.rate_limiter = TokenBucket(settings.TWILIO_MESSAGES_PER_SECOND)
+        self.max_retries = settings.TWILIO_MAX_RETRIES
 
     def is_configured(self) -> bool:
         """Check if WhatsApp service is properly configured."""
-        return self.client is not None
+        return self.transport is not None
+
+    def set_transport(self, transport):
+        """Swap the transport, e.g. for a FakeWhatsAppTransport in tests."""
+        self.transport = transport
+
+    async def close(self):
+        """Close the underlying transport."""
+        if self.transport is not None:
+            await self.transport.close()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
 
     async def send_message(
         self,
@@ -39,26 +168,37 @@ class WhatsAppService:
             logger.warning("WhatsApp service not configured. Message not sent.")
             return None
 
-        try:
-            # Format numbers for WhatsApp
-            from_whatsapp = f"whatsapp:{self.from_number}"
-            to_whatsapp = f"whatsapp:{to_number}"
-
-            message_obj = self.client.messages.create(
-                from_=from_whatsapp,
-                body=message,
-                to=to_whatsapp
+        # Format numbers for WhatsApp
+        from_whatsapp = f"whatsapp:{self.from_number}"
+        to_whatsapp = f"whatsapp:{to_number}"
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                response = await self.transport.send(from_whatsapp, to_whatsapp, message)
+            except RETRYABLE_ERRORS as e:
+                response = TransportResponse(status_code=0, error=str(e))
+            except Exception as e:
+                logger.error("WhatsApp send failed: {}", e)
+                return None
+
+            if response.sid:
+                logger.info("WhatsApp message sent. SID: {}", response.sid)
+                return response.sid
+
+            retryable = response.status_code == 0 or response.status_code in RETRYABLE_STATUS
+            if not retryable or attempt == self.max_retries:
+                logger.error("Twilio error ({}): {}", response.status_code, response.error)
+                return None
+
+            delay = self._backoff(attempt, response.retry_after)
+            logger.warning(
+                "Twilio returned {}, retrying in {:.2f}s (attempt {}/{})",
+                response.status_code, delay, attempt + 1, self.max_retries,
             )
+            await asyncio.sleep(delay)
 
-            logger.info(f"WhatsApp message sent. SID: {message_obj.sid}")
-            return message_obj.sid
-
-        except TwilioRestException as e:
-            logger.error(f"Twilio error: {e.msg}")
-            return None
-        except Exception as e:
-            logger.error(f"WhatsApp send failed: {e}")
-            return None
+        return None
 
     async def send_hook_message(
         self,
@@ -76,8 +216,12 @@ class WhatsAppService:
         concept_title: str
     ) -> Optional[str]:
         """Send the article link after user responds YES."""
-        message = f"📚 Here's your deep dive on *{concept_title}*:\n\n{article_url}\n\nHappy learning! 🚀"
-        return await self.send_message(to_number, message)
+        return await self.send_message(to_number, self.article_link_message(article_url, concept_title))
+
+    @staticmethod
+    def article_link_message(article_url: str, concept_title: str) -> str:
+        """Text of the reply carrying an article link."""
+        return f"📚 Here's your deep dive on *{concept_title}*:\n\n{article_url}\n\nHappy learning! 🚀"
 
     async def send_weekly_summary(
         self,
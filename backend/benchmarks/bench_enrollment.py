@@ -0,0 +1,125 @@
+"""
+Benchmark roadmap materialization for topic enrollment.
+
+Compares the old path (one Roadmap ORM object per day, flushed together)
+with the bulk multi-row INSERT used by select_topics, for 30/60/90-day
+plans across 1-10 topics. Needs a migrated Postgres at DATABASE_URL;
+everything runs inside a transaction that is rolled back.
+
+Usage (from backend/):
+    python -m benchmarks.bench_enrollment [--topics 1,2,5,10] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.core.database import async_session_maker, engine
+from app.models.roadmap import Roadmap
+from app.models.topic import Topic
+from app.models.user import User
+from app.services.roadmap_template_service import roadmap_template_service
+
+DURATIONS = (30, 60, 90)
+
+
+def make_items(duration_days: int) -> list:
+    """A full-length plan shaped like a cached roadmap template."""
+    return [
+        {
+            "day": day,
+            "concept": f"Concept {day}",
+            "difficulty": ("easy", "medium", "hard")[(day - 1) * 3 // duration_days],
+            "read_time": 10 + (day % 5) * 2,
+        }
+        for day in range(1, duration_days + 1)
+    ]
+
+
+async def orm_materialize(db, user_id, items_by_topic, start_date) -> int:
+    """The previous implementation: one db.add per roadmap day."""
+    count = 0
+    for topic_id, items in items_by_topic.items():
+        for item in items:
+            db.add(Roadmap(
+                user_id=user_id,
+                topic_id=topic_id,
+                day_number=item["day"],
+                concept_title=item["concept"],
+                concept_slug=item["concept"].lower().replace(" ", "-").replace("'", ""),
+                difficulty=item.get("difficulty", "medium"),
+                estimated_read_time=item.get("read_time", 10),
+                scheduled_date=start_date + timedelta(days=item["day"] - 1),
+            ))
+            count += 1
+    await db.flush()
+    return count
+
+
+async def bulk_materialize(db, user_id, items_by_topic, start_date) -> int:
+    counts = await roadmap_template_service.materialize(db, user_id, items_by_topic, start_date)
+    return sum(counts.values())
+
+
+async def timed(db, func, user_id, items_by_topic, repeat: int) -> dict:
+    """Median and best latency in ms; each run is rolled back to a savepoint."""
+    samples = []
+    for _ in range(repeat):
+        savepoint = await db.begin_nested()
+        start = time.perf_counter()
+        await func(db, user_id, items_by_topic, date.today())
+        samples.append((time.perf_counter() - start) * 1000)
+        await savepoint.rollback()
+        db.expunge_all()
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+async def run(topic_counts, repeat: int) -> dict:
+    results = []
+    async with async_session_maker() as db:
+        suffix = uuid.uuid4().hex[:8]
+        user = User(email=f"bench-{suffix}@example.com", password_hash="x")
+        topics = [
+            Topic(name=f"Bench Topic {suffix} {i}", slug=f"bench-{suffix}-{i}")
+            for i in range(max(topic_counts))
+        ]
+        db.add_all([user, *topics])
+        await db.flush()
+
+        try:
+            for duration in DURATIONS:
+                for count in topic_counts:
+                    items_by_topic = {topic.id: make_items(duration) for topic in topics[:count]}
+                    rows = sum(len(items) for items in items_by_topic.values())
+                    orm = await timed(db, orm_materialize, user.id, items_by_topic, repeat)
+                    bulk = await timed(db, bulk_materialize, user.id, items_by_topic, repeat)
+                    results.append({
+                        "duration_days": duration,
+                        "topics": count,
+                        "rows": rows,
+                        "orm": orm,
+                        "bulk": bulk,
+                        "speedup": round(orm["median_ms"] / bulk["median_ms"], 2),
+                    })
+        finally:
+            await db.rollback()
+
+    await engine.dispose()
+    return {"repeat": repeat, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", default="1,2,5,10", help="Comma-separated topic counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    topic_counts = [int(value) for value in args.topics.split(",")]
+    print(json.dumps(asyncio.run(run(topic_counts, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
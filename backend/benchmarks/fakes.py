@@ -0,0 +1,131 @@
+"""
+In-process stand-ins for external services used by the load test.
+
+FakeGroq mimics the subset of AsyncGroq the app calls
+(`chat.completions.create`, blocking and streaming) and answers each
+prompt type with well-formed output. Twilio is faked with
+app.services.whatsapp_service.FakeWhatsAppTransport.
+"""
+import asyncio
+import json
+import random
+import re
+from types import SimpleNamespace
+
+import groq
+import httpx
+
+_ROADMAP_DAYS = re.compile(r"Create a (\d+)-day learning roadmap")
+_CONCEPT = re.compile(r"^Concept: (.+)$", re.MULTILINE)
+
+
+def _article(concept: str) -> dict:
+    return {
+        "eli5": f"{concept} is like sorting your mail before you read it. " * 8,
+        "technical": f"{concept} trades memory for time in predictable ways. " * 40,
+        "code_snippets": [{
+            "language": "Python",
+            "code": "def solve(items):\n    return sorted(items)\n",
+            "explanation": "Baseline implementation.",
+        }],
+        "real_world": f"Large services apply {concept} on their hot paths. " * 10,
+        "practice": [
+            {"question": f"Implement {concept}", "difficulty": "medium", "link": ""},
+            {"question": f"Analyze {concept} at scale", "difficulty": "hard", "link": ""},
+        ],
+    }
+
+
+def _roadmap(days: int) -> list:
+    return [
+        {
+            "day": day,
+            "concept": f"Concept {day}",
+            "difficulty": ("easy", "medium", "hard")[(day - 1) * 3 // days],
+            "read_time": 10 + (day % 5) * 2,
+        }
+        for day in range(1, days + 1)
+    ]
+
+
+def fake_completion(prompt: str) -> str:
+    """Plausible model output for one of the app's prompts."""
+    days = _ROADMAP_DAYS.search(prompt)
+    if days:
+        return json.dumps(_roadmap(int(days.group(1))))
+    concept = _CONCEPT.search(prompt)
+    concept = concept.group(1) if concept else "this concept"
+    if '"eli5"' in prompt:
+        return json.dumps(_article(concept))
+    if "Analyze this resume" in prompt:
+        return json.dumps({
+            "skills": ["Python", "PostgreSQL"],
+            "experience_level": "intermediate",
+            "strengths": ["Backend"],
+            "weaknesses": ["System design"],
+            "recommended_topics": ["DSA", "System Design"],
+            "years_of_experience": 3,
+            "tech_stack": ["FastAPI"],
+        })
+    return f"Ever wondered how Netflix handles {concept}? 🚀 Want to learn more? Reply YES!"
+
+
+class _Stream:
+    """Async iterator of streaming chunks, shaped like Groq's."""
+
+    def __init__(self, text: str, chunk_size: int, delay: float):
+        self.pieces = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self.delay = delay
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for piece in self.pieces:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class _Completions:
+    def __init__(self, owner: "FakeGroq"):
+        self.owner = owner
+
+    async def create(self, messages, stream: bool = False, **kwargs):
+        owner = self.owner
+        owner.calls += 1
+        if owner.latency:
+            await asyncio.sleep(owner.latency)
+        if owner.error_rate and owner.rng.random() < owner.error_rate:
+            owner.errors += 1
+            raise groq.APIConnectionError(
+                message="Simulated failure",
+                request=httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions"),
+            )
+        text = fake_completion(messages[-1]["content"])
+        if stream:
+            return _Stream(text, owner.stream_chunk_size, owner.stream_chunk_delay)
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeGroq:
+    """Drop-in for AsyncGroq with configurable latency and failure rate."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        stream_chunk_size: int = 64,
+        stream_chunk_delay: float = 0.0,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_chunk_delay = stream_chunk_delay
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.chat = SimpleNamespace(completions=_Completions(self))
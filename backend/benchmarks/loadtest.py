@@ -0,0 +1,355 @@
+"""
+Load test the API in-process with fake Groq and Twilio.
+
+Boots app.main:app (lifespan included) against the Postgres at DATABASE_URL,
+seeds virtual users through the API, then drives a weighted mix of endpoints
+from concurrent closed-loop clients. Prints latency percentiles, throughput
+and SQL query counts per endpoint as JSON.
+
+Use a dedicated database that has been migrated and seeded
+(`alembic upgrade head && python -m app.seed_data`); every run adds its
+own users, so runs don't interfere with each other.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest [--users 20] [--duration 30] [--seed 1]
+        [--mix article=30,webhook=10,...] [--llm-latency 0.5]
+        [--llm-error-rate 0.0] [--twilio-latency 0.1] [--twilio-error-rate 0.0]
+        [--output results.json]
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import secrets
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import httpx
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import engine
+from app.main import app
+from app.services.llm_service import llm_service
+from app.services.whatsapp_service import FakeWhatsAppTransport, whatsapp_service
+from benchmarks.fakes import FakeGroq
+
+PASSWORD = "loadtest-password"
+SETUP_ARTICLES = 3  # Articles generated per virtual user before the run
+DEFAULT_MIX = {
+    "article": 30,
+    "roadmap_today": 15,
+    "roadmap_list": 10,
+    "roadmap_topic": 10,
+    "topics_selected": 15,
+    "login": 5,
+    "signup": 3,
+    "webhook": 12,
+}
+
+# Endpoint label of the request being served; queries outside one are "background"
+_endpoint = contextvars.ContextVar("loadtest_endpoint", default="background")
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    phone: str
+    token: str = ""
+    topic_id: str = ""
+    article_ids: List[str] = field(default_factory=list)
+
+    @property
+    def auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class RunContext:
+    run_id: int
+    rng: random.Random
+    sequence: int = 0
+
+    def next_id(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+# Each operation builds (method, path, request kwargs) for one call
+def _article(user: VirtualUser, ctx: RunContext):
+    return "GET", f"/articles/{ctx.rng.choice(user.article_ids)}", {"headers": user.auth}
+
+
+def _roadmap_today(user: VirtualUser, ctx: RunContext):
+    return "GET", "/roadmap/today", {"headers": user.auth}
+
+
+def _roadmap_list(user: VirtualUser, ctx: RunContext):
+    return "GET", "/roadmap/", {"headers": user.auth}
+
+
+def _roadmap_topic(user: VirtualUser, ctx: RunContext):
+    return "GET", f"/roadmap/topic/{user.topic_id}", {"headers": user.auth}
+
+
+def _topics_selected(user: VirtualUser, ctx: RunContext):
+    return "GET", "/topics/me/selected", {"headers": user.auth}
+
+
+def _login(user: VirtualUser, ctx: RunContext):
+    return "POST", "/auth/login", {"json": {"email": user.email, "password": PASSWORD}}
+
+
+def _signup(user: VirtualUser, ctx: RunContext):
+    email = f"loadtest-{ctx.run_id}-new-{ctx.next_id()}@example.com"
+    return "POST", "/auth/signup", {"json": {"email": email, "password": PASSWORD}}
+
+
+def _webhook(user: VirtualUser, ctx: RunContext):
+    form = {
+        "From": f"whatsapp:{user.phone}",
+        "To": f"whatsapp:{whatsapp_service.from_number}",
+        "Body": ctx.rng.choice(["YES", "yes", "later"]),
+        "MessageSid": f"SMloadtest{ctx.run_id}{ctx.next_id():010d}",
+    }
+    return "POST", "/webhooks/whatsapp", {"data": form}
+
+
+OPERATIONS: Dict[str, Callable] = {
+    "article": _article,
+    "roadmap_today": _roadmap_today,
+    "roadmap_list": _roadmap_list,
+    "roadmap_topic": _roadmap_topic,
+    "topics_selected": _topics_selected,
+    "login": _login,
+    "signup": _signup,
+    "webhook": _webhook,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {name}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def request(client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+    """Issue a request with its SQL attributed to `label`."""
+    token = _endpoint.set(label)
+    try:
+        return await client.request(method, url, **kwargs)
+    finally:
+        _endpoint.reset(token)
+
+
+async def create_user(client: httpx.AsyncClient, ctx: RunContext, index: int, topic_ids: List[str]):
+    """Sign up, enroll and pre-generate a few articles for one virtual user."""
+    user = VirtualUser(
+        email=f"loadtest-{ctx.run_id}-{index}@example.com",
+        phone=f"+1{ctx.run_id:06d}{index:05d}",
+    )
+    response = await request(client, "setup", "POST", "/auth/signup", json={
+        "email": user.email,
+        "password": PASSWORD,
+        "phone_whatsapp": user.phone,
+    })
+    response.raise_for_status()
+    user.token = response.json()["access_token"]
+    user.topic_id = ctx.rng.choice(topic_ids)
+
+    response = await request(
+        client, "setup", "POST", "/topics/select",
+        json={"topic_ids": [user.topic_id], "duration_days": 30},
+        headers=user.auth,
+    )
+    response.raise_for_status()
+
+    response = await request(client, "setup", "GET", f"/roadmap/topic/{user.topic_id}", headers=user.auth)
+    response.raise_for_status()
+    for item in response.json()["items"][:SETUP_ARTICLES]:
+        response = await request(client, "setup", "POST", f"/articles/{item['id']}/generate", headers=user.auth)
+        response.raise_for_status()
+        user.article_ids.append(response.json()["article_id"])
+    return user
+
+
+async def client_loop(
+    client: httpx.AsyncClient,
+    user: VirtualUser,
+    ctx: RunContext,
+    mix: Dict[str, float],
+    deadline: float,
+    stats: Dict[str, EndpointStats]
+):
+    """One closed-loop client: pick an endpoint, call it, repeat until the deadline."""
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = ctx.rng.choices(names, weights)[0]
+        method, url, kwargs = OPERATIONS[name](user, ctx)
+        start = time.perf_counter()
+        try:
+            response = await request(client, name, method, url, **kwargs)
+            status = response.status_code
+        except Exception:
+            status = 0
+        entry = stats[name]
+        entry.latencies.append((time.perf_counter() - start) * 1000)
+        entry.statuses[status] += 1
+        if status == 0 or status >= 400:
+            entry.errors += 1
+
+
+def summarize(stats: Dict[str, EndpointStats], queries: Counter, elapsed: float) -> dict:
+    endpoints = {}
+    for name, entry in sorted(stats.items()):
+        latencies = sorted(entry.latencies)
+        count = len(latencies)
+        endpoints[name] = {
+            "requests": count,
+            "errors": entry.errors,
+            "status_codes": {str(code): n for code, n in sorted(entry.statuses.items())},
+            "throughput_rps": round(count / elapsed, 2),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "mean": round(sum(latencies) / count, 3) if count else 0.0,
+                "max": round(latencies[-1], 3) if count else 0.0,
+            },
+            "queries": queries[name],
+            "queries_per_request": round(queries[name] / count, 2) if count else 0.0,
+        }
+
+    total = sum(len(entry.latencies) for entry in stats.values())
+    return {
+        "duration_seconds": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(entry.errors for entry in stats.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+        "background_queries": queries["background"],
+    }
+
+
+async def run(args) -> dict:
+    random.seed(args.seed)  # FakeWhatsAppTransport draws failures from the global RNG
+    ctx = RunContext(run_id=int(time.time()) % 1_000_000, rng=random.Random(args.seed))
+
+    fake_groq = FakeGroq(latency=args.llm_latency, error_rate=args.llm_error_rate, seed=args.seed)
+    fake_twilio = FakeWhatsAppTransport(latency=args.twilio_latency, error_rate=args.twilio_error_rate)
+    llm_service.client = fake_groq
+    whatsapp_service.set_transport(fake_twilio)
+    # /metrics is only served with a token; the run reads it once at the end
+    settings.METRICS_TOKEN = settings.METRICS_TOKEN or secrets.token_urlsafe(32)
+
+    queries: Counter = Counter()
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries[_endpoint.get()] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest/api/v1", timeout=None) as client:
+            response = await client.get("/topics/")
+            topic_ids = [topic["id"] for topic in response.json()]
+            if not topic_ids:
+                raise SystemExit("No topics found; run `python -m app.seed_data` first")
+
+            setup_start = time.perf_counter()
+            semaphore = asyncio.Semaphore(args.setup_concurrency)
+
+            async def setup_one(index: int) -> VirtualUser:
+                async with semaphore:
+                    return await create_user(client, ctx, index, topic_ids)
+
+            users = await asyncio.gather(*[setup_one(i) for i in range(args.users)])
+            setup_seconds = time.perf_counter() - setup_start
+            setup_queries = queries.pop("setup", 0)
+            llm_calls_after_setup = fake_groq.calls
+
+            stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+            queries.clear()
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(*[
+                client_loop(client, user, ctx, args.mix, deadline, stats)
+                for user in users
+            ])
+            elapsed = time.perf_counter() - start
+
+            runtime_metrics = (await client.get(
+                "http://loadtest/metrics",
+                headers={"Authorization": f"Bearer {settings.METRICS_TOKEN}"},
+            )).json()
+
+    event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+
+    return {
+        "config": {
+            "users": args.users,
+            "duration": args.duration,
+            "seed": args.seed,
+            "mix": args.mix,
+            "llm_latency": args.llm_latency,
+            "llm_error_rate": args.llm_error_rate,
+            "twilio_latency": args.twilio_latency,
+            "twilio_error_rate": args.twilio_error_rate,
+        },
+        "setup": {"seconds": round(setup_seconds, 3), "queries": setup_queries},
+        **summarize(stats, queries, elapsed),
+        "fakes": {
+            "llm_calls": fake_groq.calls - llm_calls_after_setup,
+            "llm_errors": fake_groq.errors,
+            "whatsapp_sent": len(fake_twilio.sent),
+        },
+        "runtime_metrics": runtime_metrics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load after setup")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="name=weight,...")
+    parser.add_argument("--setup-concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake completion")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--twilio-latency", type=float, default=0.1, help="Seconds per fake send")
+    parser.add_argument("--twilio-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from logging.config import fileConfig
+
+from sqlalchemy import pool, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+
+from app.core.config import settings
+from app.core.database import Base, connect_args
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Session-level advisory lock serializing concurrent `alembic upgrade` runs
+MIGRATION_LOCK_KEY = 720_314_001
+MIGRATION_LOCK_POLL_SECONDS = 1.0
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting (alembic upgrade --sql)."""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def acquire_migration_lock(connection: Connection) -> None:
+    """Wait for the migration lock without keeping a transaction open.
+
+    A migrator blocked inside a transaction would hold a snapshot that
+    CREATE INDEX CONCURRENTLY in the running migration has to wait for,
+    so poll with pg_try_advisory_lock and commit between attempts.
+    """
+    while True:
+        locked = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        ).scalar()
+        connection.commit()
+        if locked:
+            return
+        time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+
+def do_run_migrations(connection: Connection) -> None:
+    acquire_migration_lock(connection)
+    try:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+
+
+async def run_async_migrations() -> None:
+    connectable = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=pool.NullPool,
+        connect_args=connect_args(),
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,143 @@
+"""Baseline schema, as previously created by Base.metadata.create_all
+
+Databases created before migrations existed already have these tables;
+mark them with `alembic stamp 0001` and then run `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("phone_whatsapp", sa.String(20), nullable=True),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("resume_url", sa.Text(), nullable=True),
+        sa.Column("skill_analysis", postgresql.JSONB(), nullable=True),
+        sa.Column("experience_level", sa.String(50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("timezone", sa.String(50), nullable=True),
+        sa.Column("preferred_time", sa.Time(), nullable=True),
+        sa.Column("whatsapp_connected", sa.String(50), nullable=True),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_phone_whatsapp", "users", ["phone_whatsapp"], unique=True)
+
+    op.create_table(
+        "topics",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("slug", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("icon", sa.String(50), nullable=True),
+        sa.Column("difficulty_levels", postgresql.JSONB(), nullable=True),
+        sa.Column("total_concepts", sa.String(10), nullable=True),
+        sa.Column("is_active", sa.String(10), nullable=True),
+    )
+    op.create_index("ix_topics_slug", "topics", ["slug"], unique=True)
+
+    op.create_table(
+        "user_topics",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("topic_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("topics.id"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("target_completion_date", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=True),
+        sa.Column("duration_days", sa.String(10), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "topic_id", name="unique_user_topic"),
+    )
+
+    op.create_table(
+        "roadmap",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("topic_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("topics.id"), nullable=False),
+        sa.Column("day_number", sa.Integer(), nullable=False),
+        sa.Column("concept_title", sa.String(255), nullable=False),
+        sa.Column("concept_slug", sa.String(255), nullable=False),
+        sa.Column("hook_message", sa.Text(), nullable=True),
+        sa.Column("difficulty", sa.String(20), nullable=True),
+        sa.Column("estimated_read_time", sa.Integer(), nullable=True),
+        sa.Column("scheduled_date", sa.DateTime(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.Column("responded_at", sa.DateTime(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "articles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("roadmap_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("roadmap.id"), nullable=False, unique=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("slug", sa.String(255), nullable=False),
+        sa.Column("eli5_content", sa.Text(), nullable=True),
+        sa.Column("technical_content", sa.Text(), nullable=True),
+        sa.Column("code_snippets", postgresql.JSONB(), nullable=True),
+        sa.Column("real_world_examples", sa.Text(), nullable=True),
+        sa.Column("practice_problems", postgresql.JSONB(), nullable=True),
+        sa.Column("tags", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("view_count", sa.Integer(), nullable=True),
+        sa.Column("avg_read_time", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_articles_slug", "articles", ["slug"])
+
+    op.create_table(
+        "saved_articles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("article_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("articles.id"), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("saved_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "article_id", name="unique_saved_article"),
+    )
+
+    op.create_table(
+        "user_progress",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("topic_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("topics.id"), nullable=False),
+        sa.Column("streak_count", sa.Integer(), nullable=True),
+        sa.Column("longest_streak", sa.Integer(), nullable=True),
+        sa.Column("last_activity_date", sa.Date(), nullable=True),
+        sa.Column("total_concepts_learned", sa.Integer(), nullable=True),
+        sa.Column("total_articles_read", sa.Integer(), nullable=True),
+        sa.Column("badges", postgresql.JSONB(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "topic_id", name="unique_user_progress"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_progress")
+    op.drop_table("saved_articles")
+    op.drop_table("articles")
+    op.drop_table("roadmap")
+    op.drop_table("user_topics")
+    op.drop_table("topics")
+    op.drop_table("users")
@@ -0,0 +1,38 @@
+"""Precomputed UTC send slot for the dispatch scan
+
+Slots are filled by the scheduler's refresh job at boot, so existing rows
+start NULL and need no backfill here.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("send_slot_utc", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_users_send_slot_connected",
+        "users",
+        ["send_slot_utc"],
+        postgresql_where=sa.text("whatsapp_connected = 'connected' AND phone_whatsapp IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_send_slot_connected", table_name="users")
+    op.drop_column("users", "send_slot_utc")
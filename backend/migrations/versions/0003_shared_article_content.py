@@ -0,0 +1,158 @@
+"""Shared article content
+
+Moves article bodies out of per-user articles into article_contents, shared
+per (topic, concept, level, language). Existing articles point at the
+earliest real body generated for their key. Placeholders stored after an
+LLM failure are never made shared content; articles whose key only has
+placeholders keep a NULL content_id and are regenerated on their next read.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ARTICLE_BODY_COLUMNS = (
+    "eli5_content",
+    "technical_content",
+    "code_snippets",
+    "real_world_examples",
+    "practice_problems",
+    "tags",
+)
+
+# Bodies the baseline stored when generation failed (llm_service.fallback_article)
+PLACEHOLDER_BODY = """(
+    COALESCE(a.technical_content, '') IN ('', 'Content is being generated...')
+    OR COALESCE(a.eli5_content, '') LIKE 'We''re working on the explanation for %'
+)"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_contents",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("topic_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("topics.id"), nullable=False),
+        sa.Column("concept_slug", sa.String(255), nullable=False),
+        sa.Column("experience_level", sa.String(50), nullable=False),
+        sa.Column("language", sa.String(50), nullable=False),
+        sa.Column("eli5_content", sa.Text(), nullable=True),
+        sa.Column("technical_content", sa.Text(), nullable=True),
+        sa.Column("code_snippets", postgresql.JSONB(), nullable=True),
+        sa.Column("real_world_examples", sa.Text(), nullable=True),
+        sa.Column("practice_problems", postgresql.JSONB(), nullable=True),
+        sa.Column("tags", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint(
+            "topic_id", "concept_slug", "experience_level", "language",
+            name="unique_article_content",
+        ),
+    )
+
+    # Move existing real bodies into shared content, one row per key
+    op.execute(
+        f"""
+        INSERT INTO article_contents (
+            id, topic_id, concept_slug, experience_level, language,
+            eli5_content, technical_content, code_snippets,
+            real_world_examples, practice_problems, tags, created_at
+        )
+        SELECT DISTINCT ON (r.topic_id, r.concept_slug, COALESCE(u.experience_level, 'intermediate'))
+            gen_random_uuid(), r.topic_id, r.concept_slug,
+            COALESCE(u.experience_level, 'intermediate'), 'Python',
+            a.eli5_content, a.technical_content, a.code_snippets,
+            a.real_world_examples, a.practice_problems, a.tags, a.created_at
+        FROM articles a
+        JOIN roadmap r ON r.id = a.roadmap_id
+        JOIN users u ON u.id = r.user_id
+        WHERE NOT {PLACEHOLDER_BODY}
+        ORDER BY r.topic_id, r.concept_slug, COALESCE(u.experience_level, 'intermediate'), a.created_at
+        """
+    )
+
+    op.add_column("articles", sa.Column("content_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.execute(
+        """
+        UPDATE articles a
+        SET content_id = c.id
+        FROM roadmap r
+        JOIN users u ON u.id = r.user_id
+        JOIN article_contents c
+            ON c.topic_id = r.topic_id
+            AND c.concept_slug = r.concept_slug
+            AND c.experience_level = COALESCE(u.experience_level, 'intermediate')
+            AND c.language = 'Python'
+        WHERE r.id = a.roadmap_id
+        """
+    )
+    # Only placeholders may be left unmapped; never drop a real body
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM articles a WHERE a.content_id IS NULL AND NOT {PLACEHOLDER_BODY}
+            ) THEN
+                RAISE EXCEPTION 'Article bodies could not be mapped to shared content';
+            END IF;
+        END $$
+        """
+    )
+    op.create_foreign_key(
+        "articles_content_id_fkey", "articles", "article_contents", ["content_id"], ["id"]
+    )
+    op.create_index("ix_articles_content_id", "articles", ["content_id"])
+    for column in ARTICLE_BODY_COLUMNS:
+        op.drop_column("articles", column)
+
+    op.add_column("roadmap", sa.Column("content_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "roadmap_content_id_fkey", "roadmap", "article_contents", ["content_id"], ["id"]
+    )
+    op.execute(
+        "UPDATE roadmap r SET content_id = a.content_id FROM articles a WHERE a.roadmap_id = r.id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("roadmap_content_id_fkey", "roadmap", type_="foreignkey")
+    op.drop_column("roadmap", "content_id")
+
+    op.add_column("articles", sa.Column("eli5_content", sa.Text(), nullable=True))
+    op.add_column("articles", sa.Column("technical_content", sa.Text(), nullable=True))
+    op.add_column("articles", sa.Column("code_snippets", postgresql.JSONB(), nullable=True))
+    op.add_column("articles", sa.Column("real_world_examples", sa.Text(), nullable=True))
+    op.add_column("articles", sa.Column("practice_problems", postgresql.JSONB(), nullable=True))
+    op.add_column("articles", sa.Column("tags", postgresql.JSONB(), nullable=True))
+    op.execute(
+        """
+        UPDATE articles a
+        SET eli5_content = c.eli5_content,
+            technical_content = c.technical_content,
+            code_snippets = c.code_snippets,
+            real_world_examples = c.real_world_examples,
+            practice_problems = c.practice_problems,
+            tags = c.tags
+        FROM article_contents c
+        WHERE c.id = a.content_id
+        """
+    )
+    op.drop_index("ix_articles_content_id", table_name="articles")
+    op.drop_constraint("articles_content_id_fkey", "articles", type_="foreignkey")
+    op.drop_column("articles", "content_id")
+
+    op.drop_table("article_contents")
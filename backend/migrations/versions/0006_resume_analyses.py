@@ -0,0 +1,41 @@
+"""Resume analyses cached by text and file hash
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "resume_analyses",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("text_hash", sa.String(64), nullable=False),
+        sa.Column("file_hash", sa.String(64), nullable=True),
+        sa.Column("analysis_version", sa.String(100), nullable=False),
+        sa.Column("analysis", postgresql.JSONB(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("text_hash", "analysis_version", name="unique_resume_analysis"),
+    )
+    op.create_index(
+        "ix_resume_analyses_file_hash", "resume_analyses", ["file_hash", "analysis_version"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resume_analyses")
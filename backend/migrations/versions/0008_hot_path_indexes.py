@@ -0,0 +1,63 @@
+"""Composite and partial indexes for the hot query paths
+
+Built CONCURRENTLY so large tables stay writable while the indexes build.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Next pending item per user in day order: dispatch, /roadmap/today, look-ahead
+        op.create_index(
+            "ix_roadmap_user_status_day",
+            "roadmap",
+            ["user_id", "status", "day_number"],
+            postgresql_concurrently=True,
+        )
+        # One topic's roadmap in day order
+        op.create_index(
+            "ix_roadmap_user_topic_day",
+            "roadmap",
+            ["user_id", "topic_id", "day_number"],
+            postgresql_concurrently=True,
+        )
+        # Latest sent item when a YES reply arrives
+        op.create_index(
+            "ix_roadmap_user_sent_at",
+            "roadmap",
+            ["user_id", "sent_at"],
+            postgresql_where=sa.text("status = 'sent'"),
+            postgresql_concurrently=True,
+        )
+        # Library listing, newest first with a (saved_at, article_id) keyset
+        op.create_index(
+            "ix_saved_articles_user_saved_at",
+            "saved_articles",
+            ["user_id", "saved_at", "article_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_saved_articles_user_saved_at", table_name="saved_articles", postgresql_concurrently=True)
+        op.drop_index("ix_roadmap_user_sent_at", table_name="roadmap", postgresql_concurrently=True)
+        op.drop_index("ix_roadmap_user_topic_day", table_name="roadmap", postgresql_concurrently=True)
+        op.drop_index("ix_roadmap_user_status_day", table_name="roadmap", postgresql_concurrently=True)
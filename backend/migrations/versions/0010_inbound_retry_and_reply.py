@@ -0,0 +1,35 @@
+"""Inbound message backoff and reply tracking
+
+Adds next_attempt_at for exponential backoff between attempts, and the
+reply body and Twilio SID so a reply is sent at most once.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("inbound_messages", sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+    op.add_column("inbound_messages", sa.Column("reply_body", sa.Text(), nullable=True))
+    op.add_column("inbound_messages", sa.Column("reply_sid", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("inbound_messages", "reply_sid")
+    op.drop_column("inbound_messages", "reply_body")
+    op.drop_column("inbound_messages", "next_attempt_at")
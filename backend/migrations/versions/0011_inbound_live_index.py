@@ -0,0 +1,43 @@
+"""Partial index on unfinished inbound messages
+
+Keeps the queue's claim scan on pending, processing and sending rows
+while finished ones accumulate between retention sweeps.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inbound_messages_live_received",
+            "inbound_messages",
+            ["received_at"],
+            postgresql_where=sa.text("status IN ('pending', 'processing', 'sending')"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_inbound_messages_live_received",
+            table_name="inbound_messages",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+import app.services.article_service as article_module
+from app.services.article_service import ArticleGenerationError, ArticleService
+
+KEY = ("topic", "binary-search", "intermediate", "Python")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(article_module, "monotonic", clock.monotonic)
+    monkeypatch.setattr(article_module.asyncio, "sleep", clock.sleep)
+    monkeypatch.setattr(article_module.settings, "GENERATION_WAIT_SECONDS", 10.0)
+    return clock
+
+
+def held_elsewhere(service: ArticleService, monkeypatch, content_after=None):
+    """Another replica holds the lease; its content appears after `content_after` claims."""
+    claims = []
+
+    async def claim(claim_key, key):
+        claims.append(key)
+        return content_after is not None and len(claims) > content_after, None
+
+    monkeypatch.setattr(service, "_claim", claim)
+    return claims
+
+
+async def never_called():
+    raise AssertionError("only the lease holder generates")
+
+
+def test_waiting_on_another_replica_gives_up_after_the_wait_limit(clock, monkeypatch):
+    service = ArticleService()
+    held_elsewhere(service, monkeypatch)
+
+    with pytest.raises(ArticleGenerationError):
+        asyncio.run(service._generate_once(*KEY, never_called))
+    assert sum(clock.sleeps) == pytest.approx(10.0)
+
+
+def test_content_stored_by_another_replica_ends_the_wait(clock, monkeypatch):
+    service = ArticleService()
+    claims = held_elsewhere(service, monkeypatch, content_after=3)
+
+    asyncio.run(service._generate_once(*KEY, never_called))
+    assert len(claims) == 4
@@ -0,0 +1,61 @@
+import json
+
+from app.services.article_stream import ArticleStreamParser, is_complete_article
+
+ARTICLE = {
+    "eli5": "Like sorting \"mail\" first.\nThen reading it.",
+    "technical": "Trades memory for time.",
+    "code_snippets": [{"language": "Python", "code": "print('hi')\n", "explanation": "Hi"}],
+    "real_world": "Search engines.",
+    "practice": [{"question": "Implement it", "difficulty": "easy", "link": ""}],
+}
+
+
+def stream(text: str, chunk_size: int):
+    parser = ArticleStreamParser()
+    events = []
+    for start in range(0, len(text), chunk_size):
+        events += parser.feed(text[start:start + chunk_size])
+    return parser, events
+
+
+def test_deltas_and_items_rebuild_the_article():
+    for chunk_size in (1, 3, 64):
+        parser, events = stream(json.dumps(ARTICLE), chunk_size)
+        text = {}
+        items = {}
+        for kind, section, value in events:
+            if kind == "delta":
+                text[section] = text.get(section, "") + value
+            else:
+                items.setdefault(section, []).append(value)
+        assert text == {key: ARTICLE[key] for key in ("eli5", "technical", "real_world")}
+        assert items == {key: ARTICLE[key] for key in ("code_snippets", "practice")}
+        assert parser.result() == ARTICLE
+
+
+def test_escapes_split_across_chunks():
+    parser, events = stream(json.dumps({**ARTICLE, "eli5": "café \\ done"}), 2)
+    deltas = "".join(value for kind, section, value in events if section == "eli5")
+    assert deltas == "café \\ done"
+
+
+def test_code_fence_is_ignored_by_result():
+    parser, _ = stream("```json\n" + json.dumps(ARTICLE) + "\n```", 16)
+    assert parser.result() == ARTICLE
+
+
+def test_truncated_or_incomplete_article_has_no_result():
+    text = json.dumps(ARTICLE)
+    parser, _ = stream(text[: len(text) // 2], 8)
+    assert parser.result() is None
+
+    parser, _ = stream(json.dumps({key: ARTICLE[key] for key in ("eli5", "technical")}), 8)
+    assert parser.result() is None
+
+
+def test_is_complete_article():
+    assert is_complete_article(ARTICLE)
+    assert not is_complete_article({**ARTICLE, "eli5": ""})
+    assert not is_complete_article({**ARTICLE, "practice": "none"})
+    assert not is_complete_article([ARTICLE])
@@ -0,0 +1,59 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.body_limit import BodySizeLimitMiddleware
+
+LIMIT = 1024
+
+app = FastAPI()
+app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": LIMIT})
+received = []
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    received.append(file.filename)
+    return {"size": len(await file.read())}
+
+
+@app.post("/other")
+async def other(file: UploadFile = File(...)):
+    return {"size": len(await file.read())}
+
+
+client = TestClient(app)
+
+
+def chunks(total: int, size: int = 256):
+    for _ in range(total // size):
+        yield b"x" * size
+
+
+def test_small_upload_passes():
+    response = client.post("/upload", files={"file": ("cv.pdf", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_declared_length_over_the_limit_is_rejected_before_the_route():
+    received.clear()
+    response = client.post("/upload", files={"file": ("cv.pdf", b"x" * (LIMIT * 2))})
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_streamed_body_over_the_limit_is_cut_off():
+    # A generator body is sent chunked, without a Content-Length
+    received.clear()
+    response = client.post(
+        "/upload",
+        content=chunks(LIMIT * 4),
+        headers={"Content-Type": "multipart/form-data; boundary=xyz"},
+    )
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_other_paths_are_not_limited():
+    response = client.post("/other", files={"file": ("cv.pdf", b"x" * (LIMIT * 2))})
+    assert response.status_code == 200
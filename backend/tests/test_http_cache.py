@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from fastapi import Request
+
+from app.core.http_cache import cached_response, etag_for
+
+BODY = b'{"topics":[]}'
+ETAG = etag_for(BODY)
+CACHE_CONTROL = "public, max-age=300"
+LAST_MODIFIED = datetime(2026, 10, 1, 12, 0, 0, 500000)  # naive UTC, as stored
+
+
+def request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def respond(req: Request, last_modified=None):
+    return cached_response(req, BODY, CACHE_CONTROL, last_modified=last_modified)
+
+
+def test_etag_is_stable_and_quoted():
+    assert ETAG == etag_for(BODY)
+    assert ETAG.startswith('"') and ETAG.endswith('"')
+    assert ETAG != etag_for(b"{}")
+
+
+def test_full_response_carries_validators():
+    response = respond(request(), LAST_MODIFIED)
+    assert response.status_code == 200
+    assert response.body == BODY
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == CACHE_CONTROL
+    assert response.headers["last-modified"] == "Thu, 01 Oct 2026 12:00:00 GMT"
+
+
+def test_matching_etag_is_not_modified():
+    response = respond(request(if_none_match=ETAG))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == CACHE_CONTROL
+
+
+def test_weak_etag_matches():
+    assert respond(request(if_none_match=f"W/{ETAG}")).status_code == 304
+
+
+def test_etag_list_matches_any_member():
+    assert respond(request(if_none_match=f'"stale", W/"older" , {ETAG}')).status_code == 304
+    assert respond(request(if_none_match='"stale", W/"older"')).status_code == 200
+
+
+def test_star_matches_any_etag():
+    assert respond(request(if_none_match="*")).status_code == 304
+
+
+def test_if_modified_since_without_etag():
+    current = request(if_modified_since="Thu, 01 Oct 2026 12:00:00 GMT")
+    assert respond(current, LAST_MODIFIED).status_code == 304
+
+    later = request(if_modified_since="Fri, 02 Oct 2026 00:00:00 GMT")
+    assert respond(later, LAST_MODIFIED).status_code == 304
+
+    stale = request(if_modified_since="Thu, 01 Oct 2026 11:59:59 GMT")
+    assert respond(stale, LAST_MODIFIED).status_code == 200
+
+    assert respond(request(if_modified_since="not a date"), LAST_MODIFIED).status_code == 200
+    # Without a known modification time the date can't be checked
+    assert respond(current).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    current_date = "Thu, 01 Oct 2026 12:00:00 GMT"
+    stale_tag = request(if_none_match='"stale"', if_modified_since=current_date)
+    assert respond(stale_tag, LAST_MODIFIED).status_code == 200
+
+    current_tag = request(if_none_match=ETAG, if_modified_since="Thu, 01 Oct 2026 11:00:00 GMT")
+    assert respond(current_tag, LAST_MODIFIED).status_code == 304
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.llm_service import LLMService
+
+
+def busy_service() -> LLMService:
+    service = LLMService()
+    service.in_flight = settings.LLM_MAX_CONCURRENCY
+    return service
+
+
+def test_wait_for_idle_returns_at_once_with_spare_slots():
+    service = LLMService()
+    assert asyncio.run(service.wait_for_idle(0, timeout=0.01)) is True
+
+
+def test_wait_for_idle_wakes_when_a_slot_is_released():
+    service = busy_service()
+
+    async def scenario():
+        waiter = asyncio.create_task(service.wait_for_idle(0, timeout=5))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        service._release_slot()
+        return await waiter
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_wait_for_idle_keeps_the_reserve():
+    service = busy_service()
+
+    async def scenario():
+        waiter = asyncio.create_task(service.wait_for_idle(1, timeout=0.05))
+        await asyncio.sleep(0)
+        service._release_slot()  # one free slot is still only the reserve
+        return await waiter
+
+    assert asyncio.run(scenario()) is False
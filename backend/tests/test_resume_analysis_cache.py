@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+import app.services.resume_analysis_cache as cache_module
+from app.services.resume_analysis_cache import (
+    normalize_resume_text,
+    resume_analysis_cache,
+    validate_analysis,
+)
+
+
+def test_normalize_ignores_case_punctuation_and_spacing():
+    assert normalize_resume_text("Python,  C++ and\nC#!") == normalize_resume_text("python c++ AND c#")
+
+
+def test_valid_analysis_is_coerced_to_the_schema():
+    analysis = validate_analysis({"skills": ["Python"], "years_of_experience": "5", "extra": True})
+    assert analysis["skills"] == ["Python"]
+    assert analysis["years_of_experience"] == 5
+    assert analysis["experience_level"] == "beginner"
+    assert "extra" not in analysis
+
+
+def test_invalid_analysis_is_rejected():
+    assert validate_analysis({"years_of_experience": "5+"}) is None
+    assert validate_analysis({"skills": "Python"}) is None
+    assert validate_analysis(["Python"]) is None
+
+
+class FakeSession:
+    """Counts open sessions and the statements and commits they see."""
+
+    open = 0
+    statements = []
+    commits = 0
+
+    async def __aenter__(self):
+        FakeSession.open += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        FakeSession.open -= 1
+
+    async def execute(self, statement):
+        FakeSession.statements.append(statement)
+        return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+    async def commit(self):
+        FakeSession.commits += 1
+
+
+def test_miss_holds_no_session_while_the_llm_runs(monkeypatch):
+    FakeSession.statements, FakeSession.commits = [], 0
+    monkeypatch.setattr(cache_module, "async_session_maker", FakeSession)
+
+    async def analyze_resume(excerpt, use_fallback=True):
+        assert FakeSession.open == 0
+        return {"skills": ["Python"], "experience_level": "senior"}
+
+    monkeypatch.setattr(cache_module.llm_service, "analyze_resume", analyze_resume)
+    analysis = asyncio.run(resume_analysis_cache.analyze("Python developer", "f" * 64))
+
+    assert analysis["experience_level"] == "senior"
+    # One lookup, then the cache write in its own committed transaction
+    assert len(FakeSession.statements) == 2
+    assert FakeSession.commits == 1
+    assert FakeSession.open == 0
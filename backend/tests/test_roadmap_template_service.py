@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import app.services.roadmap_template_service as template_module
+from app.services.roadmap_template_service import RoadmapTemplateService, is_valid_roadmap
+
+
+def test_well_formed_roadmap_is_valid():
+    assert is_valid_roadmap([
+        {"day": 1, "concept": "Arrays", "difficulty": "easy"},
+        {"day": 2, "concept": "Hash maps"},
+    ])
+
+
+def test_roadmap_must_be_a_non_empty_list_of_dicts():
+    assert not is_valid_roadmap([])
+    assert not is_valid_roadmap(None)
+    assert not is_valid_roadmap({"day": 1, "concept": "Arrays"})
+    assert not is_valid_roadmap(["Arrays"])
+
+
+def test_day_must_be_a_positive_int():
+    for day in (None, "1", 1.0, 0, -3, True, False):
+        assert not is_valid_roadmap([{"day": day, "concept": "Arrays"}]), day
+    assert not is_valid_roadmap([{"concept": "Arrays"}])
+
+
+def test_concept_must_be_non_blank_text():
+    for concept in (None, "", "   ", 42, ["Arrays"]):
+        assert not is_valid_roadmap([{"day": 1, "concept": concept}]), concept
+    assert not is_valid_roadmap([{"day": 1}])
+
+
+def test_one_bad_item_invalidates_the_roadmap():
+    assert not is_valid_roadmap([
+        {"day": 1, "concept": "Arrays"},
+        {"day": 2, "concept": ""},
+    ])
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def commit(self):
+        pass
+
+
+def test_defaults_after_an_llm_failure_are_stored_as_a_fallback(monkeypatch):
+    service = RoadmapTemplateService()
+    stored = []
+
+    async def generate_roadmap(**kwargs):
+        raise TimeoutError("LLM down")
+
+    async def store(db, topic_id, duration_days, experience_level, items, is_fallback=False, replace=False):
+        stored.append(is_fallback)
+
+    monkeypatch.setattr(template_module, "async_session_maker", FakeSession)
+    monkeypatch.setattr(template_module.llm_service, "generate_roadmap", generate_roadmap)
+    monkeypatch.setattr(service, "_store", store)
+
+    topic = SimpleNamespace(id=uuid.uuid4(), name="DSA")
+    items = asyncio.run(service._generate_once(topic, 30, "intermediate"))
+    assert is_valid_roadmap(items)
+    # Marked, so the next read serves it and schedules a refresh
+    assert stored == [True]
@@ -0,0 +1,55 @@
+import uuid
+
+import bcrypt
+
+from app.core.config import settings
+from app.core.security import (
+    _cache_user,
+    _user_cache,
+    _user_from_snapshot,
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
+from app.models.user import User
+
+
+def test_hash_at_the_configured_cost_needs_no_rehash(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    hashed = get_password_hash("correct horse")
+    assert hashed.startswith("$2b$04$")
+    assert verify_password("correct horse", hashed)
+    assert not password_needs_rehash(hashed)
+
+
+def test_cost_change_requires_rehash(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    hashed = get_password_hash("correct horse")
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    assert password_needs_rehash(hashed)
+    assert not password_needs_rehash(get_password_hash("correct horse"))
+
+    # Lowering the cost is detected as well
+    older = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds=6)).decode()
+    assert password_needs_rehash(older)
+
+
+def test_unrecognised_hash_is_left_alone():
+    assert not password_needs_rehash("")
+    assert not password_needs_rehash("not-a-bcrypt-hash")
+    assert not password_needs_rehash("$2b$xx$abcdef")
+
+
+def test_cached_user_does_not_share_json_values():
+    user = User(id=uuid.uuid4(), email="dev@example.com", skill_analysis={"skills": ["Python"]})
+    _cache_user(user)
+    user.skill_analysis["skills"].append("Go")
+
+    first = _user_from_snapshot(_user_cache.get(str(user.id)))
+    assert first.skill_analysis == {"skills": ["Python"]}
+    first.skill_analysis["skills"].append("Rust")
+
+    second = _user_from_snapshot(_user_cache.get(str(user.id)))
+    assert second.skill_analysis == {"skills": ["Python"]}
+    _user_cache.pop(str(user.id))
@@ -0,0 +1,42 @@
+from datetime import datetime, time, timezone
+
+from app.services.scheduler_service import compute_send_slot
+
+
+def at(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_utc_and_defaults():
+    assert compute_send_slot("UTC", time(9, 30), at(2026, 1, 10, 0, 0)) == 9 * 60 + 30
+    assert compute_send_slot(None, None, at(2026, 1, 10, 0, 0)) == 9 * 60
+
+
+def test_unknown_timezone_falls_back_to_utc():
+    assert compute_send_slot("Not/AZone", time(8, 0), at(2026, 1, 10, 0, 0)) == 8 * 60
+
+
+def test_wraps_around_midnight():
+    # 01:00 in Kolkata (UTC+5:30) is 19:30 UTC the previous day
+    assert compute_send_slot("Asia/Kolkata", time(1, 0), at(2026, 1, 10, 0, 0)) == 19 * 60 + 30
+
+
+def test_uses_offset_at_next_send_across_us_dst_start():
+    # DST starts 2026-03-08 at 07:00 UTC; 09:00 local moves from 14:00 to 13:00 UTC
+    assert compute_send_slot("America/New_York", time(9, 0), at(2026, 3, 7, 10, 0)) == 14 * 60
+    assert compute_send_slot("America/New_York", time(9, 0), at(2026, 3, 7, 15, 0)) == 13 * 60
+
+
+def test_uses_offset_at_next_send_across_eu_dst_end():
+    # DST ends 2026-10-25 at 01:00 UTC; a refresh just after midnight already sees CET
+    assert compute_send_slot("Europe/Berlin", time(9, 0), at(2026, 10, 25, 0, 5)) == 8 * 60
+    assert compute_send_slot("Europe/Berlin", time(9, 0), at(2026, 10, 24, 6, 0)) == 7 * 60
+
+
+def test_rounds_down_to_the_dispatch_bucket():
+    # The last tick of the UTC day is 23:45; a 23:5x slot must not wait for it to pass
+    assert compute_send_slot("UTC", time(23, 50), at(2026, 1, 10, 0, 0)) == 23 * 60 + 45
+    assert compute_send_slot("UTC", time(23, 59), at(2026, 1, 10, 0, 0)) == 23 * 60 + 45
+    # 05:22 in Kolkata is 23:52 UTC the previous day
+    assert compute_send_slot("Asia/Kolkata", time(5, 22), at(2026, 1, 10, 0, 0)) == 23 * 60 + 45
+    assert compute_send_slot("UTC", time(9, 7), at(2026, 1, 10, 0, 0)) == 9 * 60
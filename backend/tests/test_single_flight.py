@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(5)])
+        assert not flight.running("key")
+        return results
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(runs) == 1
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    runs = []
+
+    async def work(key):
+        runs.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def main():
+        return await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b")))
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert sorted(runs) == ["a", "b"]
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(*[flight.do("key", work) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(runs) == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == "boom" for result in results)
+
+
+def test_key_is_released_after_a_call():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        return len(runs)
+
+    async def main():
+        first = await flight.do("key", work)
+        second = await flight.do("key", work)
+        return first, second
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_cancelled_caller_does_not_abort_the_shared_run():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        leaver = asyncio.create_task(flight.do("key", work))
+        stayer = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leaver.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaver
+        return await stayer
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,36 @@
+from app.services.skill_matcher import SkillMatcher, skill_matcher
+
+
+def test_short_aliases_need_whole_tokens():
+    assert skill_matcher.find("Worked at Google on storage; went to the gym.") == []
+    assert skill_matcher.find("Backend in Go (golang) and C++") == ["Go", "C++"]
+
+
+def test_rag_is_not_found_inside_storage():
+    assert skill_matcher.find("Scaled storage for a RAG system") == ["RAG"]
+
+
+def test_compound_names_keep_their_component_skills():
+    assert skill_matcher.find("Experienced in Ruby on Rails") == ["Rails", "Ruby"]
+    assert skill_matcher.find("Shipped React Native apps") == ["React Native", "React"]
+    assert skill_matcher.find("Styled with Tailwind CSS") == ["Tailwind", "CSS"]
+
+
+def test_symbols_and_sentence_ends():
+    assert skill_matcher.find("Services in C#, Node.js and .NET.") == ["C#", "Node.js", ".NET"]
+
+
+def test_spans_cover_each_mention():
+    text = "Ruby on Rails, Go"
+    spans = skill_matcher.spans(text)
+    assert [(text[start:end], skill) for start, end, skill in spans] == [
+        ("Ruby on Rails", "Rails"),
+        ("Ruby", "Ruby"),
+        ("Rails", "Rails"),
+        ("Go", "Go"),
+    ]
+
+
+def test_custom_skills():
+    matcher = SkillMatcher({"Machine Learning": ["ml"], "Learning": []})
+    assert matcher.find("ML and machine learning") == ["Machine Learning", "Learning"]
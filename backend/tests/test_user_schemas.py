@@ -0,0 +1,27 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.user import UserCreate, UserUpdate
+
+
+def signup(**fields) -> UserCreate:
+    return UserCreate(email="dev@example.com", password="long-enough", **fields)
+
+
+def test_known_iana_zones_are_accepted():
+    assert signup().timezone == "UTC"
+    assert signup(timezone="Asia/Kolkata").timezone == "Asia/Kolkata"
+    assert UserUpdate(timezone="America/New_York").timezone == "America/New_York"
+
+
+@pytest.mark.parametrize("zone", ["Mars/Olympus", "IST+5:30", "", "../etc/passwd", "/UTC"])
+def test_unknown_zones_are_rejected(zone):
+    with pytest.raises(ValidationError, match="Unknown timezone"):
+        signup(timezone=zone)
+    with pytest.raises(ValidationError, match="Unknown timezone"):
+        UserUpdate(timezone=zone)
+
+
+def test_update_may_leave_the_zone_unset():
+    assert UserUpdate().timezone is None
+    assert UserUpdate(timezone=None).timezone is None
@@ -0,0 +1,153 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+import app.services.whatsapp_service as whatsapp_module
+from app.services.whatsapp_service import (
+    TokenBucket,
+    TwilioHTTPTransport,
+    WhatsAppService,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    """Stands in for monotonic() and asyncio.sleep so waits take no real time."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(whatsapp_module, "monotonic", clock.monotonic)
+    monkeypatch.setattr(whatsapp_module.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_retry_after_in_seconds():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("0.5") == 0.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
+
+
+def test_retry_after_as_http_date():
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= parse_retry_after(later) <= 30
+
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert parse_retry_after(earlier) == 0.0
+
+
+def test_token_bucket_allows_a_burst_then_waits(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(2))
+    assert clock.sleeps == []
+
+    asyncio.run(take(1))
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_token_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(2))
+    clock.now += 10  # far longer than a refill; the bucket still holds only 2
+    asyncio.run(take(2))
+    assert clock.sleeps == []
+    asyncio.run(take(1))
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def make_service(responses, retries=3):
+    """A WhatsAppService whose Twilio transport replays `responses` in order."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        response = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    transport = TwilioHTTPTransport("ACtest", "token")
+    transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = WhatsAppService(transport=transport)
+    service.max_retries = retries
+    return service, calls
+
+
+def send(service):
+    return asyncio.run(service.send_message("+15550001111", "Hello"))
+
+
+def created(sid="SM123"):
+    return httpx.Response(201, json={"sid": sid})
+
+
+def test_success_returns_the_sid(clock):
+    service, calls = make_service([created()])
+    assert send(service) == "SM123"
+    assert len(calls) == 1
+    assert b"To=whatsapp%3A%2B15550001111" in calls[0].content
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_throttled_sends_are_retried(clock, status_code):
+    throttled = httpx.Response(status_code, json={"message": "Busy"}, headers={"Retry-After": "2"})
+    service, calls = make_service([throttled, throttled, created()])
+    assert send(service) == "SM123"
+    assert len(calls) == 3
+    # Backoff never undercuts Retry-After
+    assert [delay for delay in clock.sleeps if delay >= 2] == clock.sleeps
+    assert len(clock.sleeps) == 2
+
+
+def test_retries_stop_after_max_retries(clock):
+    service, calls = make_service([httpx.Response(503, json={"message": "Down"})], retries=2)
+    assert send(service) is None
+    assert len(calls) == 3
+
+
+def test_failed_connect_is_retried(clock):
+    service, calls = make_service([httpx.ConnectError("refused"), created()])
+    assert send(service) == "SM123"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 404, 500])
+def test_other_errors_fail_without_retry(clock, status_code):
+    service, calls = make_service([httpx.Response(status_code, json={"message": "No"}), created()])
+    assert send(service) is None
+    assert len(calls) == 1
+
+
+def test_read_timeout_is_not_retried(clock):
+    # The message may already have been created, so it's never sent twice
+    service, calls = make_service([httpx.ReadTimeout("slow"), created()])
+    assert send(service) is None
+    assert len(calls) == 1